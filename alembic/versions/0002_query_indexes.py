@@ -0,0 +1,58 @@
+"""query indexes
+
+Revision ID: 0002_query_indexes
+Revises: 0001_initial
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_query_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # list_project_issues, with and without the status filter; the trailing
+    # (created_at, id) matches the keyset pagination order.
+    op.create_index(
+        "ix_issues_project_status_created",
+        "issues",
+        ["project_id", "status", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_issues_project_created", "issues", ["project_id", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_comments_issue_created", "comments", ["issue_id", "created_at", "id"]
+    )
+    op.create_index("ux_users_email", "users", ["email"], unique=True)
+    op.create_index("ux_projects_name", "projects", ["name"], unique=True)
+    # list_projects?search=... is an unanchored ILIKE.
+    op.create_index(
+        "ix_projects_name_trgm",
+        "projects",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    # list_projects defaults to is_archived=false.
+    op.create_index(
+        "ix_projects_active_created",
+        "projects",
+        ["created_at", "id"],
+        postgresql_where=sa.text("NOT is_archived"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_projects_active_created", table_name="projects")
+    op.drop_index("ix_projects_name_trgm", table_name="projects")
+    op.drop_index("ux_projects_name", table_name="projects")
+    op.drop_index("ux_users_email", table_name="users")
+    op.drop_index("ix_comments_issue_created", table_name="comments")
+    op.drop_index("ix_issues_project_created", table_name="issues")
+    op.drop_index("ix_issues_project_status_created", table_name="issues")
@@ -0,0 +1,45 @@
+"""issue full-text search
+
+Revision ID: 0003_issue_search
+Revises: 0002_query_indexes
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0003_issue_search"
+down_revision = "0002_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated columns keep the vectors current without triggers; titles
+    # outrank descriptions via setweight.
+    op.execute(
+        "ALTER TABLE issues ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.execute(
+        "ALTER TABLE comments ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "to_tsvector('english', coalesce(content, ''))"
+        ") STORED"
+    )
+    op.create_index(
+        "ix_issues_search_vector", "issues", ["search_vector"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_comments_search_vector",
+        "comments",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_comments_search_vector", table_name="comments")
+    op.drop_index("ix_issues_search_vector", table_name="issues")
+    op.drop_column("comments", "search_vector")
+    op.drop_column("issues", "search_vector")
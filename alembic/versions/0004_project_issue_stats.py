@@ -0,0 +1,42 @@
+"""per-project issue counters
+
+Revision ID: 0004_project_issue_stats
+Revises: 0003_issue_search
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+revision = "0004_project_issue_stats"
+down_revision = "0003_issue_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "project_issue_stats",
+        sa.Column(
+            "project_id",
+            pg.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("dimension", sa.String(length=16), primary_key=True),
+        sa.Column("value", sa.String(length=32), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "INSERT INTO project_issue_stats (project_id, dimension, value, count) "
+        "SELECT project_id, 'status', status, count(*) FROM issues "
+        "WHERE status IS NOT NULL GROUP BY project_id, status "
+        "UNION ALL "
+        "SELECT project_id, 'priority', priority, count(*) FROM issues "
+        "WHERE priority IS NOT NULL GROUP BY project_id, priority"
+    )
+
+
+def downgrade():
+    op.drop_table("project_issue_stats")
@@ -0,0 +1,41 @@
+"""transactional outbox
+
+Revision ID: 0005_outbox
+Revises: 0004_project_issue_stats
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+revision = "0005_outbox"
+down_revision = "0004_project_issue_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("topic", sa.String(length=64), nullable=False),
+        sa.Column("project_id", pg.UUID(as_uuid=True), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")
+        ),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_outbox_available", "outbox", ["available_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_outbox_available", table_name="outbox")
+    op.drop_table("outbox")
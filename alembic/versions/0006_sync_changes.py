@@ -0,0 +1,93 @@
+"""incremental sync: updated_at indexes, comments.project_id and tombstones
+
+Revision ID: 0006_sync_changes
+Revises: 0005_outbox
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+revision = "0006_sync_changes"
+down_revision = "0005_outbox"
+branch_labels = None
+depends_on = None
+
+ISSUE_TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION issues_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO tombstones (entity, entity_id, project_id)
+    VALUES ('issue', OLD.id, OLD.project_id);
+    RETURN NULL;
+END $$ LANGUAGE plpgsql
+"""
+
+# A comment deleted along with its issue is covered by the issue's tombstone.
+COMMENT_TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION comments_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO tombstones (entity, entity_id, project_id)
+    SELECT 'comment', OLD.id, i.project_id FROM issues i WHERE i.id = OLD.issue_id;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    # GET /api/projects/{id}/changes: keyset scans on (updated_at, id).
+    op.create_index(
+        "ix_issues_project_updated", "issues", ["project_id", "updated_at", "id"]
+    )
+    # Comments carry their issue's project so they can be scanned per project.
+    op.add_column("comments", sa.Column("project_id", pg.UUID(as_uuid=True)))
+    op.execute(
+        "UPDATE comments SET project_id = issues.project_id "
+        "FROM issues WHERE issues.id = comments.issue_id"
+    )
+    op.alter_column("comments", "project_id", nullable=False)
+    op.create_foreign_key(
+        "comments_project_id_fkey",
+        "comments",
+        "projects",
+        ["project_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index(
+        "ix_comments_project_updated", "comments", ["project_id", "updated_at", "id"]
+    )
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", pg.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", pg.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "deleted_at", sa.DateTime(timezone=True), server_default=sa.text("now()")
+        ),
+    )
+    op.create_index(
+        "ix_tombstones_project_deleted",
+        "tombstones",
+        ["project_id", "deleted_at", "id"],
+    )
+    op.execute(ISSUE_TOMBSTONE_FUNCTION)
+    op.execute(COMMENT_TOMBSTONE_FUNCTION)
+    for table in ("issues", "comments"):
+        op.execute(
+            f"CREATE TRIGGER {table}_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_tombstone()"
+        )
+
+
+def downgrade():
+    for table in ("issues", "comments"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_tombstone()")
+    op.drop_index("ix_tombstones_project_deleted", table_name="tombstones")
+    op.drop_table("tombstones")
+    op.drop_index("ix_comments_project_updated", table_name="comments")
+    op.drop_constraint("comments_project_id_fkey", "comments", type_="foreignkey")
+    op.drop_column("comments", "project_id")
+    op.drop_index("ix_issues_project_updated", table_name="issues")
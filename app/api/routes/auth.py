@@ -1,45 +1,46 @@
 ﻿from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.session import get_db, run_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse
-from app.core.security import hash_password, verify_password
-from app.core.jwt import create_access_token, create_refresh_token, decode_token
-from app.core.redis_client import blacklist_jti, is_blacklisted
+from app.core.security import hash_password_async, verify_password_async
+from app.core.jwt import create_token_pair_async, decode_token_async
+from app.core.redis_client import blacklist_jti_async, is_blacklisted_async
 import os
 
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
 
 
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
+async def register(user: UserCreate, db=Depends(get_db)):
+    existing = await run_db(db, _find_user, user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    new_user = User(
-        username=user.username,
-        email=user.email,
-        password=hash_password(user.password),
-        role=user.role,
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    hashed = await hash_password_async(user.password)
+
+    def _create(db: Session):
+        new_user = User(
+            username=user.username,
+            email=user.email,
+            password=hashed,
+            role=user.role,
+        )
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        return new_user
+
+    return await run_db(db, _create)
 
 
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.password):
+async def login(user: UserLogin, db=Depends(get_db)):
+    db_user = await run_db(db, _find_user, user.email)
+    if not db_user or not await verify_password_async(user.password, db_user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
@@ -48,8 +49,7 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
         "username": db_user.username,
         "role": db_user.role,
     }
-    access = create_access_token(payload)
-    refresh = create_refresh_token(payload)
+    access, refresh = await create_token_pair_async(payload)
     return {
         "access_token": access["token"],
         "refresh_token": refresh["token"],
@@ -59,28 +59,29 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh")
-def refresh_token(body: dict):
+async def refresh_token(body: dict):
     token = body.get("refresh_token")
     if not token:
         raise HTTPException(status_code=400, detail="refresh_token required")
     try:
-        decoded = decode_token(token)
+        decoded = await decode_token_async(token)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
     if decoded.get("type") != "refresh":
         raise HTTPException(status_code=401, detail="Invalid token type")
     jti = decoded.get("jti")
-    if is_blacklisted(jti):
+    if await is_blacklisted_async(jti):
         raise HTTPException(status_code=401, detail="Token revoked")
     # rotate
-    blacklist_jti(jti, int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")) * 24 * 3600)
+    await blacklist_jti_async(
+        jti, int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")) * 24 * 3600
+    )
     payload = {
         "sub": decoded.get("sub"),
         "username": decoded.get("username"),
         "role": decoded.get("role"),
     }
-    access = create_access_token(payload)
-    refresh = create_refresh_token(payload)
+    access, refresh = await create_token_pair_async(payload)
     return {
         "access_token": access["token"],
         "refresh_token": refresh["token"],
@@ -89,15 +90,15 @@ def refresh_token(body: dict):
 
 
 @router.post("/logout")
-def logout(body: dict):
+async def logout(body: dict):
     token = body.get("refresh_token")
     if not token:
         raise HTTPException(status_code=400, detail="refresh_token required")
     try:
-        decoded = decode_token(token)
+        decoded = await decode_token_async(token)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
-    blacklist_jti(
+    await blacklist_jti_async(
         decoded.get("jti"), int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")) * 24 * 3600
     )
     return {"message": "Logged out"}
@@ -1,60 +1,138 @@
-﻿from fastapi import APIRouter, Depends, HTTPException
+﻿from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import SessionLocal
+from app.core import outbox
+from app.core.etag import etag_matches, weak_etag
+from app.core.negotiation import JSON
+from app.core.serialization import columns, page_response
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from app.db.session import get_db, run_db
 from app.models.comment import Comment
-from app.schemas.comment import CommentCreate, CommentResponse
+from app.models.issue import Issue
+from app.schemas.comment import CommentCreate, CommentResponse, CommentWithAuthor
+from app.schemas.pagination import Page
+from app.dependencies.accept import response_media_type
+from app.dependencies.expand import eager, embed, expand_param
 from app.dependencies.permissions import get_current_user_from_bearer
 from uuid import UUID
 
 router = APIRouter(prefix="/api", tags=["Comments"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@router.get("/issues/{issue_id}/comments", response_model=List[CommentResponse])
-def list_comments(
+@router.get(
+    "/issues/{issue_id}/comments",
+    response_model=Page[CommentWithAuthor],
+    response_model_exclude_unset=True,
+)
+async def list_comments(
     issue_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    cursor: str = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand=Depends(expand_param("author")),
+    media_type=Depends(response_media_type),
+    if_none_match: str = Header(None),
+    db=Depends(get_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    return db.query(Comment).filter(Comment.issue_id == issue_id).all()
+    def _fingerprint(db: Session):
+        return (
+            db.query(func.max(Comment.updated_at), func.count(Comment.id))
+            .filter(Comment.issue_id == issue_id)
+            .one()
+        )
+
+    def _list(db: Session):
+        if not expand:
+            q = db.query(*columns(Comment, CommentResponse))
+            return paginate(
+                q.filter(Comment.issue_id == issue_id), Comment, cursor, limit
+            )
+        q = db.query(Comment).filter(Comment.issue_id == issue_id)
+        page = paginate(q.options(*eager(Comment, expand)), Comment, cursor, limit)
+        page["items"] = [embed(c, CommentResponse, expand) for c in page["items"]]
+        return page
+
+    last_updated, count = await run_db(db, _fingerprint)
+    etag = weak_etag(
+        last_updated or "",
+        count,
+        cursor or "",
+        limit,
+        ",".join(sorted(expand)),
+        media_type,
+    )
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    page = await run_db(db, _list)
+    if expand and media_type == JSON:
+        response.headers["ETag"] = etag
+        response.headers["Vary"] = "Accept"
+        return page
+    return page_response(page, headers={"ETag": etag}, media_type=media_type)
+
+
+def _project_of(db: Session, issue_id: UUID):
+    project_id = db.scalar(select(Issue.project_id).where(Issue.id == issue_id))
+    if project_id is None:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    return project_id
+
+
+def _commit_with_event(db: Session, project_id, event_type: str, comment: Comment):
+    db.flush()
+    data = CommentResponse.model_validate(comment)
+    outbox.enqueue(db, event_type, project_id, data)
+    db.commit()
+    return data
 
 
 @router.post("/issues/{issue_id}/comments", response_model=CommentResponse)
-def add_comment(
+async def add_comment(
     issue_id: UUID,
     payload: CommentCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    c = Comment(content=payload.content, issue_id=issue_id, author_id=UUID(user["sub"]))
-    db.add(c)
-    db.commit()
-    db.refresh(c)
+    def _add(db: Session):
+        project_id = _project_of(db, issue_id)
+        c = Comment(
+            content=payload.content,
+            issue_id=issue_id,
+            project_id=project_id,
+            author_id=UUID(user["sub"]),
+        )
+        db.add(c)
+        return _commit_with_event(db, project_id, "comment.created", c)
+
+    c = await run_db(db, _add)
+    outbox.worker.wake()
     return c
 
 
 @router.patch("/comments/{comment_id}", response_model=CommentResponse)
-def edit_comment(
+async def edit_comment(
     comment_id: UUID,
     payload: CommentCreate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: str = Header(None),
+    db=Depends(get_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    c = db.get(Comment, comment_id)
-    if not c:
-        raise HTTPException(status_code=404, detail="Not found")
-    if str(c.author_id) != user["sub"]:
-        raise HTTPException(status_code=403, detail="Forbidden")
-    c.content = payload.content
-    db.add(c)
-    db.commit()
-    db.refresh(c)
+    def _edit(db: Session):
+        c = db.get(Comment, comment_id, with_for_update=True if if_match else None)
+        if not c:
+            raise HTTPException(status_code=404, detail="Not found")
+        if str(c.author_id) != user["sub"]:
+            raise HTTPException(status_code=403, detail="Forbidden")
+        if if_match and not etag_matches(if_match, weak_etag(c.updated_at)):
+            raise HTTPException(status_code=412, detail="Precondition Failed")
+        project_id = _project_of(db, c.issue_id)
+        c.content = payload.content
+        db.add(c)
+        return _commit_with_event(db, project_id, "comment.updated", c)
+
+    c = await run_db(db, _edit)
+    outbox.worker.wake()
+    response.headers["ETag"] = weak_etag(c.updated_at)
     return c
@@ -0,0 +1,151 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import database
+from app.db.session import get_db, run_db, session_factories
+from app.dependencies.permissions import get_current_user_from_bearer
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.models.project import Project
+from app.schemas.comment import CommentResponse
+from app.schemas.issue import IssueResponse
+
+router = APIRouter(prefix="/api/projects", tags=["Export"])
+
+EXPORT_BATCH_SIZE = 500
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _issues_query(project_id: UUID):
+    # yield_per turns on stream_results: a server-side cursor on psycopg2,
+    # a cursor inside the transaction on asyncpg. Finished batches drop out
+    # of the session's weak-referencing identity map once encoded.
+    return (
+        select(Issue)
+        .where(Issue.project_id == project_id)
+        .order_by(Issue.created_at, Issue.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def _comments_by_issue(db: Session, issue_ids):
+    grouped = defaultdict(list)
+    rows = db.scalars(
+        select(Comment)
+        .where(Comment.issue_id.in_(issue_ids))
+        .order_by(Comment.issue_id, Comment.created_at, Comment.id)
+    )
+    for c in rows:
+        grouped[c.issue_id].append(
+            CommentResponse.model_validate(c).model_dump(mode="json")
+        )
+    return grouped
+
+
+def _records(issues, comments):
+    for issue in issues:
+        record = IssueResponse.model_validate(issue).model_dump(mode="json")
+        if comments is not None:
+            record["comments"] = comments.get(issue.id, [])
+        yield record
+
+
+class _NDJSONEncoder:
+    def header(self) -> str:
+        return ""
+
+    def encode(self, records) -> str:
+        return "".join(json.dumps(r) + "\n" for r in records)
+
+
+class _CSVEncoder:
+    def __init__(self, include_comments: bool):
+        self.fields = list(IssueResponse.model_fields)
+        if include_comments:
+            self.fields.append("comments")
+
+    def header(self) -> str:
+        buf = io.StringIO()
+        csv.DictWriter(buf, fieldnames=self.fields).writeheader()
+        return buf.getvalue()
+
+    def encode(self, records) -> str:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=self.fields)
+        for r in records:
+            if "comments" in r and not isinstance(r["comments"], str):
+                r["comments"] = json.dumps(r["comments"])
+            writer.writerow(r)
+        return buf.getvalue()
+
+
+def _stream_sync(factory, project_id: UUID, encoder, include_comments: bool):
+    db = factory()
+    try:
+        yield encoder.header()
+        result = db.execute(_issues_query(project_id)).scalars()
+        for batch in result.partitions():
+            comments = (
+                _comments_by_issue(db, [i.id for i in batch])
+                if include_comments
+                else None
+            )
+            yield encoder.encode(_records(batch, comments))
+    finally:
+        db.close()
+
+
+async def _stream_async(factory, project_id: UUID, encoder, include_comments: bool):
+    async with factory() as db:
+        yield encoder.header()
+        result = await db.stream_scalars(_issues_query(project_id))
+        async for batch in result.partitions():
+            comments = (
+                await db.run_sync(_comments_by_issue, [i.id for i in batch])
+                if include_comments
+                else None
+            )
+            yield encoder.encode(_records(batch, comments))
+
+
+@router.get("/{project_id}/export")
+async def export_project(
+    project_id: UUID,
+    request: Request,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include_comments: bool = False,
+    # Released before streaming starts: an export must not hold a second
+    # connection idle in transaction next to the stream's own.
+    db=Depends(get_db, scope="function"),
+    user=Depends(get_current_user_from_bearer),
+):
+    if not await run_db(db, Session.get, Project, project_id):
+        raise HTTPException(status_code=404, detail="Not found")
+    if export_format == "csv":
+        encoder = _CSVEncoder(include_comments)
+    else:
+        encoder = _NDJSONEncoder()
+    # The stream opens its own session, on whichever database get_db picked:
+    # the one above is closed before the body is sent.
+    async_factory, factory = session_factories(request.state.read_replica)
+    if database.AsyncSessionLocal is not None:
+        body = _stream_async(async_factory, project_id, encoder, include_comments)
+    else:
+        body = _stream_sync(factory, project_id, encoder, include_comments)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="project-{project_id}.{export_format}"'
+            )
+        },
+    )
@@ -1,83 +1,332 @@
-﻿from fastapi import APIRouter, Depends, HTTPException
+﻿import uuid
+from collections import Counter, defaultdict
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import SessionLocal
-from app.models.issue import Issue, StatusEnum
-from app.schemas.issue import IssueCreate, IssueUpdate, IssueResponse
+from app.core import outbox
+from app.core.cache import entity_cache
+from app.core.etag import detail_response, etag_matches, weak_etag
+from app.core.negotiation import JSON
+from app.core.serialization import columns, page_response
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from app.db.search import search_issues
+from app.db.session import get_db, get_primary_db, run_db
+from app.db.stats import apply_deltas, count_issue
+from app.models.issue import Issue, PriorityEnum, StatusEnum
+from app.schemas.issue import (
+    IssueBulkCreateResponse,
+    IssueBulkRequest,
+    IssueBulkUpdateItem,
+    IssueBulkUpdateResponse,
+    IssueCreate,
+    IssueUpdate,
+    IssueResponse,
+    IssueSearchHit,
+    IssueWithUsers,
+)
+from app.schemas.pagination import Page
+from app.dependencies.accept import response_media_type
+from app.dependencies.expand import eager, embed, expand_param
 from app.dependencies.permissions import get_current_user_from_bearer
 from uuid import UUID
 
 router = APIRouter(prefix="/api", tags=["Issues"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@router.get("/projects/{project_id}/issues", response_model=List[IssueResponse])
-def list_project_issues(
+@router.get(
+    "/projects/{project_id}/issues",
+    response_model=Page[IssueWithUsers],
+    response_model_exclude_unset=True,
+)
+async def list_project_issues(
     project_id: UUID,
+    response: Response,
     status: StatusEnum = None,
-    db: Session = Depends(get_db),
+    cursor: str = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand=Depends(expand_param("reporter", "assignee")),
+    media_type=Depends(response_media_type),
+    db=Depends(get_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    q = db.query(Issue).filter(Issue.project_id == project_id)
-    if status:
-        q = q.filter(Issue.status == status)
-    return q.all()
+    def _list(db: Session):
+        if expand:
+            q = db.query(Issue).options(*eager(Issue, expand))
+        else:
+            q = db.query(*columns(Issue, IssueResponse))
+        q = q.filter(Issue.project_id == project_id)
+        if status:
+            q = q.filter(Issue.status == status)
+        page = paginate(q, Issue, cursor, limit)
+        if expand:
+            page["items"] = [embed(i, IssueResponse, expand) for i in page["items"]]
+        return page
+
+    page = await run_db(db, _list)
+    if expand and media_type == JSON:
+        response.headers["Vary"] = "Accept"
+        return page
+    return page_response(page, media_type=media_type)
 
 
 @router.post("/projects/{project_id}/issues", response_model=IssueResponse)
-def create_issue(
+async def create_issue(
     project_id: UUID,
     payload: IssueCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
+    user=Depends(get_current_user_from_bearer),
+):
+    def _create(db: Session):
+        issue = Issue(
+            title=payload.title,
+            description=payload.description,
+            priority=payload.priority,
+            project_id=project_id,
+            reporter_id=UUID(user["sub"]),
+            assignee_id=payload.assignee_id,
+            due_date=payload.due_date,
+        )
+        db.add(issue)
+        db.flush()
+        data = IssueResponse.model_validate(issue)
+        deltas = Counter()
+        count_issue(deltas, project_id, issue.status, issue.priority)
+        apply_deltas(db, deltas)
+        outbox.enqueue(db, "issue.created", project_id, data)
+        db.commit()
+        return data
+
+    issue = await run_db(db, _create)
+    await entity_cache.invalidate("issue", issue.id)
+    outbox.worker.wake()
+    return issue
+
+
+_COUNTED_FIELDS = {"status", "priority"}
+
+
+def _item_error(index: int, exc: ValidationError) -> dict:
+    return {
+        "index": index,
+        "detail": exc.errors(include_url=False, include_context=False),
+    }
+
+
+@router.post(
+    "/projects/{project_id}/issues:bulk", response_model=IssueBulkCreateResponse
+)
+async def bulk_create_issues(
+    project_id: UUID,
+    payload: IssueBulkRequest,
+    db=Depends(get_db),
+    user=Depends(get_current_user_from_bearer),
+):
+    rows, errors = [], []
+    for index, item in enumerate(payload.items):
+        try:
+            data = IssueCreate.model_validate(item)
+        except ValidationError as exc:
+            errors.append(_item_error(index, exc))
+            continue
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "title": data.title,
+                "description": data.description,
+                "priority": data.priority,
+                "project_id": project_id,
+                "reporter_id": UUID(user["sub"]),
+                "assignee_id": data.assignee_id,
+                "due_date": data.due_date,
+            }
+        )
+
+    def _insert(db: Session):
+        if not rows:
+            return []
+        # One multi-row INSERT ... RETURNING per batch instead of a
+        # commit + refresh round-trip per issue.
+        created = db.scalars(
+            insert(Issue).returning(Issue, sort_by_parameter_order=True), rows
+        ).all()
+        # Serialize before commit expires the returned objects.
+        created = [IssueResponse.model_validate(issue) for issue in created]
+        deltas = Counter()
+        for issue in created:
+            count_issue(deltas, project_id, issue.status, issue.priority)
+        apply_deltas(db, deltas)
+        outbox.enqueue_many(
+            db, (("issue.created", project_id, issue) for issue in created)
+        )
+        db.commit()
+        return created
+
+    created = await run_db(db, _insert)
+    outbox.worker.wake()
+    return {"created": created, "errors": errors}
+
+
+@router.patch("/issues:bulk", response_model=IssueBulkUpdateResponse)
+async def bulk_update_issues(
+    payload: IssueBulkRequest,
+    db=Depends(get_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    issue = Issue(
-        title=payload.title,
-        description=payload.description,
-        priority=payload.priority,
+    groups, errors = defaultdict(list), []
+    for index, item in enumerate(payload.items):
+        try:
+            data = IssueBulkUpdateItem.model_validate(item)
+        except ValidationError as exc:
+            errors.append(_item_error(index, exc))
+            continue
+        changes = data.model_dump(exclude_unset=True, exclude={"id"})
+        if not changes:
+            errors.append({"index": index, "detail": "No fields to update"})
+            continue
+        groups[tuple(sorted(changes.items()))].append((index, data.id))
+
+    def _update(db: Session):
+        # Counted issues are locked up front so their old status/priority
+        # cannot change underneath the stats deltas.
+        counted = {
+            id
+            for changes, members in groups.items()
+            if any(k in _COUNTED_FIELDS for k, _ in changes)
+            for _, id in members
+        }
+        current = {}
+        if counted:
+            rows = db.execute(
+                select(Issue.id, Issue.project_id, Issue.status, Issue.priority)
+                .where(Issue.id.in_(counted))
+                .order_by(Issue.id)
+                .with_for_update()
+            )
+            current = {row.id: row._asdict() for row in rows}
+        deltas = Counter()
+        for row in current.values():
+            count_issue(deltas, row["project_id"], row["status"], row["priority"], -1)
+
+        # Items asking for the same change share one UPDATE ... WHERE id IN (...),
+        # which Postgres plans as id = ANY(...).
+        updated, changed = set(), []
+        for changes, members in groups.items():
+            result = db.execute(
+                update(Issue)
+                .where(Issue.id.in_([id for _, id in members]))
+                .values(dict(changes))
+                .returning(Issue.id, Issue.project_id)
+                .execution_options(synchronize_session=False)
+            )
+            for id, project_id in result:
+                updated.add(id)
+                # Bulk events carry only the changed fields.
+                changed.append(
+                    ("issue.updated", project_id, {"id": id, **dict(changes)})
+                )
+            for _, id in members:
+                if id in current:
+                    current[id].update(
+                        (k, v) for k, v in changes if k in _COUNTED_FIELDS
+                    )
+        for row in current.values():
+            count_issue(deltas, row["project_id"], row["status"], row["priority"])
+        apply_deltas(db, deltas)
+        outbox.enqueue_many(db, changed)
+        db.commit()
+        return updated
+
+    updated = await run_db(db, _update)
+    outbox.worker.wake()
+    for members in groups.values():
+        for index, id in members:
+            if id not in updated:
+                errors.append({"index": index, "detail": "Not found"})
+    await entity_cache.invalidate_many("issue", updated)
+    errors.sort(key=lambda e: e["index"])
+    return {"updated": sorted(updated, key=str), "errors": errors}
+
+
+# Declared before /issues/{issue_id} so "search" is not taken for an id.
+@router.get("/issues/search", response_model=Page[IssueSearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=256),
+    project_id: UUID = None,
+    status: StatusEnum = None,
+    priority: PriorityEnum = None,
+    assignee_id: UUID = None,
+    cursor: str = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_db),
+    user=Depends(get_current_user_from_bearer),
+):
+    return await run_db(
+        db,
+        search_issues,
+        q,
         project_id=project_id,
-        reporter_id=UUID(user["sub"]),
-        assignee_id=payload.assignee_id,
-        due_date=payload.due_date,
+        status=status,
+        priority=priority,
+        assignee_id=assignee_id,
+        cursor=cursor,
+        limit=limit,
     )
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
-    return issue
 
 
 @router.get("/issues/{issue_id}", response_model=IssueResponse)
-def get_issue(
+async def get_issue(
     issue_id: UUID,
-    db: Session = Depends(get_db),
+    if_none_match: str = Header(None),
+    # Fills the shared cache: a lagging replica's row would outlive the lag.
+    db=Depends(get_primary_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    issue = db.get(Issue, issue_id)
-    if not issue:
-        raise HTTPException(status_code=404, detail="Not found")
-    return issue
+    async def _load():
+        issue = await run_db(db, Session.get, Issue, issue_id)
+        if not issue:
+            raise HTTPException(status_code=404, detail="Not found")
+        return IssueResponse.model_validate(issue).model_dump_json()
+
+    body = await entity_cache.get_or_load("issue", issue_id, _load)
+    return detail_response(body, if_none_match)
 
 
 @router.patch("/issues/{issue_id}", response_model=IssueResponse)
-def update_issue(
+async def update_issue(
     issue_id: UUID,
     payload: IssueUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: str = Header(None),
+    db=Depends(get_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    issue = db.get(Issue, issue_id)
-    if not issue:
-        raise HTTPException(status_code=404, detail="Not found")
-    for k, v in payload.dict(exclude_unset=True).items():
-        setattr(issue, k, v)
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
+    changes = payload.dict(exclude_unset=True)
+    # Stats changes need the old values read under a row lock, as does If-Match.
+    lock = bool(if_match) or not _COUNTED_FIELDS.isdisjoint(changes)
+
+    def _update(db: Session):
+        issue = db.get(Issue, issue_id, with_for_update=True if lock else None)
+        if not issue:
+            raise HTTPException(status_code=404, detail="Not found")
+        if if_match and not etag_matches(if_match, weak_etag(issue.updated_at)):
+            raise HTTPException(status_code=412, detail="Precondition Failed")
+        deltas = Counter()
+        count_issue(deltas, issue.project_id, issue.status, issue.priority, -1)
+        for k, v in changes.items():
+            setattr(issue, k, v)
+        count_issue(deltas, issue.project_id, issue.status, issue.priority)
+        db.add(issue)
+        db.flush()
+        data = IssueResponse.model_validate(issue)
+        apply_deltas(db, deltas)
+        outbox.enqueue(db, "issue.updated", issue.project_id, data)
+        db.commit()
+        return data
+
+    issue = await run_db(db, _update)
+    await entity_cache.invalidate("issue", issue_id)
+    outbox.worker.wake()
+    response.headers["ETag"] = weak_etag(issue.updated_at)
     return issue
@@ -1,94 +1,193 @@
-﻿from fastapi import APIRouter, Depends, HTTPException, Query
+﻿from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import SessionLocal
+from app.core import events
+from app.core.cache import entity_cache
+from app.core.etag import detail_response, etag_matches, weak_etag
+from app.core.serialization import columns, page_response, render
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from app.db.session import get_db, get_primary_db, run_db
+from app.db.stats import get_project_stats
+from app.db.sync import get_changes
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectUpdate,
+    ProjectResponse,
+    ProjectStatsResponse,
+)
+from app.schemas.pagination import Page
+from app.schemas.sync import ChangesResponse
+from app.dependencies.accept import response_media_type
 from app.dependencies.permissions import get_current_user_from_bearer, require_role
 from uuid import UUID
 
 router = APIRouter(prefix="/api/projects", tags=["Projects"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@router.get("", response_model=List[ProjectResponse])
-def list_projects(
+@router.get("", response_model=Page[ProjectResponse])
+async def list_projects(
     search: str = Query(None),
     is_archived: bool = False,
-    db: Session = Depends(get_db),
+    cursor: str = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    media_type=Depends(response_media_type),
+    db=Depends(get_db),
     user=Depends(get_current_user_from_bearer),
 ):
-    q = db.query(Project).filter(Project.is_archived == is_archived)
-    if search:
-        q = q.filter(Project.name.ilike(f"%{search}%"))
-    return q.all()
+    def _list(db: Session):
+        q = db.query(*columns(Project, ProjectResponse))
+        q = q.filter(Project.is_archived == is_archived)
+        if search:
+            q = q.filter(Project.name.ilike(f"%{search}%"))
+        return paginate(q, Project, cursor, limit)
+
+    return page_response(await run_db(db, _list), media_type=media_type)
 
 
 @router.post("", response_model=ProjectResponse)
-def create_project(
+async def create_project(
     payload: ProjectCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user=Depends(require_role("manager", "admin")),
 ):
-    existing = db.query(Project).filter(Project.name == payload.name).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Project name exists")
-    proj = Project(
-        name=payload.name, description=payload.description, created_by=UUID(user["sub"])
-    )
-    db.add(proj)
-    db.commit()
-    db.refresh(proj)
-    return proj
+    def _create(db: Session):
+        existing = db.query(Project).filter(Project.name == payload.name).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Project name exists")
+        proj = Project(
+            name=payload.name,
+            description=payload.description,
+            created_by=UUID(user["sub"]),
+        )
+        db.add(proj)
+        db.commit()
+        db.refresh(proj)
+        return proj
+
+    return await run_db(db, _create)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(
+async def get_project(
+    project_id: UUID,
+    if_none_match: str = Header(None),
+    # Fills the shared cache: a lagging replica's row would outlive the lag.
+    db=Depends(get_primary_db),
+    user=Depends(get_current_user_from_bearer),
+):
+    async def _load():
+        proj = await run_db(db, Session.get, Project, project_id)
+        if not proj:
+            raise HTTPException(status_code=404, detail="Not found")
+        return ProjectResponse.model_validate(proj).model_dump_json()
+
+    body = await entity_cache.get_or_load("project", project_id, _load)
+    return detail_response(body, if_none_match)
+
+
+@router.get("/{project_id}/stats", response_model=ProjectStatsResponse)
+async def project_stats(
+    project_id: UUID,
+    db=Depends(get_db),
+    user=Depends(get_current_user_from_bearer),
+):
+    def _stats(db: Session):
+        if not db.get(Project, project_id):
+            raise HTTPException(status_code=404, detail="Not found")
+        return get_project_stats(db, project_id)
+
+    return await run_db(db, _stats)
+
+
+@router.get("/{project_id}/changes", response_model=ChangesResponse)
+async def project_changes(
+    project_id: UUID,
+    since: str = Query(None, description="next_cursor from the previous call"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    media_type=Depends(response_media_type),
+    # The cursor rewinds from the server clock; a lagging replica could be
+    # missing rows from before that point, which would then never be sent.
+    db=Depends(get_primary_db),
+    user=Depends(get_current_user_from_bearer),
+):
+    """Issues and comments created, updated or deleted after ``since``.
+
+    Omit ``since`` for a full initial sync. Keep calling with ``next_cursor``
+    while ``has_more`` is true; store the last cursor for the next sync.
+    """
+
+    def _changes(db: Session):
+        if not db.get(Project, project_id):
+            raise HTTPException(status_code=404, detail="Not found")
+        return get_changes(db, project_id, since, limit)
+
+    return render(await run_db(db, _changes), media_type=media_type)
+
+
+@router.get("/{project_id}/events")
+async def project_events(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    last_event_id: str = Header(None),
+    # Released before streaming starts: an open feed must not pin a connection.
+    db=Depends(get_db, scope="function"),
     user=Depends(get_current_user_from_bearer),
 ):
-    proj = db.get(Project, project_id)
-    if not proj:
+    """Server-Sent Events for issue and comment changes in the project."""
+    if last_event_id and not events.EVENT_ID.match(last_event_id):
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    if not await run_db(db, Session.get, Project, project_id):
         raise HTTPException(status_code=404, detail="Not found")
-    return proj
+    return StreamingResponse(
+        events.event_stream(project_id, last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: UUID,
     payload: ProjectUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: str = Header(None),
+    db=Depends(get_db),
     user=Depends(require_role("manager", "admin")),
 ):
-    proj = db.get(Project, project_id)
-    if not proj:
-        raise HTTPException(status_code=404, detail="Not found")
-    for k, v in payload.dict(exclude_unset=True).items():
-        setattr(proj, k, v)
-    db.add(proj)
-    db.commit()
-    db.refresh(proj)
+    def _update(db: Session):
+        proj = db.get(Project, project_id, with_for_update=True if if_match else None)
+        if not proj:
+            raise HTTPException(status_code=404, detail="Not found")
+        if if_match and not etag_matches(if_match, weak_etag(proj.updated_at)):
+            raise HTTPException(status_code=412, detail="Precondition Failed")
+        for k, v in payload.dict(exclude_unset=True).items():
+            setattr(proj, k, v)
+        db.add(proj)
+        db.commit()
+        db.refresh(proj)
+        return proj
+
+    proj = await run_db(db, _update)
+    await entity_cache.invalidate("project", project_id)
+    response.headers["ETag"] = weak_etag(proj.updated_at)
     return proj
 
 
 @router.delete("/{project_id}")
-def archive_project(
+async def archive_project(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user=Depends(require_role("manager", "admin")),
 ):
-    proj = db.get(Project, project_id)
-    if not proj:
-        raise HTTPException(status_code=404, detail="Not found")
-    proj.is_archived = True
-    db.add(proj)
-    db.commit()
+    def _archive(db: Session):
+        proj = db.get(Project, project_id)
+        if not proj:
+            raise HTTPException(status_code=404, detail="Not found")
+        proj.is_archived = True
+        db.add(proj)
+        db.commit()
+
+    await run_db(db, _archive)
+    await entity_cache.invalidate("project", project_id)
     return {"message": "archived"}
@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import redis
+
+from app.core import redis_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_L1_SIZE = int(os.getenv("CACHE_L1_SIZE", "5000"))
+CACHE_L1_TTL_SECONDS = float(os.getenv("CACHE_L1_TTL_SECONDS", "2"))
+# A fill that started before an invalidation must not write the old row back.
+# Invalidation stamps a short-lived fence token; a fill only lands if the
+# fence is unchanged since its read, so later fills are unaffected.
+CACHE_FENCE_MS = int(os.getenv("CACHE_FENCE_MS", "5000"))
+
+FILL_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') == ARGV[3] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+end
+return 0
+"""
+
+INVALIDATE_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    redis.call('SET', key .. ':fence', ARGV[1], 'PX', ARGV[2])
+    redis.call('DEL', key)
+end
+return 0
+"""
+
+
+class EntityCache:
+    """Read-through cache of serialized detail responses.
+
+    L1 is a small per-process LRU with a short TTL, which bounds how stale
+    another process can be after a write. L2 is Redis, invalidated explicitly
+    by the write endpoints. Any Redis error degrades to a plain DB read.
+    """
+
+    def __init__(self, l1_size: int, l1_ttl: float, ttl: int, fence_ms: int):
+        self.l1_size = l1_size
+        self.l1_ttl = l1_ttl
+        self.ttl = ttl
+        self.fence_ms = fence_ms
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self._l1 = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, id) -> str:
+        return f"cache:{kind}:{id}"
+
+    async def get_or_load(self, kind: str, id, loader) -> str:
+        """Return the cached body for ``kind``/``id``, calling ``loader`` on a miss.
+
+        ``loader`` is an async callable returning the serialized body; any
+        exception it raises (e.g. a 404) propagates and nothing is cached.
+        """
+        key = self.key(kind, id)
+        fence_key = f"{key}:fence"
+        with self._lock:
+            generation = self._generation
+            entry = self._l1.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._l1.move_to_end(key)
+                self.l1_hits += 1
+                return entry[1]
+        try:
+            body, fence = await redis_client.call("mget", key, fence_key)
+        except redis.RedisError:
+            logger.warning("cache read failed for %s", key, exc_info=True)
+            body, fence = None, None
+        if body is not None:
+            self.l2_hits += 1
+        else:
+            self.misses += 1
+            body = await loader()
+            try:
+                await redis_client.call(
+                    "eval",
+                    FILL_SCRIPT,
+                    2,
+                    key,
+                    fence_key,
+                    body,
+                    self.ttl,
+                    fence or "",
+                )
+            except redis.RedisError:
+                logger.warning("cache fill failed for %s", key, exc_info=True)
+        self._fill_l1(key, body, generation)
+        return body
+
+    async def invalidate(self, kind: str, id):
+        await self.invalidate_many(kind, [id])
+
+    async def invalidate_many(self, kind: str, ids):
+        keys = [self.key(kind, id) for id in ids]
+        if not keys:
+            return
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._l1.pop(key, None)
+        try:
+            await redis_client.call(
+                "eval",
+                INVALIDATE_SCRIPT,
+                len(keys),
+                *keys,
+                uuid.uuid4().hex,
+                self.fence_ms,
+            )
+        except redis.RedisError:
+            logger.warning("cache invalidation failed for %s", keys, exc_info=True)
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+
+    def hit_ratio(self) -> float:
+        total = self.l1_hits + self.l2_hits + self.misses
+        return (self.l1_hits + self.l2_hits) / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio(),
+            "l1_size": len(self._l1),
+        }
+
+    def _fill_l1(self, key: str, body: str, generation: int):
+        if self.l1_size <= 0:
+            return
+        with self._lock:
+            # Any invalidation since the read started may concern this key.
+            if self._generation != generation:
+                return
+            self._l1[key] = (time.monotonic() + self.l1_ttl, body)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_size:
+                self._l1.popitem(last=False)
+
+
+entity_cache = EntityCache(
+    CACHE_L1_SIZE, CACHE_L1_TTL_SECONDS, CACHE_TTL_SECONDS, CACHE_FENCE_MS
+)
@@ -0,0 +1,174 @@
+import os
+import zlib
+from functools import partial
+
+import anyio.to_thread
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.negotiation import choose_encoding
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+# Chunks at least this large are compressed off the event loop.
+COMPRESSION_THREAD_MIN_SIZE = int(
+    os.getenv("COMPRESSION_THREAD_MIN_SIZE", str(128 * 1024))
+)
+
+# Already compressed, or must reach the client unbuffered.
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/grpc",
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+)
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int = GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def encode(self, body: bytes, final: bool) -> bytes:
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(body) + self._compressor.flush(mode)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int = BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def encode(self, body: bytes, final: bool) -> bytes:
+        out = self._compressor.process(body)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionResponder:
+    """Compresses one response on its way to ``send``.
+
+    The encoder comes from ``make_encoder`` and is only built once a body
+    turns out to be worth compressing. Every chunk of a streamed body is
+    flushed, so the client can decode it as it arrives instead of when the
+    stream ends.
+    """
+
+    def __init__(self, app, make_encoder, minimum_size: int):
+        self.app = app
+        self.make_encoder = make_encoder
+        self.encoder = None
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start = None
+        self.passthrough = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self._send)
+
+    async def _send(self, message):
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if self.passthrough or kind not in (
+            "http.response.body",
+            "http.response.pathsend",
+        ):
+            await self.send(message)
+            return
+        if self.start is not None and (
+            kind == "http.response.pathsend" or not self._begin(message)
+        ):
+            start, self.start = self.start, None
+            await self.send(start)
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder is not None:
+            message = {**message, "body": await self._encode(body, more_body)}
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if more_body or start.get("trailers", False):
+                if "content-length" in headers:
+                    del headers["content-length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(start)
+        await self.send(message)
+
+    def _begin(self, message) -> bool:
+        """Decide on the first body chunk whether the response is compressed."""
+        if not message.get("more_body", False):
+            if len(message.get("body", b"")) < self.minimum_size:
+                return False
+        self.encoder = self.make_encoder()
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        headers["Content-Encoding"] = self.encoder.name
+        return True
+
+    async def _encode(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= COMPRESSION_THREAD_MIN_SIZE:
+            return await anyio.to_thread.run_sync(
+                self.encoder.encode, body, not more_body
+            )
+        return self.encoder.encode(body, not more_body)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses with brotli or gzip.
+
+    Bodies under ``minimum_size`` go out as they are, as do already encoded
+    responses, partial content and the types in ``EXCLUDED_CONTENT_TYPES``.
+    Streamed bodies are compressed chunk by chunk, so nothing is buffered
+    until the end.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding == "br":
+            make_encoder = partial(BrotliEncoder, self.brotli_quality)
+        elif encoding == "gzip":
+            make_encoder = partial(GzipEncoder, self.gzip_level)
+        else:
+            await self.app(scope, receive, send)
+            return
+        await CompressionResponder(self.app, make_encoder, self.minimum_size)(
+            scope, receive, send
+        )
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,45 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
 
+    # Serve requests on an asyncpg AsyncEngine and redis.asyncio instead of
+    # psycopg2 + blocking redis in the threadpool.
+    ASYNC_MODE: bool = False
+    # Defaults to DATABASE_URL with the driver swapped for asyncpg.
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Read replica for GET requests; unset sends everything to the primary.
+    # The async URL defaults to the replica URL with the driver swapped.
+    DATABASE_REPLICA_URL: Optional[str] = None
+    ASYNC_DATABASE_REPLICA_URL: Optional[str] = None
+    # Reads leave the replica while its replay lag is above MAX_LAG or it
+    # failed its last check (run every REPLICA_CHECK_SECONDS). A caller
+    # reads from the primary for REPLICA_STICKY_SECONDS after a write, which
+    # should exceed REPLICA_MAX_LAG_SECONDS + REPLICA_CHECK_SECONDS.
+    REPLICA_MAX_LAG_SECONDS: float = 2
+    REPLICA_CHECK_SECONDS: float = 1
+    REPLICA_STICKY_SECONDS: float = 5
+
+    # argon2 runs on a dedicated process pool; 0 workers hashes in the
+    # threadpool instead. Requests beyond MAX_PENDING get a 503.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 102400
+    ARGON2_PARALLELISM: int = 8
+
+    # Per-process connection pool (applies to both engines). Wait longer than
+    # DB_POOL_TIMEOUT seconds for a connection and the request fails.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # 0 disables the server-side statement timeout.
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    # Connecting through PgBouncer in transaction mode: no server-side
+    # prepared statements and no session-level settings.
+    DB_EXTERNAL_POOLER: bool = False
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
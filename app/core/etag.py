@@ -0,0 +1,53 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _micros(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from ``parts``; datetimes are compared by instant."""
+    raw = "|".join(
+        str(_micros(p)) if isinstance(p, datetime) else str(p) for p in parts
+    )
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match/If-Match value.
+
+    If-Match is compared weakly as well, since every ETag this API issues is
+    weak (RFC 9110 would otherwise never let them match).
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def detail_response(body: str, if_none_match: str = None) -> Response:
+    """Answer a cached detail body, or 304 if the client already has it.
+
+    The ETag comes from the body's ``updated_at``, so a cache hit needs no
+    database access and no re-serialization either way.
+    """
+    etag = weak_etag(datetime.fromisoformat(json.loads(body)["updated_at"]))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
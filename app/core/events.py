@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+
+import redis
+from fastapi.concurrency import run_in_threadpool
+
+from app.core import redis_client
+from app.core.metrics import redis_timer
+
+logger = logging.getLogger(__name__)
+
+EVENTS_STREAM_MAXLEN = int(os.getenv("EVENTS_STREAM_MAXLEN", "10000"))
+EVENTS_BACKLOG_LIMIT = int(os.getenv("EVENTS_BACKLOG_LIMIT", "1000"))
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "1000"))
+
+EVENT_ID = re.compile(r"^\d+-\d+$")
+RESET = "event: reset\ndata: {}\n\n"
+
+
+def stream_key(project_id) -> str:
+    return f"events:project:{project_id}"
+
+
+def _order(event_id: str):
+    ms, seq = event_id.split("-")
+    return int(ms), int(seq)
+
+
+def _format(event_id: str, fields: dict) -> str:
+    return f"id: {event_id}\nevent: {fields['type']}\ndata: {fields['data']}\n\n"
+
+
+async def publish(project_id, event_type: str, data: dict):
+    await publish_many([(project_id, event_type, data)])
+
+
+async def publish_many(events):
+    """Append ``(project_id, type, data)`` events to their project streams.
+
+    The stream id doubles as the SSE event id, which is what makes
+    Last-Event-ID resumption a plain XRANGE. All events go in one pipelined
+    round trip. Redis errors propagate: writes reach this through the
+    outbox worker (app.core.outbox), which retries them.
+    """
+    events = list(events)
+    if not events:
+        return
+
+    def _fill(pipe):
+        for project_id, event_type, data in events:
+            pipe.xadd(
+                stream_key(project_id),
+                {"type": event_type, "data": json.dumps(data, default=str)},
+                maxlen=EVENTS_STREAM_MAXLEN,
+                approximate=True,
+            )
+
+    def _send_sync():
+        pipe = redis_client._redis.pipeline(transaction=False)
+        _fill(pipe)
+        pipe.execute()
+
+    with redis_timer("xadd"):
+        if redis_client._aredis is not None:
+            async with redis_client._aredis.pipeline(transaction=False) as pipe:
+                _fill(pipe)
+                await pipe.execute()
+        else:
+            await run_in_threadpool(_send_sync)
+
+
+class _Subscriber:
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind is told to resync rather than
+            # holding an unbounded backlog in this process.
+            self.overflowed = True
+
+
+class ChangeFeedHub:
+    """One XREAD loop per process, fanning stream entries out to SSE clients.
+
+    However many clients are connected, the process holds one blocking Redis
+    connection and reads each watched stream once.
+    """
+
+    def __init__(self, client=None, block_ms: int = 1000):
+        self._client = client
+        self.block_ms = block_ms
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._cursors = {}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def client(self):
+        return self._client or redis_client._redis
+
+    def _latest(self, key: str) -> str:
+        entries = self.client.xrevrange(key, count=1)
+        return entries[0][0] if entries else "0-0"
+
+    def subscribe(self, key: str, loop):
+        """Register a subscriber; returns it with the stream's latest id."""
+        sub = _Subscriber(loop)
+        with self._lock:
+            if key not in self._cursors:
+                self._cursors[key] = self._latest(key)
+            self._subscribers[key].add(sub)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="change-feed", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return sub, self._latest(key)
+
+    def unsubscribe(self, key: str, sub):
+        with self._lock:
+            self._subscribers[key].discard(sub)
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+                self._cursors.pop(key, None)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.block_ms / 1000 + 1)
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                streams = dict(self._cursors)
+            if not streams:
+                self._wake.wait(1.0)
+                self._wake.clear()
+                continue
+            try:
+                response = self.client.xread(streams, count=100, block=self.block_ms)
+            except redis.RedisError:
+                logger.warning("change feed read failed; retrying", exc_info=True)
+                self._stop.wait(1.0)
+                continue
+            for key, entries in response or []:
+                with self._lock:
+                    if key not in self._cursors:
+                        continue
+                    self._cursors[key] = entries[-1][0]
+                    subscribers = list(self._subscribers[key])
+                for sub in subscribers:
+                    for entry in entries:
+                        sub.loop.call_soon_threadsafe(sub.offer, entry)
+
+
+hub = ChangeFeedHub()
+
+
+async def event_stream(project_id, last_event_id: str, is_disconnected):
+    """SSE body for one client: the backlog after ``last_event_id``, then live events.
+
+    The subscriber is registered before the backlog is read, so nothing
+    falls in between. Anything delivered twice is dropped by comparing ids.
+    """
+    key = stream_key(project_id)
+    sub, latest = await run_in_threadpool(
+        hub.subscribe, key, asyncio.get_running_loop()
+    )
+    try:
+        sent = latest
+        if last_event_id:
+            sent = last_event_id
+            oldest = await redis_client.call("xrange", key, "-", "+", count=1)
+            backlog = await redis_client.call(
+                "xrange", key, f"({last_event_id}", "+", count=EVENTS_BACKLOG_LIMIT + 1
+            )
+            if len(backlog) > EVENTS_BACKLOG_LIMIT or (
+                oldest and _order(oldest[0][0]) > _order(last_event_id)
+            ):
+                # Trimmed or too far behind: the client has to refetch.
+                yield RESET
+                sent = latest
+            else:
+                for event_id, fields in backlog:
+                    yield _format(event_id, fields)
+                    sent = event_id
+        while not await is_disconnected():
+            try:
+                event_id, fields = await asyncio.wait_for(
+                    sub.queue.get(), EVENTS_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if sub.overflowed:
+                yield RESET
+                return
+            if _order(event_id) <= _order(sent):
+                continue
+            yield _format(event_id, fields)
+            sent = event_id
+    finally:
+        hub.unsubscribe(key, sub)
@@ -1,13 +1,22 @@
-﻿import os
+﻿import hashlib
+import os
+import threading
 import time
 import uuid
+from collections import OrderedDict
+
+import anyio.to_thread
 import jwt
 
+from app.core.metrics import jwt_latency
+
 PRIVATE_KEY_PATH = os.getenv("PRIVATE_KEY_PATH", "keys/private.pem")
 PUBLIC_KEY_PATH = os.getenv("PUBLIC_KEY_PATH", "keys/public.pem")
 ACCESS_EXPIRE = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15")) * 60
 REFRESH_EXPIRE = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")) * 24 * 3600
 ALGORITHM = os.getenv("ALGORITHM", "RS256")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
 
 
 def _load_private():
@@ -63,3 +72,118 @@ def decode_token(token: str) -> dict:
     if _pub is None:
         _pub = _load_public()
     return jwt.decode(token, _pub, algorithms=[ALGORITHM])
+
+
+# RS256 signing and verification take milliseconds of CPU; async handlers
+# run them in a worker thread so they do not stall the event loop.
+async def decode_token_async(token: str) -> dict:
+    return await anyio.to_thread.run_sync(decode_token, token)
+
+
+def _token_pair(data: dict):
+    return create_access_token(data), create_refresh_token(data)
+
+
+async def create_token_pair_async(data: dict):
+    """``(access, refresh)`` for ``data``, both signed in one worker thread hop."""
+    return await anyio.to_thread.run_sync(_token_pair, data)
+
+
+class TokenCache:
+    """Bounded LRU of verified claims keyed by the SHA-256 of the raw token.
+
+    Entries never outlive the token's own ``exp``, so an expired token always
+    falls through to ``decode_token`` and fails there.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._keys_by_jti = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, key: bytes, claims: dict):
+        if self.maxsize <= 0:
+            return
+        expires_at = min(claims.get("exp", float("inf")), time.time() + self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, claims)
+            if claims.get("jti"):
+                self._keys_by_jti[claims["jti"]] = key
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_jti(self, jti: str):
+        with self._lock:
+            key = self._keys_by_jti.get(jti)
+            if key is not None:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_jti.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _drop(self, key: bytes):
+        _, claims = self._entries.pop(key)
+        jti = claims.get("jti")
+        if jti and self._keys_by_jti.get(jti) == key:
+            del self._keys_by_jti[jti]
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
+
+
+def decode_token_cached(token: str) -> dict:
+    """``decode_token`` that skips signature verification for recently seen tokens."""
+    start = time.perf_counter()
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    result = "hit"
+    if claims is None:
+        result = "miss"
+        claims = decode_token(token)
+        token_cache.put(key, claims)
+    jwt_latency.labels(result).observe(time.perf_counter() - start)
+    return dict(claims)
+
+
+async def decode_token_cached_async(token: str) -> dict:
+    """``decode_token_cached`` for async callers.
+
+    Hits are answered inline; a miss runs the RS256 verification in a worker
+    thread so it does not stall the event loop.
+    """
+    start = time.perf_counter()
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    result = "hit"
+    if claims is None:
+        result = "miss"
+        claims = await anyio.to_thread.run_sync(decode_token, token)
+        token_cache.put(key, claims)
+    jwt_latency.labels(result).observe(time.perf_counter() - start)
+    return dict(claims)
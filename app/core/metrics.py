@@ -0,0 +1,246 @@
+import time
+from contextlib import contextmanager
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Buckets from 1ms to 10s; the default set starts at 5ms, which hides the
+# cache and Redis paths.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+http_latency = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+db_latency = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by statement type.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+redis_latency = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command round-trip time.",
+    ["command"],
+    buckets=LATENCY_BUCKETS,
+)
+redis_errors = Counter(
+    "redis_command_errors_total", "Redis commands that raised.", ["command"]
+)
+outbox_events = Counter(
+    "outbox_events_total",
+    "Outbox rows handled by the worker, by outcome.",
+    ["outcome"],
+)
+rate_limited = Counter(
+    "rate_limited_total",
+    "Requests rejected by the rate limiter, by rule and where it was decided.",
+    ["rule", "source"],
+)
+db_routing = Counter(
+    "db_session_routing_total",
+    "Request database sessions by target and the reason it was chosen.",
+    ["target", "reason"],
+)
+jwt_latency = Histogram(
+    "jwt_decode_duration_seconds",
+    "Bearer token decoding time, split by claims-cache result.",
+    ["cache"],
+    buckets=LATENCY_BUCKETS,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request count and latency.
+
+    Requests are labelled with the matched route's path template, which
+    Starlette leaves in ``scope["route"]``, so ids never become label values.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500
+        start = time.perf_counter()
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            labels = (scope["method"], route, str(status))
+            http_requests.labels(*labels).inc()
+            http_latency.labels(*labels).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def redis_timer(command: str):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        redis_errors.labels(command).inc()
+        raise
+    finally:
+        redis_latency.labels(command).observe(time.perf_counter() - start)
+
+
+# The start time lives on the statement's execution context, which is
+# discarded with it: a statement that raises leaves nothing behind on the
+# pooled connection.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def statement_seconds(context):
+    """Seconds the current statement of ``context`` has run, or None if untimed."""
+    started = getattr(context, "_query_start", None)
+    return None if started is None else time.perf_counter() - started
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = statement_seconds(context)
+    if seconds is None:
+        return
+    operation = statement.lstrip()[:6].upper()
+    if operation not in _OPERATIONS:
+        operation = "OTHER"
+    db_latency.labels(operation).observe(seconds)
+
+
+class StatsCollector:
+    """Exposes the counters the pool, caches and hasher already keep."""
+
+    def describe(self):
+        # Skips the registry's eager collect() at import time.
+        return []
+
+    def collect(self):
+        # Imported here: those modules import this one for their timers.
+        from app.core.cache import entity_cache
+        from app.core.jwt import token_cache
+        from app.core.security import hash_stats
+        from app.db.pool import pool_stats
+
+        gauges = {
+            "db_pool_size": "Configured pool size.",
+            "db_pool_checked_out": "Connections currently checked out.",
+            "db_pool_overflow": "Overflow connections currently open.",
+            "db_pool_wait_seconds_max": "Longest checkout wait seen.",
+        }
+        counters = {
+            "db_pool_checkouts": "Successful connection checkouts.",
+            "db_pool_wait_seconds": "Total time spent waiting for a connection.",
+            "db_pool_overflow_events": "Checkouts that opened an overflow connection.",
+            "db_pool_timeouts": "Checkouts that gave up after DB_POOL_TIMEOUT.",
+        }
+        families = {
+            name: GaugeMetricFamily(name, doc, labels=["pool"])
+            for name, doc in gauges.items()
+        }
+        families.update(
+            (name, CounterMetricFamily(name, doc, labels=["pool"]))
+            for name, doc in counters.items()
+        )
+        for pool, s in pool_stats().items():
+            families["db_pool_size"].add_metric([pool], s["size"])
+            families["db_pool_checked_out"].add_metric([pool], s["checked_out"])
+            families["db_pool_overflow"].add_metric([pool], s["overflow"])
+            families["db_pool_wait_seconds_max"].add_metric(
+                [pool], s["wait_seconds_max"]
+            )
+            families["db_pool_checkouts"].add_metric([pool], s["checkouts"])
+            families["db_pool_wait_seconds"].add_metric([pool], s["wait_seconds_total"])
+            families["db_pool_overflow_events"].add_metric([pool], s["overflow_events"])
+            families["db_pool_timeouts"].add_metric([pool], s["timeouts"])
+        yield from families.values()
+
+        cache = entity_cache.stats()
+        hits = CounterMetricFamily(
+            "entity_cache_hits", "Detail cache hits by tier.", labels=["tier"]
+        )
+        hits.add_metric(["l1"], cache["l1_hits"])
+        hits.add_metric(["l2"], cache["l2_hits"])
+        yield hits
+        yield CounterMetricFamily(
+            "entity_cache_misses", "Detail cache misses.", value=cache["misses"]
+        )
+        yield GaugeMetricFamily(
+            "entity_cache_l1_entries", "Entries in the L1 cache.", cache["l1_size"]
+        )
+
+        tokens = token_cache.stats()
+        yield CounterMetricFamily(
+            "jwt_cache_hits", "Token claims cache hits.", value=tokens["hits"]
+        )
+        yield CounterMetricFamily(
+            "jwt_cache_misses", "Token claims cache misses.", value=tokens["misses"]
+        )
+        yield GaugeMetricFamily(
+            "jwt_cache_entries", "Entries in the claims cache.", tokens["size"]
+        )
+
+        hashing = hash_stats.stats()
+        yield CounterMetricFamily(
+            "password_hash_calls", "argon2 hash/verify calls.", value=hashing["calls"]
+        )
+        yield CounterMetricFamily(
+            "password_hash_rejected",
+            "Hash requests rejected with 503.",
+            value=hashing["rejected"],
+        )
+        yield CounterMetricFamily(
+            "password_hash_wait_seconds",
+            "Time hash requests queued for a worker.",
+            value=hashing["wait_seconds_total"],
+        )
+        yield CounterMetricFamily(
+            "password_hash_seconds",
+            "Time spent hashing.",
+            value=hashing["hash_seconds_total"],
+        )
+        yield CounterMetricFamily(
+            "password_hash_pool_restarts",
+            "Hash process pools replaced after a worker died.",
+            value=hashing["pool_restarts"],
+        )
+
+
+REGISTRY.register(StatsCollector())
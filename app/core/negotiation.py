@@ -0,0 +1,42 @@
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+def quality_values(header: str) -> dict:
+    """``{token: q}`` from an Accept or Accept-Encoding value, lower-cased."""
+    values = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token.strip():
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        values[token.strip().lower()] = q
+    return values
+
+
+def choose_encoding(header: str) -> str:
+    """``br``, ``gzip`` or ``identity``; brotli wins ties, being smaller."""
+    accepted = quality_values(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = "identity", 0.0
+    for coding in ("br", "gzip"):
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def choose_media_type(header: str) -> str:
+    """MessagePack only when asked for by name and not ranked below JSON."""
+    accepted = quality_values(header)
+    msgpack_q = max(accepted.get(t, 0.0) for t in _MSGPACK_TYPES)
+    json_q = accepted.get(JSON, accepted.get("application/*", accepted.get("*/*", 0.0)))
+    return MSGPACK if msgpack_q > 0 and msgpack_q >= json_q else JSON
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.metrics import outbox_events
+from app.db import database
+from app.db.session import run_db
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_WORKER_ENABLED = os.getenv("OUTBOX_WORKER_ENABLED", "true").lower() == "true"
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "1"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "300"))
+
+_handlers = []
+
+
+def handler(*prefixes: str):
+    """Register ``async fn(rows)`` for outbox topics starting with ``prefixes``."""
+
+    def register(fn):
+        _handlers.append((prefixes, fn))
+        return fn
+
+    return register
+
+
+@handler("issue.", "comment.")
+async def publish_change_events(rows):
+    await events.publish_many((r.project_id, r.topic, r.payload) for r in rows)
+
+
+def enqueue(db: Session, topic: str, project_id, payload):
+    """Add an outbox row to the caller's transaction; it commits with the change."""
+    db.add(
+        OutboxEvent(
+            topic=topic, project_id=project_id, payload=jsonable_encoder(payload)
+        )
+    )
+
+
+def enqueue_many(db: Session, items):
+    """Insert ``(topic, project_id, payload)`` rows in one executemany."""
+    rows = [
+        {"topic": topic, "project_id": project_id, "payload": jsonable_encoder(data)}
+        for topic, project_id, data in items
+    ]
+    if rows:
+        db.execute(insert(OutboxEvent), rows)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def backoff(attempts: int) -> float:
+    """Seconds before retry number ``attempts``: capped exponential, jittered."""
+    delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _claim(db: Session, limit: int):
+    # SKIP LOCKED lets any number of workers drain the table side by side:
+    # each takes the next unlocked batch instead of queueing behind the others.
+    return (
+        db.execute(
+            select(OutboxEvent)
+            .where(OutboxEvent.available_at <= _utcnow())
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def _settle(db: Session, done, failed: dict):
+    if done:
+        db.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.id.in_([r.id for r in done]))
+            .execution_options(synchronize_session=False)
+        )
+    now, dead = _utcnow(), 0
+    for row, error in failed.items():
+        row.attempts += 1
+        row.last_error = error[:1000]
+        if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+            # Parked for inspection; no longer matched by _claim.
+            row.available_at = None
+            dead += 1
+            logger.error("outbox event %s gave up: %s", row.id, error)
+        else:
+            row.available_at = now + timedelta(seconds=backoff(row.attempts))
+    db.commit()
+    return dead
+
+
+async def _drain(db, limit: int) -> int:
+    rows = await run_db(db, _claim, limit)
+    if not rows:
+        await run_db(db, Session.rollback)
+        return 0
+    failed = {}
+    for prefixes, fn in _handlers:
+        batch = [r for r in rows if r.topic.startswith(prefixes) and r not in failed]
+        if not batch:
+            continue
+        try:
+            await fn(batch)
+        except Exception as exc:
+            logger.warning("outbox handler %s failed", fn.__name__, exc_info=True)
+            for r in batch:
+                failed[r] = f"{type(exc).__name__}: {exc}"
+    done = [r for r in rows if r not in failed]
+    dead = await run_db(db, _settle, done, failed)
+    outbox_events.labels("delivered").inc(len(done))
+    outbox_events.labels("retried").inc(len(failed) - dead)
+    outbox_events.labels("dead").inc(dead)
+    return len(rows)
+
+
+async def drain_once(limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """Handle one batch of due outbox rows; returns how many were claimed.
+
+    The rows stay locked until their outcome commits. Handlers run at least
+    once per row, so they must tolerate a repeat after a crash or retry.
+    """
+    if database.AsyncSessionLocal is not None:
+        async with database.AsyncSessionLocal() as db:
+            return await _drain(db, limit)
+    db = database.SessionLocal()
+    try:
+        return await _drain(db, limit)
+    finally:
+        db.close()
+
+
+class OutboxWorker:
+    """Drains the outbox on the running event loop.
+
+    Polls every ``poll_seconds``; writes in this process call ``wake()`` after
+    committing so their side effects go out without waiting for the poll.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wake = None
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    def wake(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wake = None
+
+    async def run(self):
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        while True:
+            try:
+                claimed = await drain_once(self.batch_size)
+            except Exception:
+                logger.exception("outbox drain failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+
+worker = OutboxWorker()
@@ -0,0 +1,164 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+
+from app.core import redis_client
+from app.core.metrics import rate_limited
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_LOCAL_SIZE = int(os.getenv("RATE_LIMIT_LOCAL_SIZE", "10000"))
+
+# Rules are matched by "METHOD /path/template", then "/path/template", then
+# the longest "/prefix/*", then "*". Each maps a role (or "*") to
+# "<requests>/<second|minute|hour|day>", or null for no limit. RATE_LIMITS
+# (JSON in the same shape) is merged over these per rule.
+DEFAULT_RATE_LIMITS = {
+    "*": {"*": "600/minute", "admin": "3000/minute"},
+    "/api/auth/*": {"*": "30/minute"},
+    "GET /api/projects/{project_id}/issues": {"*": "120/minute", "admin": None},
+    "/health": {"*": None},
+    "/metrics": {"*": None},
+}
+
+# Token bucket in one round trip: refill from the elapsed Redis server time,
+# then take a token if there is one. Returns {allowed, retry_after_ms,
+# remaining}; the bucket expires once it would be full again anyway.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local per_ms = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * per_ms)
+local allowed, wait = 0, math.ceil((1 - tokens) / per_ms)
+if tokens >= 1 then
+    tokens, allowed, wait = tokens - 1, 1, 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / per_ms) + 1000)
+return {allowed, wait, math.floor(tokens)}
+"""
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class Limit:
+    """``requests`` per ``period`` seconds, with bursts up to ``requests``."""
+
+    def __init__(self, requests: int, period: int):
+        self.requests = requests
+        self.period = period
+
+    @property
+    def per_ms(self) -> float:
+        return self.requests / (self.period * 1000)
+
+    @classmethod
+    def parse(cls, spec: str):
+        if spec is None:
+            return None
+        count, _, unit = spec.partition("/")
+        unit = unit.strip().lower().rstrip("s")
+        if unit not in _PERIODS or not count.strip().isdigit():
+            raise ValueError(f"invalid rate limit {spec!r}")
+        return cls(int(count), _PERIODS[unit])
+
+
+def load_rules(overrides: str = None) -> dict:
+    rules = {name: dict(roles) for name, roles in DEFAULT_RATE_LIMITS.items()}
+    for name, roles in json.loads(overrides or "{}").items():
+        rules.setdefault(name, {}).update(roles)
+    return {
+        name: {role: Limit.parse(spec) for role, spec in roles.items()}
+        for name, roles in rules.items()
+    }
+
+
+class RateLimiter:
+    """Token buckets in Redis, one atomic script call per request.
+
+    A denied key is remembered locally until its retry time, so a client
+    that keeps hammering is turned away without another Redis round trip.
+    If Redis is unavailable requests are let through.
+    """
+
+    def __init__(self, rules: dict, local_size: int = RATE_LIMIT_LOCAL_SIZE):
+        self.rules = rules
+        self.local_size = local_size
+        self._blocked = OrderedDict()
+        self._lock = threading.Lock()
+
+    def match(self, method: str, path: str) -> str:
+        """The rule name governing a route template, per the precedence above."""
+        for name in (f"{method} {path}", path):
+            if name in self.rules:
+                return name
+        prefixes = [
+            name
+            for name in self.rules
+            if name.endswith("/*") and path.startswith(name[:-1])
+        ]
+        return max(prefixes, key=len) if prefixes else "*"
+
+    def limit_for(self, rule: str, role: str):
+        roles = self.rules.get(rule, {})
+        if role in roles:
+            return roles[role]
+        if "*" in roles:
+            return roles["*"]
+        return self.rules["*"].get(role, self.rules["*"].get("*"))
+
+    def _blocked_for(self, key: str) -> float:
+        with self._lock:
+            until = self._blocked.get(key)
+            if until is None:
+                return 0.0
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                del self._blocked[key]
+                return 0.0
+            return remaining
+
+    def _block(self, key: str, seconds: float):
+        with self._lock:
+            self._blocked[key] = time.monotonic() + seconds
+            self._blocked.move_to_end(key)
+            while len(self._blocked) > self.local_size:
+                self._blocked.popitem(last=False)
+
+    async def hit(self, rule: str, identity: str, limit: Limit):
+        """Take one token; returns ``(allowed, retry_after_seconds, remaining)``."""
+        key = f"rl:{rule}:{identity}"
+        wait = self._blocked_for(key)
+        if wait:
+            rate_limited.labels(rule, "local").inc()
+            return False, math.ceil(wait), 0
+        try:
+            allowed, wait_ms, remaining = await redis_client.call(
+                "eval", TOKEN_BUCKET_SCRIPT, 1, key, limit.requests, limit.per_ms
+            )
+        except redis.RedisError:
+            logger.warning("rate limit check failed for %s", key, exc_info=True)
+            return True, 0, None
+        if allowed:
+            return True, 0, int(remaining)
+        self._block(key, wait_ms / 1000)
+        rate_limited.labels(rule, "redis").inc()
+        return False, max(1, math.ceil(wait_ms / 1000)), 0
+
+    def clear(self):
+        with self._lock:
+            self._blocked.clear()
+
+
+limiter = RateLimiter(load_rules(os.getenv("RATE_LIMITS")))
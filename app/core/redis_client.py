@@ -1,13 +1,201 @@
-﻿import os
+﻿import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
 import redis
+import redis.asyncio as aredis
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.jwt import token_cache
+from app.core.metrics import redis_timer
+
+logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REVOCATION_CHANNEL = "bl:revoked"
+REVOCATION_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_ERROR_RATE = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001"))
+REVOCATION_RESYNC_SECONDS = int(os.getenv("REVOCATION_RESYNC_SECONDS", "300"))
+
 _redis = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+_aredis = (
+    aredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    if settings.ASYNC_MODE
+    else None
+)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_bits = bits
+        self.num_hashes = max(1, round(bits / capacity * math.log(2)))
+        self._bits = bytearray((bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+
+class RevocationIndex:
+    """Process-local Bloom filter of revoked jtis in front of the Redis blacklist.
+
+    A background thread subscribes to ``REVOCATION_CHANNEL`` and only then
+    rebuilds the filter from a SCAN of ``bl:*``, so no revocation can fall
+    between the snapshot and the subscription. The filter is rebuilt every
+    ``REVOCATION_RESYNC_SECONDS`` to shed expired entries. Until the first
+    rebuild has completed, and whenever the subscription is down, every
+    lookup is reported as a possible positive and goes to Redis.
+    """
+
+    def __init__(
+        self,
+        client,
+        capacity: int,
+        error_rate: float,
+        resync: int,
+        poll_interval: float = 1.0,
+    ):
+        self._client = client
+        self._poll_interval = poll_interval
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._resync = resync
+        self._filter = BloomFilter(capacity, error_rate)
+        self._next = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.ready = False
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="revocation-index", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.ready = False
+
+    def add(self, jti: str):
+        with self._lock:
+            self._filter.add(jti)
+            if self._next is not None:
+                self._next.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        return not self.ready or jti in self._filter
+
+    def rebuild(self):
+        with self._lock:
+            self._next = BloomFilter(self._capacity, self._error_rate)
+        try:
+            for key in self._client.scan_iter(match="bl:*", count=1000):
+                self.add(key[3:])
+        except Exception:
+            with self._lock:
+                self._next = None
+            raise
+        with self._lock:
+            self._filter, self._next = self._next, None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            pubsub = self._client.pubsub()
+            try:
+                pubsub.subscribe(REVOCATION_CHANNEL)
+                while pubsub.get_message(timeout=self._poll_interval) is None:
+                    if self._stopped.is_set():
+                        return
+                self.rebuild()
+                self.ready = True
+                synced_at = time.monotonic()
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=self._poll_interval)
+                    if message and message["type"] == "message":
+                        self.add(message["data"])
+                    if time.monotonic() - synced_at > self._resync:
+                        self.rebuild()
+                        synced_at = time.monotonic()
+            except Exception:
+                self.ready = False
+                logger.warning("revocation index lost sync, retrying", exc_info=True)
+                self._stopped.wait(self._poll_interval)
+            finally:
+                pubsub.close()
+
+
+revocations = RevocationIndex(
+    _redis, REVOCATION_CAPACITY, REVOCATION_ERROR_RATE, REVOCATION_RESYNC_SECONDS
+)
 
 
 def blacklist_jti(jti: str, expires: int):
-    _redis.setex(f"bl:{jti}", expires, "1")
+    with redis_timer("setex"):
+        _redis.setex(f"bl:{jti}", expires, "1")
+    with redis_timer("publish"):
+        _redis.publish(REVOCATION_CHANNEL, jti)
+    revocations.add(jti)
+    token_cache.invalidate_jti(jti)
 
 
 def is_blacklisted(jti: str) -> bool:
-    return _redis.exists(f"bl:{jti}") == 1
+    if not revocations.might_be_revoked(jti):
+        return False
+    with redis_timer("exists"):
+        return _redis.exists(f"bl:{jti}") == 1
+
+
+async def blacklist_jti_async(jti: str, expires: int):
+    if _aredis is None:
+        return await run_in_threadpool(blacklist_jti, jti, expires)
+    with redis_timer("setex"):
+        await _aredis.setex(f"bl:{jti}", expires, "1")
+    with redis_timer("publish"):
+        await _aredis.publish(REVOCATION_CHANNEL, jti)
+    revocations.add(jti)
+    token_cache.invalidate_jti(jti)
+
+
+async def is_blacklisted_async(jti: str) -> bool:
+    if not revocations.might_be_revoked(jti):
+        return False
+    if _aredis is None:
+        return await run_in_threadpool(is_blacklisted, jti)
+    with redis_timer("exists"):
+        return await _aredis.exists(f"bl:{jti}") == 1
+
+
+async def call(method: str, *args, **kwargs):
+    """Run one Redis command without blocking the event loop, timed."""
+    with redis_timer(method):
+        if _aredis is not None:
+            return await getattr(_aredis, method)(*args, **kwargs)
+        return await run_in_threadpool(getattr(_redis, method), *args, **kwargs)
+
+
+async def close():
+    if _aredis is not None:
+        await _aredis.aclose()
@@ -1,6 +1,25 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
 
 def hash_password(password: str) -> str:
@@ -9,3 +28,114 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
+
+
+class HashStats:
+    def __init__(self):
+        self.calls = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+        self.pool_restarts = 0
+
+    def stats(self) -> dict:
+        return dict(vars(self))
+
+
+hash_stats = HashStats()
+_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+
+def _timed(fn, submitted_at: float, *args):
+    # time.monotonic is system-wide on Linux, so it is comparable across the
+    # parent and the pool worker.
+    started = time.monotonic()
+    result = fn(*args)
+    return started - submitted_at, time.monotonic() - started, result
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        return _pool
+
+
+def _replace_pool(broken: ProcessPoolExecutor):
+    """Swap in a fresh pool for one whose worker died.
+
+    Every call that was waiting on the broken pool fails together; only the
+    first to get here replaces it, the rest retry on the new one.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        _pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        hash_stats.pool_restarts += 1
+    logger.warning("password hash worker died, process pool replaced")
+
+
+async def _run_in_pool(fn, submitted_at: float, *args):
+    # A pool that lost a worker (OOM kill, segfault) rejects everything from
+    # then on, so it is replaced and the call retried once on the new one.
+    loop = asyncio.get_running_loop()
+    for _ in range(2):
+        pool = _get_pool()
+        try:
+            return await loop.run_in_executor(pool, _timed, fn, submitted_at, *args)
+        except BrokenProcessPool:
+            _replace_pool(pool)
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Password hashing is unavailable",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _run_bounded(fn, *args):
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        hash_stats.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent password checks",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    try:
+        submitted_at = time.monotonic()
+        if settings.PASSWORD_HASH_WORKERS > 0:
+            waited, took, result = await _run_in_pool(fn, submitted_at, *args)
+        else:
+            waited, took, result = await run_in_threadpool(
+                _timed, fn, submitted_at, *args
+            )
+    finally:
+        _pending -= 1
+    hash_stats.calls += 1
+    hash_stats.wait_seconds_total += waited
+    hash_stats.wait_seconds_max = max(hash_stats.wait_seconds_max, waited)
+    hash_stats.hash_seconds_total += took
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_bounded(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run_bounded(verify_password, password, hashed)
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
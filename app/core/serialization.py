@@ -0,0 +1,68 @@
+from datetime import date, datetime
+from enum import Enum
+from uuid import UUID
+
+import msgpack
+import orjson
+from fastapi import Response
+
+from app.core.negotiation import JSON, MSGPACK
+
+# Z for zero UTC offsets is the one place orjson's defaults differ from
+# pydantic-core's JSON output; with it the bytes are identical.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def _msgpack_default(obj):
+    # The same strings the JSON body carries, so clients parse both alike.
+    if isinstance(obj, datetime):
+        text = obj.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"cannot encode {type(obj).__name__} as MessagePack")
+
+
+def packb(content) -> bytes:
+    return msgpack.packb(content, default=_msgpack_default, datetime=False)
+
+
+def columns(model, schema) -> list:
+    """``model``'s columns for each of ``schema``'s fields, in field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def as_dicts(rows) -> list:
+    """Column rows as dicts in column order; dicts pass through."""
+    if not rows or isinstance(rows[0], dict):
+        return rows
+    # zip over the shared key tuple; Row._asdict() is several times slower.
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def page_response(page: dict, headers: dict = None, media_type: str = JSON):
+    """Render a ``paginate`` page straight to JSON or MessagePack.
+
+    Items are column rows from ``columns(model, schema)``, which already have
+    the schema's keys in the schema's order, or ready-made dicts. Skipping
+    the ORM objects and the per-row validation gives the same JSON body as
+    ``response_model=Page[schema]`` at a fraction of the CPU cost.
+    """
+    content = {"items": as_dicts(page["items"]), "next_cursor": page["next_cursor"]}
+    return render(content, headers, media_type)
+
+
+def render(content, headers: dict = None, media_type: str = JSON) -> Response:
+    """``content`` as JSON or MessagePack, bypassing response_model validation."""
+    body = packb(content) if media_type == MSGPACK else dumps(content)
+    headers = {**(headers or {}), "Vary": "Accept"}
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -1,9 +1,73 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.db import pool
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL, **pool.engine_options(settings.DATABASE_URL, "sync")
+)
+pool.install_statement_timeout(engine)
+pool.register("sync", engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
+
+
+def _asyncpg_url(url: str) -> str:
+    url = make_url(url)
+    return url.set(drivername=f"{url.get_backend_name()}+asyncpg").render_as_string(
+        hide_password=False
+    )
+
+
+def async_database_url() -> str:
+    return settings.ASYNC_DATABASE_URL or _asyncpg_url(settings.DATABASE_URL)
+
+
+def async_replica_url() -> str:
+    return settings.ASYNC_DATABASE_REPLICA_URL or _asyncpg_url(
+        settings.DATABASE_REPLICA_URL
+    )
+
+
+replica_engine = None
+ReplicaSessionLocal = None
+
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        **pool.engine_options(settings.DATABASE_REPLICA_URL, "replica"),
+    )
+    pool.install_statement_timeout(replica_engine)
+    pool.register("replica", replica_engine)
+    ReplicaSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=replica_engine
+    )
+
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+
+if settings.ASYNC_MODE:
+    async_engine = create_async_engine(
+        async_database_url(), **pool.engine_options(async_database_url(), "async")
+    )
+    pool.install_statement_timeout(async_engine.sync_engine)
+    pool.register("async", async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    if settings.DATABASE_REPLICA_URL:
+        async_replica_engine = create_async_engine(
+            async_replica_url(),
+            **pool.engine_options(async_replica_url(), "async-replica"),
+        )
+        pool.install_statement_timeout(async_replica_engine.sync_engine)
+        pool.register("async-replica", async_replica_engine.sync_engine)
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            async_replica_engine, autoflush=False, expire_on_commit=False
+        )
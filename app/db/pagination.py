@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def pack_cursor(*values) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def unpack_cursor(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    return pack_cursor(created_at.isoformat(), str(id))
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, id = unpack_cursor(cursor)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(q, model, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """Keyset-paginate ``q`` on ``(created_at, id)``.
+
+    Fetches one extra row to decide whether there is a next page, so the cost
+    of a page is independent of how deep into the listing the client is.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        q = q.filter(tuple_(model.created_at, model.id) > tuple_(created_at, id))
+    rows = q.order_by(model.created_at, model.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,152 @@
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """Counters for one pool, kept across ``engine.dispose()``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def record(self, waited: float, overflowed: bool = False, timed_out=False):
+        # Waits that end in a timeout count too: they are the exhaustion signal.
+        with self._lock:
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            if overflowed:
+                self.overflow_events += 1
+
+
+_metrics = {}
+_engines = {}
+
+
+def metrics_for(name: str) -> PoolMetrics:
+    if name not in _metrics:
+        _metrics[name] = PoolMetrics()
+    return _metrics[name]
+
+
+class _InstrumentedPool:
+    """Times ``_do_get`` (the checkout wait) and spots overflow connections.
+
+    ``_overflow`` starts at ``-pool_size`` and is bumped for every connection
+    the pool opens, so a bump that leaves it positive is an overflow.
+    """
+
+    def _do_get(self):
+        metrics = metrics_for(self._orig_logging_name or "default")
+        before = self._overflow
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        metrics.record(time.perf_counter() - start, self._overflow > max(before, 0))
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def _unique_statement_name():
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(url, name: str) -> dict:
+    """Keyword arguments for ``create_engine``/``create_async_engine``.
+
+    Only Postgres URLs get the tuned pool; anything else (the SQLite used in
+    tests) keeps SQLAlchemy's defaults.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "postgresql":
+        return {}
+    is_async = url.get_driver_name() == "asyncpg"
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    connect_args = {}
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if settings.DB_EXTERNAL_POOLER:
+        # PgBouncer may hand each transaction a different server connection,
+        # so prepared statements must not outlive one. The timeout is set per
+        # transaction instead (see install_statement_timeout).
+        if is_async:
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=_unique_statement_name,
+            )
+    elif timeout:
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(timeout)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def install_statement_timeout(engine):
+    """Behind an external pooler, apply the timeout with SET LOCAL per transaction."""
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if not (settings.DB_EXTERNAL_POOLER and timeout):
+        return
+    if engine.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(engine, "begin")
+    def _set_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+def register(name: str, engine):
+    _engines[name] = engine
+
+
+def pool_stats() -> dict:
+    """Live pool gauges plus cumulative counters, per registered engine."""
+    out = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        m = metrics_for(name)
+        out[name] = {
+            "size": pool.size() if hasattr(pool, "size") else 0,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+            "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+            "checkouts": m.checkouts,
+            "wait_seconds_total": m.wait_seconds_total,
+            "wait_seconds_max": m.wait_seconds_max,
+            "overflow_events": m.overflow_events,
+            "timeouts": m.timeouts,
+        }
+    return out
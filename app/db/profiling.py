@@ -0,0 +1,139 @@
+import logging
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import statement_seconds
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: meant for development and CI, not production traffic.
+QUERY_PROFILING = os.getenv("QUERY_PROFILING", "false").lower() in ("1", "true")
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "20"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# "log" warns once the request finishes; "raise" fails the offending query.
+QUERY_PROFILE_ACTION = os.getenv("QUERY_PROFILE_ACTION", "log")
+
+# Expanded IN lists and VALUES rows differ only in their placeholder count.
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|%s|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|\$\d+))*\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryProfile:
+    """Queries seen while profiling one request (or one ``with`` block)."""
+
+    def __init__(self, budget: int = None, slow_ms: float = None, action: str = None):
+        self.budget = QUERY_BUDGET if budget is None else budget
+        self.slow_ms = SLOW_QUERY_MS if slow_ms is None else slow_ms
+        self.action = action or QUERY_PROFILE_ACTION
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+        self.slow = []
+
+    def record(self, statement: str, seconds: float):
+        shape = statement_shape(statement)
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[shape] += 1
+        if seconds * 1000 >= self.slow_ms:
+            self.slow.append((seconds * 1000, shape))
+        if self.action == "raise" and self.problems():
+            raise QueryBudgetExceeded(self.summary())
+
+    def repeated(self, min_count: int = 2) -> list:
+        """Statement shapes run at least ``min_count`` times: likely N+1s."""
+        return [(s, n) for s, n in self.shapes.most_common() if n >= min_count]
+
+    def problems(self) -> list:
+        found = []
+        if self.count > self.budget:
+            found.append(f"{self.count} queries (budget {self.budget})")
+        found += [f"slow query {ms:.1f}ms: {shape}" for ms, shape in self.slow]
+        return found
+
+    def summary(self) -> str:
+        lines = self.problems() or [f"{self.count} queries"]
+        lines += [f"{n}x {shape}" for shape, n in self.repeated()[:5]]
+        return "\n  ".join(lines)
+
+
+_current: ContextVar = ContextVar("query_profile", default=None)
+_observers = []
+
+
+@contextmanager
+def profile_queries(**kwargs):
+    """Count the queries run in this context (threadpool and greenlet included)."""
+    profile = QueryProfile(**kwargs)
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def add_observer(fn):
+    """Call ``fn(route, profile)`` after every profiled request."""
+    _observers.append(fn)
+
+
+def remove_observer(fn):
+    _observers.remove(fn)
+
+
+# Timed by app.core.metrics, which stamps every statement's execution context.
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    seconds = statement_seconds(context)
+    if profile is None or seconds is None:
+        return
+    profile.record(statement, seconds)
+
+
+class QueryProfilerMiddleware:
+    """Profiles each request when ``QUERY_PROFILING`` is on.
+
+    Adds an ``X-Query-Count`` response header and reports requests that go
+    over budget or run slow queries, with their most repeated statements.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not QUERY_PROFILING:
+            return await self.app(scope, receive, send)
+
+        with profile_queries() as profile:
+
+            async def _send(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-query-count", str(profile.count).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, _send)
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        if profile.action != "raise" and profile.problems():
+            logger.warning("%s %s: %s", scope["method"], route, profile.summary())
+        for fn in list(_observers):
+            fn(f"{scope['method']} {route}", profile)
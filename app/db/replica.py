@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from sqlalchemy import event, text
+
+from app.core import redis_client
+from app.core.config import settings
+from app.core.metrics import db_routing
+from app.db import database
+from app.dependencies.permissions import token_claims
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+STICKY_LOCAL_SIZE = 10000
+
+# Seconds of replay lag. A replica that has replayed everything it received
+# reports 0, or an idle primary would look like ever-growing lag; a server
+# that is not in recovery gets NULLs and also reports 0.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """)
+
+
+class ReplicaMonitor:
+    """Decides whether reads may go to the replica right now.
+
+    A background thread measures replay lag every ``interval`` seconds. The
+    replica is usable while its last check succeeded with lag under
+    ``max_lag`` and is fresh (within three intervals), so a stuck checker
+    also sends reads back to the primary. A request that loses its replica
+    connection marks it down until the next good check.
+    """
+
+    def __init__(self, max_lag: float, interval: float):
+        self.max_lag = max_lag
+        self.interval = interval
+        self.lag = None
+        self.healthy = False
+        self.checked_at = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if database.replica_engine is None or self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="replica-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def check(self) -> bool:
+        was_healthy = self.healthy
+        try:
+            with database.replica_engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    lag = float(conn.execute(REPLICA_LAG_SQL).scalar())
+                else:
+                    conn.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception:
+            if was_healthy:
+                logger.warning("replica check failed", exc_info=True)
+            self.lag, self.healthy = None, False
+        else:
+            self.lag, self.healthy = lag, lag <= self.max_lag
+            if was_healthy and not self.healthy:
+                logger.warning("replica lag %.1fs, reading from primary", lag)
+        self.checked_at = time.monotonic()
+        return self.healthy
+
+    def mark_down(self):
+        self.healthy = False
+
+    def usable(self) -> bool:
+        return (
+            self.healthy
+            and self.checked_at is not None
+            and time.monotonic() - self.checked_at < 3 * self.interval
+        )
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.check()
+            self._stopped.wait(self.interval)
+
+
+class WriteStickiness:
+    """Callers who wrote in the last ``window`` seconds, to keep them on the primary.
+
+    Marks live in Redis so they hold across processes. A local copy answers
+    repeat reads in the process that took the write without a round trip.
+    When Redis cannot answer, the caller is treated as sticky.
+    """
+
+    def __init__(self, window: float, local_size: int):
+        self.window = window
+        self.local_size = local_size
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(identity: str) -> str:
+        return f"sticky:{identity}"
+
+    async def mark(self, identity: str):
+        with self._lock:
+            self._local[identity] = time.monotonic() + self.window
+            self._local.move_to_end(identity)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+        try:
+            await redis_client.call(
+                "psetex", self.key(identity), int(self.window * 1000), 1
+            )
+        except redis.RedisError:
+            logger.warning("sticky mark failed for %s", identity, exc_info=True)
+
+    async def active(self, identity: str) -> bool:
+        with self._lock:
+            until = self._local.get(identity)
+            if until is not None:
+                if until > time.monotonic():
+                    return True
+                del self._local[identity]
+        try:
+            return bool(await redis_client.call("exists", self.key(identity)))
+        except redis.RedisError:
+            logger.warning("sticky lookup failed for %s", identity, exc_info=True)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+
+monitor = ReplicaMonitor(
+    settings.REPLICA_MAX_LAG_SECONDS, settings.REPLICA_CHECK_SECONDS
+)
+stickiness = WriteStickiness(settings.REPLICA_STICKY_SECONDS, STICKY_LOCAL_SIZE)
+
+
+def configured() -> bool:
+    if database.AsyncSessionLocal is not None:
+        return database.AsyncReplicaSessionLocal is not None
+    return database.ReplicaSessionLocal is not None
+
+
+async def caller(request) -> str:
+    sub = (await token_claims(request)).get("sub")
+    if sub:
+        return f"user:{sub}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def route(request) -> bool:
+    """True if the request's session should be opened on the replica.
+
+    Writes always use the primary and make the caller sticky. Reads use the
+    replica unless it is unhealthy or lagging, or the caller is sticky.
+    """
+    if not configured():
+        return False
+    if request.method not in READ_METHODS:
+        await stickiness.mark(await caller(request))
+        reason = "write"
+    elif not monitor.usable():
+        reason = "replica_unavailable"
+    elif await stickiness.active(await caller(request)):
+        reason = "sticky"
+    else:
+        db_routing.labels("replica", "read").inc()
+        return True
+    db_routing.labels("primary", reason).inc()
+    return False
+
+
+def _on_error(context):
+    if context.is_disconnect:
+        monitor.mark_down()
+
+
+for _engine in (database.replica_engine, database.async_replica_engine):
+    if _engine is not None:
+        event.listen(
+            getattr(_engine, "sync_engine", _engine), "handle_error", _on_error
+        )
@@ -0,0 +1,89 @@
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, literal_column, or_, select, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from app.db.pagination import DEFAULT_PAGE_SIZE, pack_cursor, unpack_cursor
+from app.models.comment import Comment
+from app.models.issue import Issue
+
+SEARCH_CONFIG = "english"
+# A hit in a comment counts for less than the same hit in the issue itself.
+COMMENT_RANK_WEIGHT = 0.5
+
+_issue_vector = literal_column("issues.search_vector", TSVECTOR)
+_comment_vector = literal_column("comments.search_vector", TSVECTOR)
+
+
+def search_issues(
+    db: Session,
+    q: str,
+    project_id: UUID = None,
+    status=None,
+    priority=None,
+    assignee_id: UUID = None,
+    cursor: str = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+):
+    """Rank issues whose title, description or comments match ``q``.
+
+    Both tsvector columns are GIN-indexed; each issue takes its best-ranked
+    hit. The filters are applied inside both branches (comments through
+    their issue), so only matches in scope are ranked and grouped. Pages are
+    keyset-paginated on ``(rank DESC, id)``.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    filters = []
+    if project_id:
+        filters.append(Issue.project_id == project_id)
+    if status:
+        filters.append(Issue.status == status)
+    if priority:
+        filters.append(Issue.priority == priority)
+    if assignee_id:
+        filters.append(Issue.assignee_id == assignee_id)
+    hits = union_all(
+        select(
+            Issue.id.label("issue_id"),
+            func.ts_rank(_issue_vector, query).label("rank"),
+        ).where(_issue_vector.op("@@")(query), *filters),
+        select(
+            Comment.issue_id.label("issue_id"),
+            (func.ts_rank(_comment_vector, query) * COMMENT_RANK_WEIGHT).label("rank"),
+        )
+        .join(Issue, Issue.id == Comment.issue_id)
+        .where(_comment_vector.op("@@")(query), *filters),
+    ).subquery()
+    ranked = (
+        select(hits.c.issue_id, func.max(hits.c.rank).label("rank"))
+        .group_by(hits.c.issue_id)
+        .subquery()
+    )
+    stmt = select(Issue, ranked.c.rank).join(ranked, ranked.c.issue_id == Issue.id)
+    if cursor:
+        try:
+            last_rank, last_id = unpack_cursor(cursor)
+            last_rank, last_id = float(last_rank), UUID(last_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(
+            or_(
+                ranked.c.rank < last_rank,
+                and_(ranked.c.rank == last_rank, Issue.id > last_id),
+            )
+        )
+    rows = db.execute(
+        stmt.order_by(ranked.c.rank.desc(), Issue.id).limit(limit + 1)
+    ).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = pack_cursor(rows[-1].rank, str(rows[-1].Issue.id))
+    items = [{**_as_dict(issue), "rank": rank} for issue, rank in rows]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _as_dict(issue: Issue) -> dict:
+    return {c.key: getattr(issue, c.key) for c in Issue.__table__.columns}
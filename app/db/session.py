@@ -0,0 +1,64 @@
+from contextlib import asynccontextmanager
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import database, replica
+
+
+@asynccontextmanager
+async def _open(async_factory, factory):
+    if database.AsyncSessionLocal is not None:
+        async with async_factory() as db:
+            yield db
+        return
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def session_factories(read_replica: bool):
+    """The ``(async, sync)`` sessionmakers for the replica or the primary."""
+    if read_replica:
+        return database.AsyncReplicaSessionLocal, database.ReplicaSessionLocal
+    return database.AsyncSessionLocal, database.SessionLocal
+
+
+async def get_db(request: Request):
+    """Yield an ``AsyncSession`` in async mode, a plain ``Session`` otherwise.
+
+    GET requests get a replica session when ``replica.route`` allows it;
+    everything else goes to the primary. The choice is kept in
+    ``request.state.read_replica`` for sessions the route opens itself. A
+    write marks the caller sticky again once it has finished, so the window
+    covers the whole request.
+    """
+    request.state.read_replica = await replica.route(request)
+    try:
+        async with _open(*session_factories(request.state.read_replica)) as db:
+            yield db
+    finally:
+        if request.method not in replica.READ_METHODS and replica.configured():
+            await replica.stickiness.mark(await replica.caller(request))
+
+
+async def get_primary_db():
+    """Like ``get_db`` but always on the primary, for reads that must be current."""
+    async with _open(*session_factories(False)) as db:
+        yield db
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """Run ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    Route bodies are written once against the sync ORM API. On an
+    ``AsyncSession`` they run through ``run_sync`` (greenlet on the asyncpg
+    connection, no thread involved); on a sync ``Session`` they go to the
+    threadpool exactly as a plain ``def`` handler would.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -0,0 +1,120 @@
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.issue import Issue, PriorityEnum, StatusEnum
+from app.models.project_stats import ProjectIssueStat
+
+STATUS = "status"
+PRIORITY = "priority"
+
+
+def _value(v):
+    return getattr(v, "value", v)
+
+
+def count_issue(deltas: Counter, project_id, status, priority, sign: int = 1):
+    """Add (or with ``sign=-1`` remove) one issue's contribution to ``deltas``."""
+    if status is not None:
+        deltas[(project_id, STATUS, _value(status))] += sign
+    if priority is not None:
+        deltas[(project_id, PRIORITY, _value(priority))] += sign
+
+
+def apply_deltas(db: Session, deltas: Counter):
+    """Upsert ``count = count + delta`` for every non-zero entry.
+
+    Must run inside the transaction that made the issue change, so the
+    counters commit or roll back with it. Rows are touched in key order so
+    concurrent writers always take the row locks in the same order.
+    """
+    rows = [
+        {"project_id": p, "dimension": d, "value": v, "count": n}
+        for (p, d, v), n in sorted(deltas.items(), key=lambda kv: str(kv[0]))
+        if n
+    ]
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(ProjectIssueStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["project_id", "dimension", "value"],
+        set_={"count": ProjectIssueStat.count + stmt.excluded["count"]},
+    )
+    db.execute(stmt, rows)
+
+
+def get_project_stats(db: Session, project_id: UUID) -> dict:
+    """Read the precomputed counters: at most one row per enum value."""
+    rows = (
+        db.query(
+            ProjectIssueStat.dimension, ProjectIssueStat.value, ProjectIssueStat.count
+        )
+        .filter(ProjectIssueStat.project_id == project_id)
+        .all()
+    )
+    by_status = {s.value: 0 for s in StatusEnum}
+    by_priority = {p.value: 0 for p in PriorityEnum}
+    for dimension, value, count in rows:
+        (by_status if dimension == STATUS else by_priority)[value] = count
+    return {
+        "project_id": project_id,
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+    }
+
+
+def reconcile(db: Session, project_id: UUID = None, fix: bool = False) -> list:
+    """Recount issues from scratch and report where the counters drifted.
+
+    With ``fix`` the drift is corrected in the same transaction. On Postgres
+    the counter table is locked first, so in-flight issue writes finish
+    before the recount and new ones wait for it.
+    """
+    if fix and db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE project_issue_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+    actual = Counter()
+    for dimension, column in ((STATUS, Issue.status), (PRIORITY, Issue.priority)):
+        q = db.query(Issue.project_id, column, func.count()).filter(column.isnot(None))
+        if project_id:
+            q = q.filter(Issue.project_id == project_id)
+        for pid, value, count in q.group_by(Issue.project_id, column):
+            actual[(pid, dimension, _value(value))] = count
+
+    stored = Counter()
+    q = db.query(ProjectIssueStat)
+    if project_id:
+        q = q.filter(ProjectIssueStat.project_id == project_id)
+    for row in q:
+        stored[(row.project_id, row.dimension, row.value)] = row.count
+
+    drift = [
+        {
+            "project_id": key[0],
+            "dimension": key[1],
+            "value": key[2],
+            "stored": stored[key],
+            "actual": actual[key],
+        }
+        for key in sorted(set(actual) | set(stored), key=str)
+        if stored[key] != actual[key]
+    ]
+    if fix and drift:
+        apply_deltas(
+            db,
+            Counter(
+                {
+                    (d["project_id"], d["dimension"], d["value"]): d["actual"]
+                    - d["stored"]
+                    for d in drift
+                }
+            ),
+        )
+        db.commit()
+    return drift
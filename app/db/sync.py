@@ -0,0 +1,139 @@
+import os
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, delete, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.serialization import as_dicts, columns
+from app.db.pagination import DEFAULT_PAGE_SIZE, pack_cursor, unpack_cursor
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.models.tombstone import Tombstone
+from app.schemas.comment import CommentResponse
+from app.schemas.issue import IssueResponse
+
+# Changes are read by updated_at, which is the writing transaction's start
+# time, so a long transaction can commit rows "in the past". Once a client
+# has caught up, its cursor is moved back this far and such rows are sent on
+# the next sync. Keep it above the longest write transaction. Clients get
+# the same row more than once and should apply changes as upserts.
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "30"))
+# Older tombstones are pruned; a cursor from before that must resync.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+def _encode(positions) -> str:
+    values = []
+    for ts, id in positions:
+        values += [ts.isoformat() if ts else None, str(id) if id is not None else None]
+    return pack_cursor(*values)
+
+
+def _decode(cursor: str):
+    if not cursor:
+        return [(None, None)] * 3
+    try:
+        v = unpack_cursor(cursor)
+        return [
+            (
+                datetime.fromisoformat(v[i]) if v[i] else None,
+                convert(v[i + 1]) if v[i + 1] is not None else None,
+            )
+            for i, convert in ((0, UUID), (2, UUID), (4, int))
+        ]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(q, ts_col, id_col, position):
+    ts, id = position
+    if ts is None:
+        return q
+    if id is None:
+        # A rewound position: everything from that instant on.
+        return q.where(ts_col >= ts)
+    return q.where(tuple_(ts_col, id_col) > tuple_(ts, id))
+
+
+def get_changes(
+    db: Session, project_id: UUID, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+):
+    """Issues, comments and deletions in a project after ``cursor``.
+
+    Each of the three is a keyset scan on ``(updated_at, id)`` (deletions:
+    ``(deleted_at, id)``), so the cost follows the number of changes rather
+    than the size of the project. Up to ``limit`` of each come back per call;
+    ``has_more`` says whether to call again with ``next_cursor`` right away.
+    """
+    positions = _decode(cursor)
+    now = db.scalar(select(func.now(type_=DateTime(timezone=True))))
+    tombstone_ts = positions[2][0]
+    retention = timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+    if tombstone_ts is not None and tombstone_ts < now - retention:
+        raise HTTPException(status_code=410, detail="Cursor expired; resync")
+
+    sources = (
+        (
+            select(*columns(Issue, IssueResponse)).where(
+                Issue.project_id == project_id
+            ),
+            Issue.updated_at,
+            Issue.id,
+            "updated_at",
+        ),
+        (
+            select(*columns(Comment, CommentResponse)).where(
+                Comment.project_id == project_id
+            ),
+            Comment.updated_at,
+            Comment.id,
+            "updated_at",
+        ),
+        (
+            select(
+                Tombstone.id,
+                Tombstone.entity,
+                Tombstone.entity_id,
+                Tombstone.deleted_at,
+            ).where(Tombstone.project_id == project_id),
+            Tombstone.deleted_at,
+            Tombstone.id,
+            "deleted_at",
+        ),
+    )
+    horizon = now - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+    results, next_positions, has_more = [], [], False
+    for (q, ts_col, id_col, ts_name), position in zip(sources, positions):
+        q = _after(q, ts_col, id_col, position).order_by(ts_col, id_col)
+        rows = db.execute(q.limit(limit + 1)).all()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            position = (getattr(rows[-1], ts_name), rows[-1].id)
+        if not more and (position[0] is None or position[0] > horizon):
+            # Caught up: rewind to the overlap horizon (see above).
+            position = (horizon, None)
+        results.append(rows)
+        next_positions.append(position)
+        has_more = has_more or more
+
+    issues, comments, tombstones = results
+    return {
+        "issues": as_dicts(issues),
+        "comments": as_dicts(comments),
+        "deleted": [
+            {"entity": t.entity, "id": t.entity_id, "deleted_at": t.deleted_at}
+            for t in tombstones
+        ],
+        "next_cursor": _encode(next_positions),
+        "has_more": has_more,
+    }
+
+
+def prune_tombstones(db: Session, days: int = SYNC_TOMBSTONE_RETENTION_DAYS) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    deleted = db.execute(delete(Tombstone).where(Tombstone.deleted_at < cutoff))
+    db.commit()
+    return deleted.rowcount
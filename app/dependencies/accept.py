@@ -0,0 +1,8 @@
+from fastapi import Header
+
+from app.core.negotiation import choose_media_type
+
+
+def response_media_type(accept: str = Header(None)) -> str:
+    """``application/msgpack`` if the client asked for it, else JSON."""
+    return choose_media_type(accept)
@@ -0,0 +1,36 @@
+from typing import Set
+
+from fastapi import HTTPException, Query
+from sqlalchemy.orm import joinedload
+
+from app.schemas.user import UserSummary
+
+
+def expand_param(*allowed: str):
+    """``?expand=a,b`` as a validated set of relationship names."""
+
+    def _expand(expand: str = Query(None, description=", ".join(allowed))) -> Set[str]:
+        fields = {f.strip() for f in (expand or "").split(",") if f.strip()}
+        unknown = fields - set(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot expand: {', '.join(sorted(unknown))}",
+            )
+        return fields
+
+    return _expand
+
+
+def eager(model, fields: Set[str]) -> list:
+    # Many-to-one, so a LEFT JOIN per relationship keeps it one query per page.
+    return [joinedload(getattr(model, f)) for f in sorted(fields)]
+
+
+def embed(obj, schema, fields: Set[str]) -> dict:
+    """Serialize ``obj`` with ``schema`` plus a summary of each expanded user."""
+    data = schema.model_validate(obj).model_dump()
+    for f in fields:
+        related = getattr(obj, f)
+        data[f] = UserSummary.model_validate(related).model_dump() if related else None
+    return data
@@ -1,9 +1,25 @@
 ﻿from fastapi import HTTPException, status, Depends, Request
-from app.core.jwt import decode_token
-from app.core.redis_client import is_blacklisted
+from app.core.jwt import decode_token_cached_async, token_cache
+from app.core.redis_client import is_blacklisted_async
 
 
-def get_current_user_from_bearer(request: Request):
+async def token_claims(request: Request) -> dict:
+    """Claims of the bearer token, or ``{}`` if it is missing or invalid.
+
+    For keying per-caller state before authentication has run; anything that
+    grants access must go through ``get_current_user_from_bearer``.
+    """
+    auth = request.headers.get("Authorization")
+    if not auth:
+        return {}
+    token = auth.split(" ", 1)[1] if auth.lower().startswith("bearer ") else auth
+    try:
+        return await decode_token_cached_async(token)
+    except Exception:
+        return {}
+
+
+async def get_current_user_from_bearer(request: Request):
     auth = request.headers.get("Authorization")
     if not auth:
         raise HTTPException(
@@ -14,12 +30,13 @@ def get_current_user_from_bearer(request: Request):
     else:
         token = auth
     try:
-        decoded = decode_token(token)
+        decoded = await decode_token_cached_async(token)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
-    if is_blacklisted(decoded.get("jti")):
+    if await is_blacklisted_async(decoded.get("jti")):
+        token_cache.invalidate_jti(decoded.get("jti"))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
         )
@@ -27,7 +44,7 @@ def get_current_user_from_bearer(request: Request):
 
 
 def require_role(*allowed_roles):
-    def _checker(user=Depends(get_current_user_from_bearer)):
+    async def _checker(user=Depends(get_current_user_from_bearer)):
         role = user.get("role")
         if role not in allowed_roles:
             raise HTTPException(
@@ -0,0 +1,36 @@
+from fastapi import HTTPException, Request, status
+
+from app.core.rate_limit import RATE_LIMIT_ENABLED, limiter
+from app.dependencies.permissions import token_claims
+
+# Anonymous by nature (register, login, refresh): these are keyed by client IP.
+IP_KEYED_PREFIXES = ("/api/auth/",)
+
+
+async def rate_limit(request: Request):
+    """App-wide dependency: one token from the caller's bucket for this route.
+
+    Runs before the route's own dependencies, so a throttled client never
+    gets as far as a database connection.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    path = request.scope["route"].path
+    rule = limiter.match(request.method, path)
+    # Invalid tokens are rejected by the auth dependency; until then the
+    # caller is limited by IP.
+    claims = await token_claims(request)
+    limit = limiter.limit_for(rule, claims.get("role", "*"))
+    if limit is None:
+        return
+    if claims.get("sub") and not path.startswith(IP_KEYED_PREFIXES):
+        identity = f"user:{claims['sub']}"
+    else:
+        identity = f"ip:{request.client.host if request.client else 'unknown'}"
+    allowed, retry_after, _ = await limiter.hit(rule, identity, limit)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too Many Requests",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,25 +1,64 @@
-from fastapi import FastAPI
+﻿from fastapi import Depends, FastAPI, Response
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from app.db import database, replica
+from app.db.profiling import QueryProfilerMiddleware
 from app.db.database import Base, engine
+from app.core import events, outbox, redis_client, security
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.dependencies.rate_limit import rate_limit
 import app.models  # VERY IMPORTANT
 
-from app.api.routes import auth
+from app.api.routes import auth, projects, issues, comments, exports
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    if database.async_engine is not None:
+        async with database.async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        Base.metadata.create_all(bind=engine)
     print("✅ Done")
+    redis_client.revocations.start()
+    if outbox.OUTBOX_WORKER_ENABLED:
+        outbox.worker.start()
+    replica.monitor.start()
     yield
+    replica.monitor.stop()
+    await outbox.worker.stop()
+    redis_client.revocations.stop()
+    events.hub.stop()
+    security.shutdown_pool()
+    await redis_client.close()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+    if database.async_replica_engine is not None:
+        await database.async_replica_engine.dispose()
 
 
-app = FastAPI(title="Bug Tracker API", lifespan=lifespan)
+app = FastAPI(
+    title="Bug Tracker API", lifespan=lifespan, dependencies=[Depends(rate_limit)]
+)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
+app.include_router(projects.router)
+app.include_router(issues.router)
+app.include_router(comments.router)
+app.include_router(exports.router)
 
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
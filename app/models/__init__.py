@@ -2,5 +2,16 @@
 from .project import Project
 from .issue import Issue
 from .comment import Comment
+from .project_stats import ProjectIssueStat
+from .outbox import OutboxEvent
+from .tombstone import Tombstone
 
-__all__ = ["User", "Project", "Issue", "Comment"]
+__all__ = [
+    "User",
+    "Project",
+    "Issue",
+    "Comment",
+    "ProjectIssueStat",
+    "OutboxEvent",
+    "Tombstone",
+]
@@ -1,17 +1,30 @@
 ﻿import uuid
-from sqlalchemy import Column, Text, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, Text, DateTime, ForeignKey, Index, event
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_comments_issue_created", "issue_id", "created_at", "id"),
+        # Project-scoped sync scans (app/db/sync.py) without touching issues.
+        Index("ix_comments_project_updated", "project_id", "updated_at", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     content = Column(Text, nullable=False)
     issue_id = Column(
         UUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), nullable=False
     )
+    # Copied from the issue on insert; issues never move between projects.
+    project_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
     author_id = Column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False
     )
@@ -19,3 +32,18 @@ class Comment(Base):
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+    author = relationship("User", lazy="raise")
+
+
+for statement in (
+    "ALTER TABLE comments ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('english', coalesce(content, ''))"
+    ") STORED",
+    "CREATE INDEX ix_comments_search_vector ON comments USING gin (search_vector)",
+):
+    event.listen(
+        Comment.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
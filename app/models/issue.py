@@ -1,7 +1,19 @@
 ﻿import uuid
 import enum
-from sqlalchemy import Column, String, Text, Enum as SAEnum, Date, DateTime, ForeignKey
+from sqlalchemy import (
+    DDL,
+    Column,
+    String,
+    Text,
+    Enum as SAEnum,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    event,
+)
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
@@ -23,6 +35,20 @@ class PriorityEnum(str, enum.Enum):
 
 class Issue(Base):
     __tablename__ = "issues"
+    # Server defaults come back via RETURNING on flush, so a write can be
+    # serialized (and its outbox row built) without a refresh SELECT.
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index(
+            "ix_issues_project_status_created",
+            "project_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        Index("ix_issues_project_created", "project_id", "created_at", "id"),
+        Index("ix_issues_project_updated", "project_id", "updated_at", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
@@ -44,3 +70,25 @@ class Issue(Base):
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+    # lazy="raise": users are only reachable through an explicit eager load,
+    # so a per-row lookup fails loudly instead of becoming an N+1.
+    reporter = relationship("User", foreign_keys=[reporter_id], lazy="raise")
+    assignee = relationship("User", foreign_keys=[assignee_id], lazy="raise")
+
+
+# The search vector is maintained by Postgres (see 0003_issue_search) and is
+# deliberately not mapped; app.db.search refers to it by name. One statement
+# per DDL: asyncpg prepares each one and rejects multi-command strings.
+for statement in (
+    "ALTER TABLE issues ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX ix_issues_search_vector ON issues USING gin (search_vector)",
+):
+    event.listen(
+        Issue.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
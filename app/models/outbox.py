@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class OutboxEvent(Base):
+    """A side effect to run once the write that produced it has committed.
+
+    Rows are drained by app.core.outbox; ``available_at`` is NULL once a row
+    has exhausted its retries.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_available", "available_at", "id"),)
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    topic = Column(String(64), nullable=False)
+    project_id = Column(UUID(as_uuid=True), nullable=True)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    available_at = Column(DateTime(timezone=True), default=_utcnow)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
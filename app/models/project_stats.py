@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.database import Base
+
+
+class ProjectIssueStat(Base):
+    """One counter per (project, dimension, value), e.g. (p, "status", "open").
+
+    Maintained in the same transaction as the issue writes; see app.db.stats.
+    """
+
+    __tablename__ = "project_issue_stats"
+    project_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    dimension = Column(String(16), primary_key=True)
+    value = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
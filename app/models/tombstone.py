@@ -0,0 +1,84 @@
+from sqlalchemy import DDL, BigInteger, Column, DateTime, Index, Integer, String, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.database import Base
+from app.models.comment import Comment
+from app.models.issue import Issue
+
+
+class Tombstone(Base):
+    """A deleted issue or comment, kept so sync clients learn of the delete.
+
+    Rows are written by the AFTER DELETE triggers below (and in
+    0006_sync_changes), never by the application.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_project_deleted", "project_id", "deleted_at", "id"),
+    )
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+ISSUE_TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION issues_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO tombstones (entity, entity_id, project_id)
+    VALUES ('issue', OLD.id, OLD.project_id);
+    RETURN NULL;
+END $$ LANGUAGE plpgsql
+"""
+
+# A comment deleted along with its issue finds no issue row here and is
+# skipped: the issue's own tombstone covers it.
+COMMENT_TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION comments_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO tombstones (entity, entity_id, project_id)
+    SELECT 'comment', OLD.id, i.project_id FROM issues i WHERE i.id = OLD.issue_id;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql
+"""
+
+# Function and trigger are separate DDLs: asyncpg prepares each statement and
+# rejects a string holding more than one command.
+for table, function in (
+    (Issue.__table__, ISSUE_TOMBSTONE_FUNCTION),
+    (Comment.__table__, COMMENT_TOMBSTONE_FUNCTION),
+):
+    for statement in (
+        function,
+        f"CREATE TRIGGER {table.name}_tombstone AFTER DELETE ON {table.name} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table.name}_tombstone()",
+    ):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+event.listen(
+    Issue.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER issues_tombstone AFTER DELETE ON issues BEGIN "
+        "INSERT INTO tombstones (entity, entity_id, project_id) "
+        "VALUES ('issue', OLD.id, OLD.project_id); END"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Comment.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER comments_tombstone AFTER DELETE ON comments BEGIN "
+        "INSERT INTO tombstones (entity, entity_id, project_id) "
+        "SELECT 'comment', OLD.id, project_id FROM issues WHERE id = OLD.issue_id; "
+        "END"
+    ).execute_if(dialect="sqlite"),
+)
@@ -1,6 +1,8 @@
 ﻿from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
+from typing import Optional
+from app.schemas.user import UserSummary
 
 
 class CommentCreate(BaseModel):
@@ -17,3 +19,8 @@ class CommentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CommentWithAuthor(CommentResponse):
+    # Present only when requested with ?expand=author.
+    author: Optional[UserSummary] = None
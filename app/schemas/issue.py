@@ -1,25 +1,28 @@
 ﻿from pydantic import BaseModel, Field
 from uuid import UUID
-from typing import Optional
+from typing import Any, List, Optional
 from datetime import date, datetime
 from app.models.issue import StatusEnum, PriorityEnum
+from app.schemas.user import UserSummary
+
+MAX_BULK_ITEMS = 5000
 
 
 class IssueCreate(BaseModel):
     title: str = Field(..., max_length=200)
     description: Optional[str] = Field(None, max_length=5000)
     priority: Optional[PriorityEnum] = PriorityEnum.medium
-    assignee_id: Optional[UUID]
-    due_date: Optional[date]
+    assignee_id: Optional[UUID] = None
+    due_date: Optional[date] = None
 
 
 class IssueUpdate(BaseModel):
     title: Optional[str] = Field(None, max_length=200)
     description: Optional[str] = Field(None, max_length=5000)
-    status: Optional[StatusEnum]
-    priority: Optional[PriorityEnum]
-    assignee_id: Optional[UUID]
-    due_date: Optional[date]
+    status: Optional[StatusEnum] = None
+    priority: Optional[PriorityEnum] = None
+    assignee_id: Optional[UUID] = None
+    due_date: Optional[date] = None
 
 
 class IssueResponse(BaseModel):
@@ -37,3 +40,40 @@ class IssueResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class IssueWithUsers(IssueResponse):
+    # Present only when requested with ?expand=reporter,assignee.
+    reporter: Optional[UserSummary] = None
+    assignee: Optional[UserSummary] = None
+
+
+class IssueSearchHit(IssueResponse):
+    rank: float
+
+
+class IssueBulkUpdateItem(BaseModel):
+    id: UUID
+    status: Optional[StatusEnum] = None
+    priority: Optional[PriorityEnum] = None
+    assignee_id: Optional[UUID] = None
+
+
+class IssueBulkRequest(BaseModel):
+    # Items are validated one by one so a bad row is reported, not fatal.
+    items: List[Any] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: Any
+
+
+class IssueBulkCreateResponse(BaseModel):
+    created: List[IssueResponse]
+    errors: List[BulkItemError]
+
+
+class IssueBulkUpdateResponse(BaseModel):
+    updated: List[UUID]
+    errors: List[BulkItemError]
@@ -1,6 +1,6 @@
 ﻿from pydantic import BaseModel, Field
 from uuid import UUID
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 
@@ -12,7 +12,7 @@ class ProjectCreate(BaseModel):
 class ProjectUpdate(BaseModel):
     name: Optional[str] = Field(None, max_length=100)
     description: Optional[str] = Field(None, max_length=1000)
-    is_archived: Optional[bool]
+    is_archived: Optional[bool] = None
 
 
 class ProjectResponse(BaseModel):
@@ -26,3 +26,10 @@ class ProjectResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProjectStatsResponse(BaseModel):
+    project_id: UUID
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
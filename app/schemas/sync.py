@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import List
+
+from app.schemas.comment import CommentResponse
+from app.schemas.issue import IssueResponse
+
+
+class Deletion(BaseModel):
+    entity: str
+    id: UUID
+    deleted_at: datetime
+
+
+class ChangesResponse(BaseModel):
+    issues: List[IssueResponse]
+    comments: List[CommentResponse]
+    deleted: List[Deletion]
+    next_cursor: str
+    has_more: bool
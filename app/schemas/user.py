@@ -29,3 +29,12 @@ class UserResponse(BaseModel):
 
     class Config:
         from_attributes = True  # required for SQLAlchemy ORM
+
+
+class UserSummary(BaseModel):
+    id: UUID
+    username: str
+    role: RoleEnum
+
+    class Config:
+        from_attributes = True
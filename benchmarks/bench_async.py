@@ -0,0 +1,107 @@
+"""Compare requests/sec of the sync and async request paths.
+
+Starts the API under uvicorn twice with the same worker count, once with
+ASYNC_MODE=false and once with ASYNC_MODE=true, and drives an authenticated
+listing endpoint with a fixed number of concurrent connections. Needs the
+Postgres and Redis from docker-compose (or DATABASE_URL/REDIS_URL pointing at
+equivalents) and RSA keys in keys/.
+
+    python -m benchmarks.bench_async --workers 2 --concurrency 64 --duration 15
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import create_project, login_as_new_manager, wait_healthy
+
+
+async def _prepare(c: httpx.AsyncClient, issues: int) -> str:
+    await login_as_new_manager(c)
+    project_id = await create_project(c)
+    for i in range(issues):
+        r = await c.post(
+            f"/api/projects/{project_id}/issues",
+            json={"title": f"issue {i}", "assignee_id": None, "due_date": None},
+        )
+        r.raise_for_status()
+    return f"/api/projects/{project_id}/issues?limit=20"
+
+
+async def _drive(base_url: str, concurrency: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as c:
+        path = await _prepare(c, issues=50)
+        done = errors = 0
+        stop = time.monotonic() + duration
+
+        async def worker():
+            nonlocal done, errors
+            while time.monotonic() < stop:
+                r = await c.get(path)
+                if r.status_code == 200:
+                    done += 1
+                else:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+    return {"requests": done, "errors": errors, "rps": done / elapsed}
+
+
+def run_mode(async_mode: bool, args) -> dict:
+    env = {
+        **os.environ,
+        "ASYNC_MODE": "true" if async_mode else "false",
+        # Otherwise the per-user limits turn most of the run into 429s.
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_healthy(base_url))
+        return asyncio.run(_drive(base_url, args.concurrency, args.duration))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+
+    print(f"workers={args.workers} concurrency={args.concurrency}")
+    for label, async_mode in (("sync", False), ("async", True)):
+        result = run_mode(async_mode, args)
+        print(
+            f"{label:>5}: {result['rps']:8.1f} req/s "
+            f"({result['requests']} ok, {result['errors']} errors)"
+        )
+
+
+if __name__ == "__main__":
+    main()
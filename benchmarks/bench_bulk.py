@@ -0,0 +1,110 @@
+"""Throughput of bulk issue endpoints against the per-row path.
+
+Creates N issues with one POST per issue and with POST .../issues:bulk, then
+closes them with one PATCH per issue and with PATCH /api/issues:bulk, and
+reports rows/sec for each. Runs against an already running API, which must
+be started with rate limiting off or the per-row path gets throttled:
+
+    RATE_LIMIT_ENABLED=false uvicorn app.main:app &
+    python -m benchmarks.bench_bulk --base-url http://localhost:8000 --rows 2000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import create_project, login_as_new_manager
+
+
+async def _per_row(c, project_id, rows, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def create(i):
+        async with sem:
+            r = await c.post(
+                f"/api/projects/{project_id}/issues", json={"title": f"row {i}"}
+            )
+            r.raise_for_status()
+            return r.json()["id"]
+
+    started = time.perf_counter()
+    ids = await asyncio.gather(*(create(i) for i in range(rows)))
+    create_s = time.perf_counter() - started
+
+    async def close(id):
+        async with sem:
+            r = await c.patch(f"/api/issues/{id}", json={"status": "closed"})
+            r.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(close(id) for id in ids))
+    return create_s, time.perf_counter() - started
+
+
+async def _bulk(c, project_id, rows, batch):
+    ids = []
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        items = [
+            {"title": f"row {i}"} for i in range(offset, min(rows, offset + batch))
+        ]
+        r = await c.post(
+            f"/api/projects/{project_id}/issues:bulk", json={"items": items}
+        )
+        r.raise_for_status()
+        ids.extend(i["id"] for i in r.json()["created"])
+    create_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for offset in range(0, len(ids), batch):
+        items = [{"id": id, "status": "closed"} for id in ids[offset : offset + batch]]
+        r = await c.patch("/api/issues:bulk", json={"items": items})
+        r.raise_for_status()
+    return create_s, time.perf_counter() - started
+
+
+async def _run(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as c:
+        await login_as_new_manager(c)
+        row_create, row_update = await _per_row(
+            c, await create_project(c), args.rows, args.concurrency
+        )
+        bulk_create, bulk_update = await _bulk(
+            c, await create_project(c), args.rows, args.batch
+        )
+    for label, seconds in (
+        ("per-row create", row_create),
+        ("bulk create", bulk_create),
+        ("per-row update", row_update),
+        ("bulk update", bulk_update),
+    ):
+        print(f"{label:>15}: {args.rows / seconds:10.1f} rows/s ({seconds:.2f}s)")
+
+
+def _run_unthrottled(args):
+    try:
+        asyncio.run(_run(args))
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 429:
+            sys.exit(
+                "The API is rate limiting this benchmark; "
+                "restart it with RATE_LIMIT_ENABLED=false."
+            )
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    _run_unthrottled(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""CPU cost and size of each compression level on a listing-sized body.
+
+Builds a page of --rows issues the way the listing endpoints render it, as
+JSON and as MessagePack. It then reports the compressed size and median
+compression time for gzip levels and brotli qualities. Use it to pick
+GZIP_LEVEL and BROTLI_QUALITY for a given CPU and bandwidth budget.
+
+    python -m benchmarks.bench_compression --rows 200 --repeat 50
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+import zlib
+from datetime import date, datetime, timedelta, timezone
+
+import brotli
+
+from app.core.serialization import dumps, packb
+from app.models.issue import PriorityEnum, StatusEnum
+from benchmarks.dataset import WORDS
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 6, 9, 11)
+
+
+def _page(rows: int) -> dict:
+    now = datetime.now(timezone.utc)
+    project_id, reporter_id = uuid.uuid4(), uuid.uuid4()
+    items = []
+    for i in range(rows):
+        words = [WORDS[(i * 7 + k) % len(WORDS)] for k in range(12)]
+        items.append(
+            {
+                "id": uuid.uuid4(),
+                "title": " ".join(words[:6]),
+                "description": " ".join(words) if i % 3 else None,
+                "status": list(StatusEnum)[i % 5],
+                "priority": list(PriorityEnum)[i % 4],
+                "project_id": project_id,
+                "reporter_id": reporter_id,
+                "assignee_id": None,
+                "due_date": date(2026, 1, 1) + timedelta(days=i % 90),
+                "created_at": now + timedelta(seconds=i),
+                "updated_at": now + timedelta(seconds=i),
+            }
+        )
+    return {"items": items, "next_cursor": None}
+
+
+def _gzip(level):
+    return lambda body: zlib.compress(body, level, 16 + zlib.MAX_WBITS)
+
+
+def _brotli(quality):
+    return lambda body: brotli.compress(body, quality=quality)
+
+
+def _time(fn, body, repeat) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(body)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    page = _page(args.rows)
+    codecs = [(f"gzip-{level}", _gzip(level)) for level in GZIP_LEVELS]
+    codecs += [(f"br-{quality}", _brotli(quality)) for quality in BROTLI_QUALITIES]
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    print(f"{'':12}{'bytes':>9}{'ratio':>8}{'ms':>9}{'MB/s':>9}")
+    for label, body in (("json", dumps(page)), ("msgpack", packb(page))):
+        print(f"{label:12}{len(body):>9}")
+        for name, fn in codecs:
+            size = len(fn(body))
+            ms = _time(fn, body, args.repeat)
+            print(
+                f"  {name:10}{size:>9}{len(body) / size:>8.1f}"
+                f"{ms:>9.2f}{len(body) / ms / 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
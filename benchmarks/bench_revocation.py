@@ -0,0 +1,62 @@
+"""Latency of the revocation check with and without the local Bloom filter.
+
+Runs against the Redis at REDIS_URL. Seeds a number of revoked jtis, then
+times ``is_blacklisted`` for never-revoked jtis (the common case) with the
+index stopped (every call is a Redis round-trip) and started.
+
+    python -m benchmarks.bench_revocation --calls 20000 --revoked 10000
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+
+from app.core import redis_client
+
+
+def _time_calls(calls: int):
+    samples = []
+    for _ in range(calls):
+        jti = str(uuid.uuid4())
+        started = time.perf_counter()
+        redis_client.is_blacklisted(jti)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        "p50_us": statistics.median(samples),
+        "p99_us": samples[int(len(samples) * 0.99) - 1],
+        "mean_us": statistics.fmean(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--revoked", type=int, default=10000)
+    args = parser.parse_args()
+
+    pipe = redis_client._redis.pipeline(transaction=False)
+    for _ in range(args.revoked):
+        pipe.setex(f"bl:bench-{uuid.uuid4()}", 600, "1")
+    pipe.execute()
+
+    index = redis_client.revocations
+    index.stop()
+    direct = _time_calls(args.calls)
+
+    index.start()
+    while not index.ready:
+        time.sleep(0.05)
+    filtered = _time_calls(args.calls)
+    index.stop()
+
+    for label, result in (("redis only", direct), ("bloom filter", filtered)):
+        print(
+            f"{label:>12}: p50 {result['p50_us']:8.1f} us  "
+            f"p99 {result['p99_us']:8.1f} us  mean {result['mean_us']:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
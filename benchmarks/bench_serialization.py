@@ -0,0 +1,124 @@
+"""Cost of rendering a large issue listing: ORM + Pydantic vs column rows + orjson.
+
+Loads --rows issues into a throwaway SQLite file, then times both ways of
+producing the listing body, with and without the query. The two bodies are
+checked to be byte-identical before anything is timed.
+
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 20
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.core.serialization import columns, page_response
+from app.db.database import Base
+from app.dependencies.expand import embed
+from app.models.issue import Issue, PriorityEnum, StatusEnum
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.issue import IssueResponse, IssueWithUsers
+from app.schemas.pagination import Page
+
+# What FastAPI builds for response_model=Page[IssueWithUsers].
+ADAPTER = TypeAdapter(Page[IssueWithUsers])
+
+
+def _load(engine, rows):
+    user_id, project_id = uuid.uuid4(), uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        db.add(User(id=user_id, username="bench", email="b@x.io", password="x"))
+        db.add(Project(id=project_id, name="bench", created_by=user_id))
+        db.flush()
+        db.execute(
+            insert(Issue),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "title": f"issue {i} with a reasonably long title",
+                    "description": None if i % 3 else "steps to reproduce\n" * 4,
+                    "status": list(StatusEnum)[i % 5],
+                    "priority": list(PriorityEnum)[i % 4],
+                    "project_id": project_id,
+                    "reporter_id": user_id,
+                    "due_date": date(2026, 1, 1) + timedelta(days=i % 90),
+                    "created_at": now + timedelta(microseconds=i),
+                    "updated_at": now + timedelta(microseconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+
+
+def _orm_rows(db):
+    return db.query(Issue).order_by(Issue.created_at, Issue.id).all()
+
+
+def _column_rows(db):
+    q = db.query(*columns(Issue, IssueResponse))
+    return q.order_by(Issue.created_at, Issue.id).all()
+
+
+def _pydantic_body(issues) -> bytes:
+    page = {"items": [embed(i, IssueResponse, set()) for i in issues]}
+    page["next_cursor"] = None
+    return ADAPTER.dump_json(ADAPTER.validate_python(page), exclude_unset=True)
+
+
+def _orjson_body(rows) -> bytes:
+    return page_response({"items": rows, "next_cursor": None}).body
+
+
+def _time(fn, repeat) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(engine)
+        _load(engine, args.rows)
+        with Session(engine) as db:
+            orm, cols = _orm_rows(db), _column_rows(db)
+            if _pydantic_body(orm) != _orjson_body(cols):
+                raise SystemExit("bodies differ; the fast path is not byte-compatible")
+            results = {
+                "serialize only": (
+                    _time(lambda: _pydantic_body(orm), args.repeat),
+                    _time(lambda: _orjson_body(cols), args.repeat),
+                ),
+                "query + serialize": (
+                    _time(lambda: _pydantic_body(_orm_rows(db)), args.repeat),
+                    _time(lambda: _orjson_body(_column_rows(db)), args.repeat),
+                ),
+            }
+        engine.dispose()
+
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    print(f"{'':20}{'orm+pydantic':>14}{'columns+orjson':>16}{'speedup':>9}")
+    for label, (slow, fast) in results.items():
+        print(f"{label:20}{slow:>11.1f} ms{fast:>13.1f} ms{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
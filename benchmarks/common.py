@@ -0,0 +1,45 @@
+"""Helpers shared by the HTTP benchmarks."""
+
+import asyncio
+import time
+import uuid
+
+import httpx
+
+
+async def wait_healthy(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as c:
+        while time.monotonic() < deadline:
+            try:
+                if (await c.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{base_url} did not become healthy")
+
+
+async def login_as_new_manager(c: httpx.AsyncClient):
+    """Register a throwaway manager and set its bearer token on ``c``."""
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+    r = await c.post(
+        "/api/auth/register",
+        json={
+            "username": email[:50],
+            "email": email,
+            "password": password,
+            "role": "manager",
+        },
+    )
+    r.raise_for_status()
+    r = await c.post("/api/auth/login", json={"email": email, "password": password})
+    r.raise_for_status()
+    c.headers["Authorization"] = f"Bearer {r.json()['access_token']}"
+
+
+async def create_project(c: httpx.AsyncClient) -> str:
+    r = await c.post("/api/projects", json={"name": f"bench-{uuid.uuid4().hex}"})
+    r.raise_for_status()
+    return r.json()["id"]
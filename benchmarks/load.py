@@ -0,0 +1,251 @@
+"""Scripted load scenarios against a running API, with baseline comparison.
+
+Seed first with benchmarks.dataset, start the API, then:
+
+    python -m benchmarks.load --base-url http://localhost:8000 \
+        --scenarios login,list_issues,issue_detail,add_comment,search \
+        --concurrency 32 --duration 20 --baseline benchmarks/baseline.json
+
+Each scenario runs alone for --duration seconds after a short warm-up and
+reports RPS and p50/p95/p99 latency. Results are written as JSON; with
+--baseline the run is compared and the exit status is 1 if any scenario's
+p95 or RPS is worse than the baseline by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.dataset import DEFAULT_MANIFEST, WORDS, load_manifest, row_id
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+
+    return register
+
+
+@scenario("login")
+async def login(c, ds, rng):
+    n = rng.randrange(ds["users"])
+    return await c.post(
+        "/api/auth/login",
+        json={"email": f"seed{n}@example.com", "password": ds["password"]},
+    )
+
+
+@scenario("list_issues")
+async def list_issues(c, ds, rng):
+    project = row_id("project", rng.randrange(ds["projects"]))
+    return await c.get(f"/api/projects/{project}/issues", params={"limit": 50})
+
+
+@scenario("issue_detail")
+async def issue_detail(c, ds, rng):
+    return await c.get(f"/api/issues/{row_id('issue', rng.randrange(ds['issues']))}")
+
+
+@scenario("add_comment")
+async def add_comment(c, ds, rng):
+    issue = row_id("issue", rng.randrange(ds["issues"]))
+    return await c.post(
+        f"/api/issues/{issue}/comments", json={"content": "benchmark comment"}
+    )
+
+
+@scenario("search")
+async def search(c, ds, rng):
+    q = " ".join(rng.sample(WORDS, 2))
+    return await c.get("/api/issues/search", params={"q": q, "limit": 20})
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": len(values) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+async def _authenticate(c, ds):
+    r = await c.post(
+        "/api/auth/login",
+        json={"email": "seed0@example.com", "password": ds["password"]},
+    )
+    r.raise_for_status()
+    c.headers["Authorization"] = f"Bearer {r.json()['access_token']}"
+
+
+async def run_scenario(name, args, ds) -> dict:
+    fn = SCENARIOS[name]
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as c:
+        await _authenticate(c, ds)
+        latencies, errors = [], 0
+        recording = False
+
+        async def worker(i):
+            nonlocal errors
+            rng = random.Random(f"{args.seed}:{name}:{i}")
+            while time.monotonic() < stop:
+                started = time.perf_counter()
+                try:
+                    r = await fn(c, ds, rng)
+                    ok = r.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if not recording:
+                    continue
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        stop = time.monotonic() + args.warmup
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        recording = True
+        started = time.monotonic()
+        stop = started + args.duration
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.monotonic() - started
+    return summarize(latencies, errors, elapsed)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions of ``results`` against ``baseline`` beyond ``tolerance``."""
+    regressions = []
+    for name, now in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']:.1f}ms -> {now['p95_ms']:.1f}ms"
+            )
+        if now["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {before['rps']:.0f} -> {now['rps']:.0f}")
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _print_table(results: dict, baseline: dict = None):
+    print(
+        f"{'scenario':<14}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'errors':>8}{'p95 vs base':>13}"
+    )
+    for name, s in results["scenarios"].items():
+        delta = ""
+        before = (baseline or {}).get("scenarios", {}).get(name)
+        if before and before["p95_ms"]:
+            delta = f"{(s['p95_ms'] / before['p95_ms'] - 1) * 100:+.1f}%"
+        print(
+            f"{name:<14}{s['rps']:>9.1f}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}"
+            f"{s['p99_ms']:>9.1f}{s['errors']:>8}{delta:>13}"
+        )
+
+
+async def _run(args, ds) -> dict:
+    results = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "dataset": {k: v for k, v in ds.items() if k != "password"},
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        results["scenarios"][name] = await run_scenario(name, args, ds)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        type=lambda s: [n for n in s.split(",") if n],
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--manifest", default=str(DEFAULT_MANIFEST))
+    parser.add_argument("--output", help="defaults to benchmarks/results/<time>.json")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="write results to --baseline"
+    )
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(_run(args, load_manifest(args.manifest)))
+    output = Path(
+        args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    baseline = None
+    if args.baseline and Path(args.baseline).exists() and not args.save_baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+    _print_table(results, baseline)
+    print(f"results written to {output}")
+    if args.save_baseline and args.baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2))
+        print(f"baseline saved to {args.baseline}")
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Drain the transactional outbox outside the API processes.
+
+    OUTBOX_WORKER_ENABLED=false uvicorn app.main:app ...
+    python -m scripts.outbox_worker
+
+Any number of these can run side by side; each claims its own batches.
+"""
+
+import argparse
+import asyncio
+import logging
+
+import app.models  # noqa: F401
+from app.core import outbox
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=outbox.OUTBOX_BATCH_SIZE)
+    parser.add_argument(
+        "--poll-seconds", type=float, default=outbox.OUTBOX_POLL_SECONDS
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    worker = outbox.OutboxWorker(args.batch_size, args.poll_seconds)
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Delete sync tombstones older than the retention period.
+
+    python -m scripts.prune_tombstones [--days N]
+
+Clients whose cursor predates the cutoff get 410 from /changes and resync.
+"""
+
+import argparse
+
+import app.models  # noqa: F401
+from app.db.database import SessionLocal
+from app.db.sync import SYNC_TOMBSTONE_RETENTION_DAYS, prune_tombstones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=SYNC_TOMBSTONE_RETENTION_DAYS)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        print(f"{prune_tombstones(db, args.days)} tombstone(s) pruned")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
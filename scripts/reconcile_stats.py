@@ -0,0 +1,40 @@
+"""Recompute project_issue_stats from the issues table and report drift.
+
+    python -m scripts.reconcile_stats [--project UUID] [--fix]
+
+Exits 1 when drift was found (after fixing it, with --fix), so it can run
+from cron or CI and alert.
+"""
+
+import argparse
+import sys
+from uuid import UUID
+
+from app.db.database import SessionLocal
+from app.db.stats import reconcile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project", type=UUID, help="only this project")
+    parser.add_argument("--fix", action="store_true", help="correct the drift")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        drift = reconcile(db, project_id=args.project, fix=args.fix)
+    finally:
+        db.close()
+    for d in drift:
+        print(
+            f"{d['project_id']} {d['dimension']}={d['value']}: "
+            f"stored {d['stored']}, actual {d['actual']}"
+        )
+    print(
+        f"{len(drift)} counter(s) drifted" + (", fixed" if args.fix and drift else "")
+    )
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""Bulk-seed users, projects, issues and comments with COPY on parallel workers.
+
+    python -m scripts.seed_bulk --database-url postgresql://... \
+        --users 50000 --projects 5000 --issues 3000000 --comments 7000000 \
+        --workers 8 --reset --defer-indexes
+
+Every table is split into fixed-size ranges, and each worker process COPYs
+whole ranges over its own connection. Rows are generated from (seed, range)
+only, so the data is identical whatever the worker count. Tables load in
+dependency order, so every reference points at a row that already exists.
+Users get passwords from a small pool (seed-password-0 ... seed-password-N-1,
+assigned round-robin) that is hashed once up front. The schema must already
+be migrated (alembic upgrade head).
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+COPY_CHUNK_ROWS = 50_000
+DEFAULT_RANGE_ROWS = 250_000
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+KINDS = {"user": 1, "project": 2, "issue": 3, "comment": 4}
+STATUSES = ["open", "in_progress", "resolved", "closed", "reopened"]
+PRIORITIES = ["low", "medium", "high", "critical"]
+WORDS = (
+    "crash login timeout export cache deadlock memory leak dashboard search "
+    "upload permission token retry latency migration index render mobile "
+    "billing email webhook queue scheduler report sync offline"
+).split()
+TABLES = ["users", "projects", "issues", "comments"]
+
+
+def row_id(kind: str, n: int) -> uuid.UUID:
+    return uuid.UUID(int=(0xBE7C << 112) | (KINDS[kind] << 96) | n)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _ts(seconds_before_epoch: float) -> str:
+    return (EPOCH - timedelta(seconds=seconds_before_epoch)).isoformat()
+
+
+def user_rows(sizes: dict, password_hashes: list, start=0, stop=None):
+    for n in range(start, sizes["users"] if stop is None else stop):
+        role = "admin" if n == 0 else "manager" if n % 10 == 0 else "developer"
+        yield (
+            row_id("user", n),
+            f"seed{n}",
+            f"seed{n}@example.com",
+            password_hashes[n % len(password_hashes)],
+            role,
+            True,
+            _ts(n),
+        )
+
+
+def project_rows(sizes: dict, seed: int, start=0, stop=None):
+    for n in range(start, sizes["projects"] if stop is None else stop):
+        created = _ts(86400 * 365 - n)
+        yield (
+            row_id("project", n),
+            f"project-{n}",
+            f"Seeded project {n}",
+            row_id("user", n % sizes["users"]),
+            created,
+            created,
+            False,
+        )
+
+
+def issue_rows(sizes: dict, seed: int, start=0, stop=None):
+    rng = random.Random(f"{seed}:issues:{start}")
+    stop = sizes["issues"] if stop is None else stop
+    for n in range(start, stop):
+        created = _ts(sizes["issues"] - n)
+        assignee = rng.randrange(sizes["users"]) if rng.random() < 0.8 else None
+        yield (
+            row_id("issue", n),
+            f"{_text(rng, 3)} #{n}",
+            _text(rng, 20),
+            rng.choice(STATUSES),
+            rng.choice(PRIORITIES),
+            row_id("project", n % sizes["projects"]),
+            row_id("user", rng.randrange(sizes["users"])),
+            None if assignee is None else row_id("user", assignee),
+            None,
+            created,
+            created,
+        )
+
+
+def comment_rows(sizes: dict, seed: int, start=0, stop=None):
+    rng = random.Random(f"{seed}:comments:{start}")
+    stop = sizes["comments"] if stop is None else stop
+    for n in range(start, stop):
+        created = _ts(sizes["comments"] - n)
+        issue = n % sizes["issues"]
+        yield (
+            row_id("comment", n),
+            _text(rng, 12),
+            row_id("issue", issue),
+            row_id("project", issue % sizes["projects"]),
+            row_id("user", rng.randrange(sizes["users"])),
+            created,
+            created,
+        )
+
+
+COLUMNS = {
+    "users": "id, username, email, password, role, is_active, created_at",
+    "projects": "id, name, description, created_by, created_at, updated_at, "
+    "is_archived",
+    "issues": "id, title, description, status, priority, project_id, "
+    "reporter_id, assignee_id, due_date, created_at, updated_at",
+    "comments": "id, content, issue_id, project_id, author_id, created_at, "
+    "updated_at",
+}
+
+STATS_SQL = """
+DELETE FROM project_issue_stats;
+INSERT INTO project_issue_stats (project_id, dimension, value, count)
+SELECT project_id, 'status', status, count(*) FROM issues GROUP BY 1, 3
+UNION ALL
+SELECT project_id, 'priority', priority, count(*) FROM issues GROUP BY 1, 3;
+"""
+
+# Secondary indexes only: the ones backing primary keys and unique
+# constraints stay, so integrity is still enforced while loading.
+SECONDARY_INDEXES_SQL = """
+SELECT i.indexname, i.indexdef FROM pg_indexes i
+WHERE i.schemaname = current_schema() AND i.tablename = ANY(%s)
+AND NOT EXISTS (
+    SELECT 1 FROM pg_constraint c
+    WHERE c.conindid = (quote_ident(i.schemaname) || '.' || quote_ident(i.indexname))::regclass
+)
+"""
+
+
+def copy_rows(cursor, table: str, rows) -> int:
+    """Stream ``rows`` into ``table`` with COPY, one CSV chunk at a time."""
+    sql = f"COPY {table} ({COLUMNS[table]}) FROM STDIN WITH (FORMAT csv)"
+    total = 0
+    while True:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        count = 0
+        for row in rows:
+            # None becomes an empty unquoted field, which COPY reads as NULL.
+            writer.writerow(row)
+            count += 1
+            if count == COPY_CHUNK_ROWS:
+                break
+        if not count:
+            return total
+        buf.seek(0)
+        cursor.copy_expert(sql, buf)
+        total += count
+
+
+def plan_ranges(total: int, range_rows: int) -> list:
+    return [
+        (start, min(total, start + range_rows)) for start in range(0, total, range_rows)
+    ]
+
+
+def _rows(table, sizes, seed, password_hashes, start, stop):
+    if table == "users":
+        return user_rows(sizes, password_hashes, start, stop)
+    generator = {
+        "projects": project_rows,
+        "issues": issue_rows,
+        "comments": comment_rows,
+    }[table]
+    return generator(sizes, seed, start, stop)
+
+
+def _connect(database_url: str):
+    return create_engine(database_url, poolclass=NullPool).raw_connection()
+
+
+def _copy_range(database_url, table, sizes, seed, password_hashes, start, stop):
+    """Worker entry point: COPY one range in its own transaction."""
+    conn = _connect(database_url)
+    try:
+        cur = conn.cursor()
+        # Losing the tail of a seed run on a crash is fine; waiting on WAL
+        # flushes for every commit is not.
+        cur.execute("SET synchronous_commit = off")
+        count = copy_rows(
+            cur, table, _rows(table, sizes, seed, password_hashes, start, stop)
+        )
+        conn.commit()
+        return count
+    finally:
+        conn.close()
+
+
+def _execute(database_url: str, sql: str):
+    conn = _connect(database_url)
+    try:
+        conn.cursor().execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _drop_secondary_indexes(database_url: str) -> list:
+    conn = _connect(database_url)
+    try:
+        cur = conn.cursor()
+        cur.execute(SECONDARY_INDEXES_SQL, (TABLES,))
+        indexes = cur.fetchall()
+        for name, _ in indexes:
+            cur.execute(f'DROP INDEX "{name}"')
+        conn.commit()
+    finally:
+        conn.close()
+    return [definition for _, definition in indexes]
+
+
+def _create_index(database_url: str, definition: str):
+    _execute(database_url, f"SET maintenance_work_mem = '512MB'; {definition}")
+
+
+def hash_password_pool(size: int) -> list:
+    from app.core.security import hash_password
+
+    return [hash_password(f"seed-password-{k}") for k in range(size)]
+
+
+def seed(
+    database_url: str,
+    sizes: dict,
+    seed: int = 1,
+    workers: int = 4,
+    range_rows: int = DEFAULT_RANGE_ROWS,
+    password_hashes: list = None,
+    reset: bool = False,
+    defer_indexes: bool = False,
+):
+    password_hashes = password_hashes or hash_password_pool(4)
+    if reset:
+        _execute(
+            database_url,
+            "TRUNCATE project_issue_stats, comments, issues, projects, users",
+        )
+    deferred = _drop_secondary_indexes(database_url) if defer_indexes else []
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for table in TABLES:
+            table_started = time.perf_counter()
+            futures = [
+                pool.submit(
+                    _copy_range,
+                    database_url,
+                    table,
+                    sizes,
+                    seed,
+                    password_hashes,
+                    start,
+                    stop,
+                )
+                for start, stop in plan_ranges(sizes[table], range_rows)
+            ]
+            # Each table waits for the previous one, so references resolve.
+            count = sum(f.result() for f in futures)
+            seconds = time.perf_counter() - table_started
+            print(
+                f"{table:>9}: {count:>11} rows in {seconds:7.1f}s "
+                f"({count / seconds if seconds else 0:,.0f} rows/s)"
+            )
+
+        if deferred:
+            index_started = time.perf_counter()
+            for f in [pool.submit(_create_index, database_url, d) for d in deferred]:
+                f.result()
+            print(
+                f"  indexes: {len(deferred):>11} rebuilt in "
+                f"{time.perf_counter() - index_started:7.1f}s"
+            )
+
+    _execute(database_url, STATS_SQL)
+    _execute(database_url, "ANALYZE")
+    total = sum(sizes[t] for t in TABLES)
+    print(f"    total: {total:>11} rows in {time.perf_counter() - started:7.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=1_000)
+    parser.add_argument("--issues", type=int, default=1_000_000)
+    parser.add_argument("--comments", type=int, default=3_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--range-rows", type=int, default=DEFAULT_RANGE_ROWS)
+    parser.add_argument("--password-pool", type=int, default=4)
+    parser.add_argument("--reset", action="store_true", help="truncate all data first")
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="drop secondary indexes while loading and rebuild them after",
+    )
+    args = parser.parse_args()
+    seed(
+        args.database_url,
+        {
+            "users": args.users,
+            "projects": args.projects,
+            "issues": args.issues,
+            "comments": args.comments,
+        },
+        seed=args.seed,
+        workers=args.workers,
+        range_rows=args.range_rows,
+        password_hashes=hash_password_pool(args.password_pool),
+        reset=args.reset,
+        defer_indexes=args.defer_indexes,
+    )
+
+
+if __name__ == "__main__":
+    main()
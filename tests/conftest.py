@@ -0,0 +1,351 @@
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pytest
+import redis
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core import cache, rate_limit, redis_client
+from app.db import database, profiling
+from app.db.database import Base
+from app.dependencies.permissions import get_current_user_from_bearer
+from app.main import app
+from app.models.user import User
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self._server = server
+        self._queue = queue.Queue()
+
+    def subscribe(self, channel):
+        self._server.subscribers.setdefault(channel, []).append(self._queue)
+        self._queue.put({"type": "subscribe", "channel": channel, "data": 1})
+
+    def get_message(self, timeout=0.0):
+        if self._server.down or self._server.pubsub_down:
+            raise redis.ConnectionError("fake redis is down")
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        for queues in self._server.subscribers.values():
+            if self._queue in queues:
+                queues.remove(self._queue)
+
+
+class FakeRedis:
+    """Just enough of a synchronous ``redis.Redis`` for the app's Redis users.
+
+    Lua scripts cannot run here; ``scripts`` maps a script's source to a Python
+    function ``(fake, keys, args)`` that emulates it.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.expiry = {}
+        self.subscribers = {}
+        self.scripts = {}
+        self.exists_calls = 0
+        self.down = False
+        self.pubsub_down = False
+        self.streams = {}
+        # Fixed time for scripts that read the Redis clock; None is real time.
+        self.clock_ms = None
+        self._stream_added = threading.Condition()
+
+    def _alive(self, key):
+        if self.down:
+            raise redis.ConnectionError("fake redis is down")
+        if key in self.expiry and self.expiry[key] <= time.monotonic():
+            self.keys.pop(key, None)
+            del self.expiry[key]
+        return key in self.keys
+
+    def get(self, key):
+        return self.keys[key] if self._alive(key) else None
+
+    def mget(self, *keys):
+        return [self.get(k) for k in keys]
+
+    def set(self, key, value, ex=None, px=None):
+        self._alive(key)
+        self.keys[key] = value
+        self.expiry.pop(key, None)
+        if ex is not None:
+            self.expiry[key] = time.monotonic() + ex
+        if px is not None:
+            self.expiry[key] = time.monotonic() + px / 1000
+        return True
+
+    def setex(self, key, ttl, value):
+        return self.set(key, value, ex=ttl)
+
+    def psetex(self, key, ttl_ms, value):
+        return self.set(key, value, px=ttl_ms)
+
+    def delete(self, *keys):
+        removed = sum(1 for k in keys if self._alive(k))
+        for k in keys:
+            self.keys.pop(k, None)
+            self.expiry.pop(k, None)
+        return removed
+
+    def exists(self, key):
+        self.exists_calls += 1
+        return int(self._alive(key))
+
+    def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        return [k for k in list(self.keys) if k.startswith(prefix) and self._alive(k)]
+
+    def publish(self, channel, message):
+        for q in self.subscribers.get(channel, []):
+            q.put({"type": "message", "channel": channel, "data": message})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._alive(key)
+        with self._stream_added:
+            entries = self.streams.setdefault(key, [])
+            ms = int(time.time() * 1000)
+            last_ms, last_seq = _id_order(entries[-1][0]) if entries else (0, -1)
+            seq = last_seq + 1 if ms <= last_ms else 0
+            event_id = f"{max(ms, last_ms)}-{seq}"
+            entries.append((event_id, dict(fields)))
+            if maxlen is not None:
+                del entries[:-maxlen]
+            self._stream_added.notify_all()
+        return event_id
+
+    def xrange(self, key, min="-", max="+", count=None):
+        self._alive(key)
+        low = (-1, -1) if min == "-" else _id_order(min.lstrip("("))
+        entries = [
+            e
+            for e in self.streams.get(key, [])
+            if _id_order(e[0]) > low or (min[0] != "(" and _id_order(e[0]) == low)
+        ]
+        return entries[:count] if count else entries
+
+    def xrevrange(self, key, max="+", min="-", count=None):
+        self._alive(key)
+        entries = list(reversed(self.streams.get(key, [])))
+        return entries[:count] if count else entries
+
+    def xread(self, streams, count=None, block=None):
+        deadline = time.monotonic() + (block or 0) / 1000
+        with self._stream_added:
+            while True:
+                if self.down:
+                    raise redis.ConnectionError("fake redis is down")
+                found = []
+                for key, after in streams.items():
+                    entries = self.xrange(key, f"({after}", count=count)
+                    if entries:
+                        found.append([key, entries])
+                remaining = deadline - time.monotonic()
+                if found or remaining <= 0:
+                    return found
+                self._stream_added.wait(remaining)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        return self.scripts[script](
+            self, list(keys_and_args[:numkeys]), list(keys_and_args[numkeys:])
+        )
+
+
+def _id_order(event_id):
+    ms, seq = event_id.split("-")
+    return int(ms), int(seq)
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self._server = server
+        self._calls = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        calls, self._calls = self._calls, []
+        return [getattr(self._server, n)(*a, **kw) for n, a, kw in calls]
+
+
+def _cache_fill(fake, keys, args):
+    if (fake.get(keys[1]) or "") == args[2]:
+        fake.set(keys[0], args[0], ex=int(args[1]))
+    return 0
+
+
+def _cache_invalidate(fake, keys, args):
+    for key in keys:
+        fake.set(f"{key}:fence", args[0], px=int(args[1]))
+        fake.delete(key)
+    return 0
+
+
+def _token_bucket(fake, keys, args):
+    capacity, per_ms = float(args[0]), float(args[1])
+    now = fake.clock_ms if fake.clock_ms is not None else time.monotonic() * 1000
+    if fake._alive(keys[0]):
+        tokens, ts = fake.keys[keys[0]]
+    else:
+        tokens, ts = capacity, now
+    tokens = min(capacity, tokens + max(0, now - ts) * per_ms)
+    if tokens >= 1:
+        fake.keys[keys[0]] = (tokens - 1, now)
+        return [1, 0, int(tokens - 1)]
+    fake.keys[keys[0]] = (tokens, now)
+    return [0, math.ceil((1 - tokens) / per_ms), int(tokens)]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    fake.scripts[cache.FILL_SCRIPT] = _cache_fill
+    fake.scripts[cache.INVALIDATE_SCRIPT] = _cache_invalidate
+    fake.scripts[rate_limit.TOKEN_BUCKET_SCRIPT] = _token_bucket
+    monkeypatch.setattr(redis_client, "_redis", fake)
+    monkeypatch.setattr(redis_client, "_aredis", None)
+    cache.entity_cache.clear()
+    rate_limit.limiter.clear()
+    yield fake
+    cache.entity_cache.clear()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def db_engine(db_path):
+    engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+    db = Session()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def current_user(db_session):
+    user = User(
+        id=uuid.uuid4(),
+        username="tester",
+        email="tester@example.com",
+        password="x",
+        role="admin",
+    )
+    db_session.add(user)
+    db_session.commit()
+    return {"sub": str(user.id), "username": user.username, "role": "admin"}
+
+
+@pytest.fixture(params=["sync", "async"])
+def client(request, db_engine, db_path, current_user, fake_redis, monkeypatch):
+    """A TestClient against a SQLite database, once per session mode.
+
+    The async run goes through ``AsyncSession.run_sync`` on aiosqlite so both
+    paths of ``app.db.session.run_db`` are exercised by every endpoint test.
+    """
+    monkeypatch.setattr(
+        database,
+        "SessionLocal",
+        sessionmaker(autocommit=False, autoflush=False, bind=db_engine),
+    )
+    if request.param == "async":
+        async_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool
+        )
+        monkeypatch.setattr(
+            database,
+            "AsyncSessionLocal",
+            async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False),
+        )
+    else:
+        monkeypatch.setattr(database, "AsyncSessionLocal", None)
+    app.dependency_overrides[get_current_user_from_bearer] = lambda: current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    """Engine on TEST_DATABASE_URL, wiped and migrated to head.
+
+    The public schema is dropped, so only point this at a throwaway database.
+    """
+    url = os.getenv("TEST_DATABASE_URL", "")
+    engine = create_engine(url)
+    with engine.begin() as c:
+        c.execute(text("DROP SCHEMA public CASCADE"))
+        c.execute(text("CREATE SCHEMA public"))
+    previous = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = url
+    try:
+        command.upgrade(Config("alembic.ini"), "head")
+    finally:
+        if previous is None:
+            del os.environ["DATABASE_URL"]
+        else:
+            os.environ["DATABASE_URL"] = previous
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budget(monkeypatch):
+    """``with query_budget(n):`` fails if a request inside runs more than n queries."""
+    monkeypatch.setattr(profiling, "QUERY_PROFILING", True)
+    monkeypatch.setattr(profiling, "QUERY_PROFILE_ACTION", "log")
+
+    @contextmanager
+    def _budget(limit: int):
+        seen = []
+
+        def observer(route, profile):
+            seen.append((route, profile))
+
+        profiling.add_observer(observer)
+        try:
+            yield seen
+        finally:
+            profiling.remove_observer(observer)
+        assert seen, "no request was profiled"
+        for route, profile in seen:
+            assert profile.count <= limit, f"{route}: {profile.summary()}"
+
+    return _budget
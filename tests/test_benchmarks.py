@@ -0,0 +1,16 @@
+from benchmarks import load
+
+
+def test_percentiles_use_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]
+    s = load.summarize(values, errors=2, elapsed=2.0)
+    assert (s["p50_ms"], s["p95_ms"], s["p99_ms"]) == (50.0, 95.0, 99.0)
+    assert s["rps"] == 50 and s["errors"] == 2
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    base = {"scenarios": {"a": {"p95_ms": 10.0, "rps": 100.0}}}
+    ok = {"scenarios": {"a": {"p95_ms": 10.5, "rps": 95.0}, "new": {}}}
+    bad = {"scenarios": {"a": {"p95_ms": 12.0, "rps": 80.0}}}
+    assert load.compare(ok, base, 0.1) == []
+    assert len(load.compare(bad, base, 0.1)) == 2
@@ -0,0 +1,62 @@
+import uuid
+
+
+def _project(client):
+    return client.post("/api/projects", json={"name": "bulk"}).json()["id"]
+
+
+def test_bulk_create_reports_bad_items_and_keeps_good_ones(client):
+    project_id = _project(client)
+    items = [{"title": f"issue {i}", "priority": "high"} for i in range(5)]
+    items.insert(2, {"title": "x" * 500})
+    items.append({"priority": "urgent"})
+    r = client.post(f"/api/projects/{project_id}/issues:bulk", json={"items": items})
+    assert r.status_code == 200
+    body = r.json()
+    assert [i["title"] for i in body["created"]] == [f"issue {i}" for i in range(5)]
+    assert [e["index"] for e in body["errors"]] == [2, 6]
+    listed = client.get(f"/api/projects/{project_id}/issues").json()["items"]
+    assert len(listed) == 5
+
+
+def test_bulk_status_update(client):
+    project_id = _project(client)
+    created = client.post(
+        f"/api/projects/{project_id}/issues:bulk",
+        json={"items": [{"title": f"issue {i}"} for i in range(4)]},
+    ).json()["created"]
+    ids = [i["id"] for i in created]
+    # Warm the detail cache so the update has something to invalidate.
+    assert client.get(f"/api/issues/{ids[0]}").json()["status"] == "open"
+
+    missing = str(uuid.uuid4())
+    r = client.patch(
+        "/api/issues:bulk",
+        json={
+            "items": [
+                {"id": ids[0], "status": "closed"},
+                {"id": ids[1], "status": "closed"},
+                {"id": ids[2], "status": "in_progress", "priority": "low"},
+                {"id": missing, "status": "closed"},
+                {"id": ids[3]},
+                {"id": "not-a-uuid", "status": "closed"},
+            ]
+        },
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert sorted(body["updated"]) == sorted(ids[:3])
+    assert [e["index"] for e in body["errors"]] == [3, 4, 5]
+    assert client.get(f"/api/issues/{ids[0]}").json()["status"] == "closed"
+    issue = client.get(f"/api/issues/{ids[2]}").json()
+    assert (issue["status"], issue["priority"]) == ("in_progress", "low")
+    assert client.get(f"/api/issues/{ids[3]}").json()["status"] == "open"
+
+
+def test_bulk_batch_size_is_bounded(client):
+    project_id = _project(client)
+    r = client.post(
+        f"/api/projects/{project_id}/issues:bulk",
+        json={"items": [{"title": "t"}] * 5001},
+    )
+    assert r.status_code == 422
@@ -0,0 +1,145 @@
+import asyncio
+import zlib
+
+import brotli
+import msgpack
+
+from app.core.compression import CompressionMiddleware
+from app.core.negotiation import JSON, MSGPACK, choose_encoding, choose_media_type
+
+
+def test_encoding_negotiation():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, gzip") == "gzip"
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("identity") == "identity"
+    assert choose_encoding(None) == "identity"
+
+
+def test_media_type_negotiation():
+    assert choose_media_type("application/msgpack") == MSGPACK
+    assert choose_media_type("application/x-msgpack, application/json;q=0.5") == (
+        MSGPACK
+    )
+    assert choose_media_type("application/json, application/msgpack;q=0.5") == JSON
+    assert choose_media_type("*/*") == JSON
+    assert choose_media_type(None) == JSON
+
+
+def _listing(client, n=30):
+    project_id = client.post("/api/projects", json={"name": "big"}).json()["id"]
+    client.post(
+        f"/api/projects/{project_id}/issues:bulk",
+        json={"items": [{"title": f"issue {i}"} for i in range(n)]},
+    )
+    return f"/api/projects/{project_id}/issues"
+
+
+def test_large_listings_are_compressed(client):
+    url = _listing(client)
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    for coding in ("br", "gzip"):
+        r = client.get(url, headers={"Accept-Encoding": coding})
+        assert r.headers["content-encoding"] == coding
+        assert "Accept-Encoding" in r.headers["vary"]
+        assert r.content == plain.content
+
+    small = client.get("/health", headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in small.headers
+
+
+def test_msgpack_listings_match_json(client):
+    url = _listing(client, 3)
+    issue_id = client.get(url).json()["items"][0]["id"]
+    client.post(f"/api/issues/{issue_id}/comments", json={"content": "c"})
+    for path in (
+        url,
+        f"{url}?expand=reporter",
+        f"/api/issues/{issue_id}/comments",
+        "/api/projects",
+    ):
+        as_json = client.get(path)
+        r = client.get(path, headers={"Accept": MSGPACK})
+        assert r.headers["content-type"] == MSGPACK
+        assert "Accept" in r.headers["vary"]
+        assert msgpack.unpackb(r.content) == as_json.json()
+
+
+def test_comment_etags_differ_per_media_type(client):
+    url = _listing(client, 1)
+    issue_id = client.get(url).json()["items"][0]["id"]
+    path = f"/api/issues/{issue_id}/comments"
+    etag = client.get(path).headers["etag"]
+    assert client.get(path, headers={"Accept": MSGPACK}).headers["etag"] != etag
+
+
+def test_streamed_chunks_are_flushed():
+    chunks = [(b'{"row": %d}\n' % i) * 200 for i in range(3)]
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            more = i < len(chunks) - 1
+            await send({"type": "http.response.body", "body": chunk, "more_body": more})
+
+    async def run(accept_encoding):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "headers": [(b"accept-encoding", accept_encoding.encode())],
+        }
+        await CompressionMiddleware(app, minimum_size=100)(scope, None, send)
+        return [m["body"] for m in sent if m["type"] == "http.response.body"]
+
+    decoder = brotli.Decompressor()
+    bodies = asyncio.run(run("br"))
+    assert [decoder.process(b) for b in bodies] == chunks
+
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    bodies = asyncio.run(run("gzip"))
+    assert [decoder.decompress(b) for b in bodies] == chunks
+
+
+def test_encoded_partial_and_event_stream_bodies_pass_through():
+    body = b"x" * 4096
+
+    def app_with(status, headers):
+        async def app(scope, receive, send):
+            await send(
+                {"type": "http.response.start", "status": status, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": body})
+
+        return app
+
+    async def run(app):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"br, gzip")]}
+        await CompressionMiddleware(app, minimum_size=100)(scope, None, send)
+        return sent
+
+    for status, headers in (
+        (200, [(b"content-type", b"text/event-stream")]),
+        (200, [(b"content-encoding", b"gzip")]),
+        (206, [(b"content-type", b"text/plain")]),
+    ):
+        start, sent_body = asyncio.run(run(app_with(status, headers)))
+        assert start["headers"] == headers
+        assert sent_body["body"] == body
@@ -7,3 +7,20 @@ client = TestClient(app)
 def test_health():
     r = client.get("/health")
     assert r.status_code == 200 and r.json()["status"] == "ok"
+
+
+def test_project_issue_comment_round_trip(client):
+    r = client.post("/api/projects", json={"name": "alpha", "description": "a"})
+    assert r.status_code == 200
+    project_id = r.json()["id"]
+    r = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "crash", "assignee_id": None, "due_date": None},
+    )
+    assert r.status_code == 200
+    issue_id = r.json()["id"]
+    r = client.post(f"/api/issues/{issue_id}/comments", json={"content": "on it"})
+    assert r.status_code == 200
+    r = client.get(f"/api/issues/{issue_id}/comments")
+    assert [c["content"] for c in r.json()["items"]] == ["on it"]
+    assert client.get(f"/api/issues/{issue_id}").json()["title"] == "crash"
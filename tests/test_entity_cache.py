@@ -0,0 +1,60 @@
+import asyncio
+
+from app.core.cache import entity_cache
+
+
+def _make_issue(client):
+    project_id = client.post("/api/projects", json={"name": "cached"}).json()["id"]
+    r = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "first", "assignee_id": None, "due_date": None},
+    )
+    return project_id, r.json()["id"]
+
+
+def test_issue_reads_stay_consistent_across_writes(client, fake_redis):
+    _, issue_id = _make_issue(client)
+    before = entity_cache.stats()
+
+    assert client.get(f"/api/issues/{issue_id}").json()["title"] == "first"
+    assert client.get(f"/api/issues/{issue_id}").json()["title"] == "first"
+    assert entity_cache.stats()["l1_hits"] == before["l1_hits"] + 1
+
+    client.patch(f"/api/issues/{issue_id}", json={"title": "second"})
+    assert client.get(f"/api/issues/{issue_id}").json()["title"] == "second"
+
+    # Another process: nothing in its L1, so it reads through Redis.
+    entity_cache.clear()
+    assert client.get(f"/api/issues/{issue_id}").json()["title"] == "second"
+    assert entity_cache.stats()["l2_hits"] == before["l2_hits"] + 1
+
+
+def test_project_archive_invalidates(client, fake_redis):
+    project_id, _ = _make_issue(client)
+    assert client.get(f"/api/projects/{project_id}").json()["is_archived"] is False
+    client.delete(f"/api/projects/{project_id}")
+    assert client.get(f"/api/projects/{project_id}").json()["is_archived"] is True
+
+
+def test_missing_entity_is_not_cached(client, fake_redis):
+    missing = "00000000-0000-0000-0000-000000000000"
+    assert client.get(f"/api/issues/{missing}").status_code == 404
+    assert fake_redis.get(entity_cache.key("issue", missing)) is None
+
+
+def test_fill_racing_an_invalidation_is_dropped(fake_redis):
+    async def _stale_read():
+        # The read started before the write, then lost the race to it.
+        await entity_cache.invalidate("issue", "x")
+        return '{"title": "stale"}'
+
+    asyncio.run(entity_cache.get_or_load("issue", "x", _stale_read))
+    assert fake_redis.get(entity_cache.key("issue", "x")) is None
+    assert entity_cache.stats()["l1_size"] == 0
+
+
+def test_redis_outage_falls_back_to_database(client, fake_redis):
+    _, issue_id = _make_issue(client)
+    fake_redis.down = True
+    r = client.get(f"/api/issues/{issue_id}")
+    assert r.status_code == 200 and r.json()["title"] == "first"
@@ -0,0 +1,59 @@
+from app.core.etag import etag_matches, weak_etag
+
+
+def _make_issue(client):
+    project_id = client.post("/api/projects", json={"name": "etags"}).json()["id"]
+    r = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "first", "assignee_id": None, "due_date": None},
+    )
+    return r.json()["id"]
+
+
+def test_etag_matching():
+    tag = weak_etag("a", 1)
+    assert etag_matches(tag, tag)
+    assert etag_matches(f'W/"other", {tag[2:]}', tag)
+    assert etag_matches("*", tag)
+    assert not etag_matches('W/"other"', tag)
+    assert not etag_matches(None, tag)
+
+
+def test_conditional_get_on_issue(client):
+    issue_id = _make_issue(client)
+    r = client.get(f"/api/issues/{issue_id}")
+    etag = r.headers["ETag"]
+    assert etag.startswith('W/"')
+    r = client.get(f"/api/issues/{issue_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+
+
+def test_if_match_guards_issue_updates(client):
+    issue_id = _make_issue(client)
+    etag = client.get(f"/api/issues/{issue_id}").headers["ETag"]
+    r = client.patch(
+        f"/api/issues/{issue_id}",
+        json={"title": "lost update"},
+        headers={"If-Match": 'W/"stale"'},
+    )
+    assert r.status_code == 412
+    r = client.patch(
+        f"/api/issues/{issue_id}", json={"title": "second"}, headers={"If-Match": etag}
+    )
+    assert r.status_code == 200
+    assert r.headers["ETag"] == client.get(f"/api/issues/{issue_id}").headers["ETag"]
+
+
+def test_conditional_get_on_comment_collection(client):
+    issue_id = _make_issue(client)
+    client.post(f"/api/issues/{issue_id}/comments", json={"content": "one"})
+    etag = client.get(f"/api/issues/{issue_id}/comments").headers["ETag"]
+    r = client.get(f"/api/issues/{issue_id}/comments", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    client.post(f"/api/issues/{issue_id}/comments", json={"content": "two"})
+    r = client.get(f"/api/issues/{issue_id}/comments", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert len(r.json()["items"]) == 2
+    assert r.headers["ETag"] != etag
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.core import events, outbox
+
+
+@pytest.fixture
+def hub(fake_redis):
+    yield events.hub
+    events.hub.stop()
+
+
+def _types(fake_redis, project_id):
+    entries = fake_redis.streams.get(events.stream_key(project_id), [])
+    return [fields["type"] for _, fields in entries]
+
+
+def test_writes_publish_to_the_project_stream(client, fake_redis):
+    project_id = client.post("/api/projects", json={"name": "feed"}).json()["id"]
+    issue = client.post(
+        f"/api/projects/{project_id}/issues", json={"title": "t"}
+    ).json()
+    comment = client.post(
+        f"/api/issues/{issue['id']}/comments", json={"content": "c"}
+    ).json()
+    client.patch(f"/api/comments/{comment['id']}", json={"content": "edited"})
+    client.patch(f"/api/issues/{issue['id']}", json={"status": "closed"})
+    client.patch(
+        "/api/issues:bulk", json={"items": [{"id": issue["id"], "priority": "low"}]}
+    )
+    assert _types(fake_redis, project_id) == []
+    assert asyncio.run(outbox.drain_once()) == 5
+    assert _types(fake_redis, project_id) == [
+        "issue.created",
+        "comment.created",
+        "comment.updated",
+        "issue.updated",
+        "issue.updated",
+    ]
+    _, last = fake_redis.streams[events.stream_key(project_id)][-1]
+    assert json.loads(last["data"]) == {"id": issue["id"], "priority": "low"}
+
+
+def test_comment_on_unknown_issue_is_404(client):
+    r = client.post(f"/api/issues/{uuid.uuid4()}/comments", json={"content": "c"})
+    assert r.status_code == 404
+
+
+def test_events_endpoint_validates_input(client):
+    project_id = client.post("/api/projects", json={"name": "feed"}).json()["id"]
+    r = client.get(
+        f"/api/projects/{project_id}/events", headers={"Last-Event-ID": "nope"}
+    )
+    assert r.status_code == 400
+    assert client.get(f"/api/projects/{uuid.uuid4()}/events").status_code == 404
+
+
+async def _collect(project_id, last_event_id, publish_after_subscribe, n):
+    disconnected = False
+
+    async def is_disconnected():
+        return disconnected
+
+    stream = events.event_stream(project_id, last_event_id, is_disconnected)
+    received = [await stream.__anext__()]
+    for event_type in publish_after_subscribe:
+        await events.publish(project_id, event_type, {"n": event_type})
+    while len(received) < n:
+        received.append(await asyncio.wait_for(stream.__anext__(), 5))
+    disconnected = True
+    await stream.aclose()
+    return received
+
+
+def test_stream_resumes_after_last_event_id_then_goes_live(fake_redis, hub):
+    project_id = uuid.uuid4()
+    key = events.stream_key(project_id)
+    first = fake_redis.xadd(key, {"type": "issue.created", "data": "{}"})
+    second = fake_redis.xadd(key, {"type": "issue.updated", "data": "{}"})
+
+    received = asyncio.run(_collect(project_id, first, ["comment.created"], 2))
+    assert received[0].startswith(f"id: {second}\nevent: issue.updated\n")
+    assert "event: comment.created" in received[1]
+    assert not events.hub._cursors
+
+
+def test_stream_asks_for_reset_when_backlog_is_gone(fake_redis, hub, monkeypatch):
+    monkeypatch.setattr(events, "EVENTS_BACKLOG_LIMIT", 1)
+    project_id = uuid.uuid4()
+    key = events.stream_key(project_id)
+    first = fake_redis.xadd(key, {"type": "a", "data": "{}"})
+    for _ in range(3):
+        fake_redis.xadd(key, {"type": "b", "data": "{}"})
+
+    received = asyncio.run(_collect(project_id, first, ["c"], 2))
+    assert received[0] == events.RESET
+    assert "event: c" in received[1]
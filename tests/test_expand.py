@@ -0,0 +1,65 @@
+import uuid
+
+from app.models.user import User
+
+
+def _developers(db_session, n):
+    users = [
+        User(
+            id=uuid.uuid4(),
+            username=f"dev{i}",
+            email=f"dev{i}@example.com",
+            password="x",
+            role="developer",
+        )
+        for i in range(n)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    return [str(u.id) for u in users]
+
+
+def test_issue_listing_expands_users_in_one_query(client, db_session, query_budget):
+    devs = _developers(db_session, 3)
+    project_id = client.post("/api/projects", json={"name": "expand"}).json()["id"]
+    items = [{"title": f"i{n}", "assignee_id": dev} for n, dev in enumerate(devs)]
+    items.append({"title": "unassigned"})
+    client.post(f"/api/projects/{project_id}/issues:bulk", json={"items": items})
+
+    url = f"/api/projects/{project_id}/issues"
+    with query_budget(1):
+        plain = client.get(url).json()["items"]
+        expanded = client.get(url, params={"expand": "reporter,assignee"}).json()
+    assert "reporter" not in plain[0] and "assignee" not in plain[0]
+
+    by_title = {i["title"]: i for i in expanded["items"]}
+    assert by_title["i1"]["assignee"] == {
+        "id": devs[1],
+        "username": "dev1",
+        "role": "developer",
+    }
+    assert by_title["i1"]["reporter"]["username"] == "tester"
+    assert by_title["unassigned"]["assignee"] is None
+
+
+def test_comment_listing_expands_author(client, query_budget):
+    project_id = client.post("/api/projects", json={"name": "c"}).json()["id"]
+    issue_id = client.post(
+        f"/api/projects/{project_id}/issues", json={"title": "t"}
+    ).json()["id"]
+    for i in range(3):
+        client.post(f"/api/issues/{issue_id}/comments", json={"content": str(i)})
+
+    url = f"/api/issues/{issue_id}/comments"
+    plain = client.get(url)
+    with query_budget(2):
+        expanded = client.get(url, params={"expand": "author"})
+    assert expanded.headers["etag"] != plain.headers["etag"]
+    assert [c["author"]["username"] for c in expanded.json()["items"]] == ["tester"] * 3
+    assert "author" not in plain.json()["items"][0]
+
+
+def test_unknown_expand_is_rejected(client):
+    project_id = client.post("/api/projects", json={"name": "x"}).json()["id"]
+    r = client.get(f"/api/projects/{project_id}/issues", params={"expand": "author"})
+    assert r.status_code == 400
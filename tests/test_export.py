@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+from app.api.routes import exports
+
+
+def _project_with_issues(client, n):
+    project_id = client.post("/api/projects", json={"name": "export"}).json()["id"]
+    created = client.post(
+        f"/api/projects/{project_id}/issues:bulk",
+        json={"items": [{"title": f"issue {i}"} for i in range(n)]},
+    ).json()["created"]
+    return project_id, [i["id"] for i in created]
+
+
+def test_ndjson_export_streams_every_issue(client, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 3)
+    project_id, ids = _project_with_issues(client, 7)
+    client.post(f"/api/issues/{ids[4]}/comments", json={"content": "inline"})
+
+    r = client.get(
+        f"/api/projects/{project_id}/export",
+        params={"format": "ndjson", "include_comments": True},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    records = {rec["id"]: rec for rec in map(json.loads, r.text.splitlines())}
+    assert sorted(records) == sorted(ids)
+    assert [c["content"] for c in records[ids[4]]["comments"]] == ["inline"]
+    assert records[ids[0]]["comments"] == []
+
+
+def test_csv_export(client):
+    project_id, ids = _project_with_issues(client, 2)
+    r = client.get(f"/api/projects/{project_id}/export", params={"format": "csv"})
+    assert r.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert sorted(row["id"] for row in rows) == sorted(ids)
+    assert "comments" not in rows[0]
+
+
+def test_export_of_unknown_project(client):
+    r = client.get("/api/projects/00000000-0000-0000-0000-000000000000/export")
+    assert r.status_code == 404
+
+
+def test_request_session_is_released_before_streaming(client, db_engine, monkeypatch):
+    project_id, _ = _project_with_issues(client, 1)
+    query = exports._issues_query
+    checked_out = []
+
+    def _query(project_id):
+        checked_out.append(db_engine.pool.checkedout())
+        return query(project_id)
+
+    monkeypatch.setattr(exports, "_issues_query", _query)
+    # Other fixtures may hold a connection of their own.
+    idle = db_engine.pool.checkedout()
+    assert client.get(f"/api/projects/{project_id}/export").status_code == 200
+    assert checked_out == [idle]
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core import jwt as jwt_mod
+
+
+@pytest.fixture(autouse=True)
+def rsa_keys(monkeypatch):
+    priv = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    monkeypatch.setattr(
+        jwt_mod,
+        "_priv",
+        priv.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        ),
+    )
+    monkeypatch.setattr(
+        jwt_mod,
+        "_pub",
+        priv.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ),
+    )
+    monkeypatch.setattr(jwt_mod, "ALGORITHM", "RS256")
+    monkeypatch.setattr(jwt_mod, "token_cache", jwt_mod.TokenCache(4, 300))
+
+
+def test_repeat_decode_skips_verification(monkeypatch):
+    token = jwt_mod.create_access_token({"sub": "u1"})["token"]
+    assert jwt_mod.decode_token_cached(token)["sub"] == "u1"
+
+    def _fail(token):
+        raise AssertionError("signature verified again")
+
+    monkeypatch.setattr(jwt_mod, "decode_token", _fail)
+    assert jwt_mod.decode_token_cached(token)["sub"] == "u1"
+    assert jwt_mod.token_cache.stats()["hits"] == 1
+    assert jwt_mod.token_cache.stats()["misses"] == 1
+
+
+def test_entry_expires_with_token():
+    cache = jwt_mod.token_cache
+    cache.put(b"k", {"jti": "j", "exp": time.time() - 1})
+    assert cache.get(b"k") is None
+
+
+def test_invalidate_by_jti():
+    issued = jwt_mod.create_access_token({"sub": "u1"})
+    jwt_mod.decode_token_cached(issued["token"])
+    jwt_mod.token_cache.invalidate_jti(issued["jti"])
+    assert jwt_mod.token_cache.stats()["size"] == 0
+
+
+def test_cache_is_bounded():
+    for i in range(10):
+        jwt_mod.token_cache.put(str(i).encode(), {"jti": str(i)})
+    assert jwt_mod.token_cache.stats()["size"] == 4
+    assert jwt_mod.token_cache.get(b"9") is not None
+    assert jwt_mod.token_cache.get(b"0") is None
+
+
+def test_async_decode_verifies_off_the_event_loop(monkeypatch):
+    token = jwt_mod.create_access_token({"sub": "u1"})["token"]
+    verify = jwt_mod.decode_token
+    threads = []
+
+    def _decode(token):
+        threads.append(threading.get_ident())
+        return verify(token)
+
+    monkeypatch.setattr(jwt_mod, "decode_token", _decode)
+
+    async def run():
+        first = await jwt_mod.decode_token_cached_async(token)
+        second = await jwt_mod.decode_token_cached_async(token)
+        return first, second, threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(run())
+    assert first["sub"] == second["sub"] == "u1"
+    assert len(threads) == 1 and threads[0] != loop_thread
+
+
+def test_token_pair_and_decode_run_off_the_event_loop(monkeypatch):
+    threads = []
+    for name in ("create_access_token", "create_refresh_token", "decode_token"):
+        original = getattr(jwt_mod, name)
+
+        def _traced(*args, _original=original):
+            threads.append(threading.get_ident())
+            return _original(*args)
+
+        monkeypatch.setattr(jwt_mod, name, _traced)
+
+    async def run():
+        access, refresh = await jwt_mod.create_token_pair_async({"sub": "u1"})
+        decoded = await jwt_mod.decode_token_async(refresh["token"])
+        return access, decoded, threading.get_ident()
+
+    access, decoded, loop_thread = asyncio.run(run())
+    assert decoded["type"] == "refresh" and decoded["sub"] == "u1"
+    assert len(threads) == 3 and loop_thread not in threads
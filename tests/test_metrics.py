@@ -0,0 +1,55 @@
+import uuid
+
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_request_metrics_use_route_templates(client):
+    issue_id = uuid.uuid4()
+    labels = {
+        "method": "GET",
+        "route": "/api/issues/{issue_id}",
+        "status": "404",
+    }
+    before = _sample("http_requests_total", **labels)
+    assert client.get(f"/api/issues/{issue_id}").status_code == 404
+    assert client.get(f"/api/issues/{uuid.uuid4()}").status_code == 404
+
+    assert _sample("http_requests_total", **labels) - before == 2
+    assert _sample("http_request_duration_seconds_count", **labels) >= 2
+    body = client.get("/metrics").text
+    assert 'route="/api/issues/{issue_id}"' in body
+    assert str(issue_id) not in body
+
+
+def test_unmatched_paths_share_one_label(client):
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = _sample("http_requests_total", **labels)
+    client.get(f"/nope/{uuid.uuid4()}")
+    assert _sample("http_requests_total", **labels) - before == 1
+
+
+def test_sql_and_stats_metrics_exported(client):
+    client.post("/api/projects", json={"name": "metrics"})
+    assert _sample("db_query_duration_seconds_count", operation="INSERT") >= 1
+    body = client.get("/metrics").text
+    assert "entity_cache_misses_total" in body
+    assert "jwt_cache_hits_total" in body
+
+
+def test_failed_statements_leave_no_timing_state(db_engine):
+    with db_engine.connect() as conn:
+        for _ in range(3):
+            try:
+                conn.execute(text("SELECT * FROM no_such_table"))
+            except OperationalError:
+                conn.rollback()
+        before = _sample("db_query_duration_seconds_count", operation="SELECT")
+        conn.execute(text("SELECT 1"))
+        assert _sample("db_query_duration_seconds_count", operation="SELECT") > before
+        assert "query_start" not in conn.info
@@ -0,0 +1,24 @@
+import re
+
+from sqlalchemy import create_mock_engine
+
+import app.models  # noqa: F401
+from app.db.database import Base
+
+
+def _postgres_ddl():
+    statements = []
+
+    def executor(sql, *args, **kwargs):
+        statements.append(str(sql.compile(dialect=engine.dialect)).strip())
+
+    engine = create_mock_engine("postgresql+asyncpg://", executor)
+    Base.metadata.create_all(engine, checkfirst=False)
+    return statements
+
+
+def test_postgres_ddl_is_one_command_per_statement():
+    # asyncpg prepares every statement and rejects more than one command.
+    for statement in _postgres_ddl():
+        outside_bodies = re.sub(r"\$\$.*?\$\$", "", statement, flags=re.S)
+        assert ";" not in outside_bodies.rstrip(";"), statement
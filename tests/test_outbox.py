@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+
+from app.core import events, outbox
+from app.models.outbox import OutboxEvent
+
+
+def _pending(db_session):
+    db_session.expire_all()
+    return db_session.query(OutboxEvent).order_by(OutboxEvent.id).all()
+
+
+def _new_issue(client):
+    project_id = client.post("/api/projects", json={"name": "outbox"}).json()["id"]
+    r = client.post(f"/api/projects/{project_id}/issues", json={"title": "t"})
+    return project_id, r.json()
+
+
+def test_writes_enqueue_in_their_own_transaction(client, db_session, fake_redis):
+    project_id, issue = _new_issue(client)
+    r = client.post(f"/api/issues/{uuid.uuid4()}/comments", json={"content": "c"})
+    assert r.status_code == 404
+
+    rows = _pending(db_session)
+    assert [(r.topic, str(r.project_id)) for r in rows] == [
+        ("issue.created", project_id)
+    ]
+    assert rows[0].payload == issue
+    assert fake_redis.streams == {}
+
+
+def test_drain_publishes_and_deletes(client, db_session, fake_redis):
+    project_id, _ = _new_issue(client)
+    assert asyncio.run(outbox.drain_once()) == 1
+    assert asyncio.run(outbox.drain_once()) == 0
+    assert _pending(db_session) == []
+    [(_, fields)] = fake_redis.streams[events.stream_key(project_id)]
+    assert fields["type"] == "issue.created"
+
+
+def test_failed_delivery_backs_off_then_parks(
+    client, db_session, fake_redis, monkeypatch
+):
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_ATTEMPTS", 2)
+    _new_issue(client)
+    fake_redis.down = True
+
+    assert asyncio.run(outbox.drain_once()) == 1
+    [row] = _pending(db_session)
+    assert row.attempts == 1
+    assert "down" in row.last_error
+    # Not due yet, so the next pass claims nothing.
+    assert asyncio.run(outbox.drain_once()) == 0
+
+    row.available_at = outbox._utcnow()
+    db_session.commit()
+    assert asyncio.run(outbox.drain_once()) == 1
+    [row] = _pending(db_session)
+    assert (row.attempts, row.available_at) == (2, None)
+
+    fake_redis.down = False
+    assert asyncio.run(outbox.drain_once()) == 0
+
+
+def test_backoff_grows_and_is_capped(monkeypatch):
+    monkeypatch.setattr(outbox.random, "uniform", lambda a, b: b)
+    monkeypatch.setattr(outbox, "OUTBOX_BACKOFF_MAX", 10)
+    assert [outbox.backoff(n) for n in range(1, 6)] == [1, 2, 4, 8, 10]
+
+
+def test_worker_drains_when_woken(client, db_session, fake_redis):
+    project_id, _ = _new_issue(client)
+
+    async def _run():
+        worker = outbox.OutboxWorker(poll_seconds=60)
+        worker.start()
+        worker.wake()
+        for _ in range(100):
+            if fake_redis.streams:
+                break
+            await asyncio.sleep(0.02)
+        await worker.stop()
+
+    asyncio.run(_run())
+    assert events.stream_key(project_id) in fake_redis.streams
+    assert _pending(db_session) == []
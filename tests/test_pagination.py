@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime, timedelta
+
+from app.db.pagination import decode_cursor, encode_cursor
+from app.models.issue import Issue
+from app.models.project import Project
+
+
+def _seed_issues(db_session, current_user, n):
+    reporter = uuid.UUID(current_user["sub"])
+    project = Project(name="paged", created_by=reporter)
+    db_session.add(project)
+    db_session.flush()
+    base = datetime(2026, 1, 1)
+    for i in range(n):
+        # Pairs share a timestamp so the id tie-breaker is exercised.
+        db_session.add(
+            Issue(
+                title=f"issue {i}",
+                project_id=project.id,
+                reporter_id=reporter,
+                created_at=base + timedelta(seconds=i // 2),
+            )
+        )
+    db_session.commit()
+    return project
+
+
+def test_cursor_round_trip():
+    now = datetime(2026, 2, 10, 12, 30)
+    id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(now, id)) == (now, id)
+
+
+def test_invalid_cursor_is_rejected(client, db_session, current_user):
+    project = _seed_issues(db_session, current_user, 1)
+    r = client.get(f"/api/projects/{project.id}/issues", params={"cursor": "nope"})
+    assert r.status_code == 400
+
+
+def test_issue_listing_walks_every_row_once(client, db_session, current_user):
+    project = _seed_issues(db_session, current_user, 25)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get(f"/api/projects/{project.id}/issues", params=params)
+        assert r.status_code == 200
+        body = r.json()
+        assert len(body["items"]) <= 10
+        seen.extend(i["id"] for i in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+
+
+def test_limit_is_bounded(client, db_session, current_user):
+    project = _seed_issues(db_session, current_user, 1)
+    r = client.get(f"/api/projects/{project.id}/issues", params={"limit": 10_000})
+    assert r.status_code == 422
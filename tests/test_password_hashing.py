@@ -0,0 +1,64 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+
+
+def _die_once(marker):
+    # Runs in the pool worker: the first call kills it.
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "ok"
+
+
+def _die(_):
+    os._exit(1)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    yield
+    security.shutdown_pool()
+
+
+def test_hash_and_verify_on_process_pool(pool):
+    async def _round_trip():
+        hashed = await security.hash_password_async("correct horse")
+        ok = await security.verify_password_async("correct horse", hashed)
+        bad = await security.verify_password_async("wrong horse", hashed)
+        return ok, bad
+
+    calls_before = security.hash_stats.calls
+    assert asyncio.run(_round_trip()) == (True, False)
+    assert security.hash_stats.calls == calls_before + 3
+
+
+def test_full_queue_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(security.hash_password_async("correct horse"))
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+
+
+def test_dead_worker_is_replaced_and_retried(pool, tmp_path):
+    restarts = security.hash_stats.pool_restarts
+    marker = str(tmp_path / "died")
+    assert asyncio.run(security._run_bounded(_die_once, marker)) == "ok"
+    assert security.hash_stats.pool_restarts == restarts + 1
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(security._run_bounded(_die, None))
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+    assert security.hash_stats.pool_restarts == restarts + 3
+    assert security._pending == 0
+
+    hashed = asyncio.run(security.hash_password_async("correct horse"))
+    assert asyncio.run(security.verify_password_async("correct horse", hashed))
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.core.config import settings
+from app.db import pool
+
+
+def test_engine_options_for_postgres(monkeypatch):
+    monkeypatch.setattr(settings, "DB_EXTERNAL_POOLER", False)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    opts = pool.engine_options("postgresql://u:p@db/app", "sync")
+    assert opts["poolclass"] is pool.InstrumentedQueuePool
+    assert opts["pool_size"] == settings.DB_POOL_SIZE
+    assert opts["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    opts = pool.engine_options("postgresql+asyncpg://u:p@db/app", "async")
+    assert opts["poolclass"] is pool.InstrumentedAsyncQueuePool
+    assert opts["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    assert pool.engine_options("sqlite:///./test.db", "sync") == {}
+
+
+def test_external_pooler_disables_prepared_statements(monkeypatch):
+    monkeypatch.setattr(settings, "DB_EXTERNAL_POOLER", True)
+    opts = pool.engine_options("postgresql+asyncpg://u:p@pgbouncer/app", "async")
+    args = opts["connect_args"]
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_cache_size"] == 0
+    assert (
+        args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+    )
+    # Startup options are rejected by PgBouncer; the timeout moves to SET LOCAL.
+    sync = pool.engine_options("postgresql://u:p@pgbouncer/app", "sync")
+    assert "connect_args" not in sync
+
+
+def test_pool_metrics_count_overflow_and_timeouts(db_path):
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        poolclass=pool.InstrumentedQueuePool,
+        pool_logging_name="test-pool",
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    pool.register("test-pool", engine)
+    before = pool.pool_stats()["test-pool"]
+
+    first, second = engine.connect(), engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    stats = pool.pool_stats()["test-pool"]
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] - before["checkouts"] == 2
+    assert stats["overflow_events"] - before["overflow_events"] == 1
+    assert stats["timeouts"] - before["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.05
+
+    first.close()
+    second.close()
+    assert pool.pool_stats()["test-pool"]["checked_out"] == 0
+    engine.dispose()
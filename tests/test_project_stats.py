@@ -0,0 +1,69 @@
+import uuid
+
+from app.db.stats import reconcile
+from app.models.project_stats import ProjectIssueStat
+
+
+def _project(client):
+    return client.post("/api/projects", json={"name": "stats"}).json()["id"]
+
+
+def _stats(client, project_id):
+    r = client.get(f"/api/projects/{project_id}/stats")
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_stats_follow_issue_writes(client):
+    project_id = _project(client)
+    assert _stats(client, project_id)["total"] == 0
+
+    one = client.post(
+        f"/api/projects/{project_id}/issues", json={"title": "a", "priority": "high"}
+    ).json()
+    created = client.post(
+        f"/api/projects/{project_id}/issues:bulk",
+        json={"items": [{"title": "b"}, {"title": "c", "priority": "low"}]},
+    ).json()["created"]
+    client.patch(f"/api/issues/{one['id']}", json={"status": "closed"})
+    client.patch(f"/api/issues/{one['id']}", json={"title": "renamed"})
+    client.patch(
+        "/api/issues:bulk",
+        json={
+            "items": [
+                {"id": created[0]["id"], "status": "in_progress"},
+                {"id": created[1]["id"], "priority": "critical"},
+                {"id": created[1]["id"], "assignee_id": None},
+            ]
+        },
+    )
+
+    stats = _stats(client, project_id)
+    assert stats["total"] == 3
+    assert stats["by_status"] == {
+        "open": 1,
+        "in_progress": 1,
+        "resolved": 0,
+        "closed": 1,
+        "reopened": 0,
+    }
+    assert stats["by_priority"] == {"low": 0, "medium": 1, "high": 1, "critical": 1}
+
+
+def test_stats_unknown_project(client):
+    assert client.get(f"/api/projects/{uuid.uuid4()}/stats").status_code == 404
+
+
+def test_reconcile_reports_and_fixes_drift(client, db_session):
+    project_id = _project(client)
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "a"})
+    assert reconcile(db_session) == []
+
+    row = db_session.get(ProjectIssueStat, (uuid.UUID(project_id), "status", "open"))
+    row.count = 7
+    db_session.commit()
+
+    drift = reconcile(db_session, fix=True)
+    assert [(d["value"], d["stored"], d["actual"]) for d in drift] == [("open", 7, 1)]
+    assert reconcile(db_session) == []
+    assert _stats(client, project_id)["by_status"]["open"] == 1
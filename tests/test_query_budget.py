@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db import profiling
+
+
+def test_endpoint_query_budgets(client, query_budget):
+    with query_budget(3):
+        project_id = client.post("/api/projects", json={"name": "budget"}).json()["id"]
+        issue_id = client.post(
+            f"/api/projects/{project_id}/issues", json={"title": "t"}
+        ).json()["id"]
+    for i in range(5):
+        client.post(f"/api/issues/{issue_id}/comments", json={"content": str(i)})
+
+    # Listings must not grow with the number of rows returned.
+    with query_budget(1):
+        client.get(f"/api/projects/{project_id}/issues")
+        client.get(f"/api/issues/{issue_id}")
+    with query_budget(2):
+        client.get(f"/api/issues/{issue_id}/comments")
+        client.get(f"/api/projects/{project_id}/stats")
+    with query_budget(4):
+        client.patch(f"/api/issues/{issue_id}", json={"status": "closed"})
+
+
+def test_query_count_header(client, query_budget):
+    with query_budget(1):
+        r = client.get("/api/projects")
+    assert r.headers["x-query-count"] == "1"
+
+
+def test_repeated_shapes_are_grouped(db_session):
+    with profiling.profile_queries(budget=100) as profile:
+        for i in range(3):
+            db_session.execute(text("SELECT :i"), {"i": i})
+        db_session.execute(text("SELECT 1 WHERE 1 IN (1, 2)"))
+    assert profile.count == 4
+    assert profile.repeated() == [("SELECT ?", 3)]
+
+
+def test_placeholder_lists_collapse():
+    shape = profiling.statement_shape
+    assert shape("SELECT a FROM t WHERE id IN (?, ?,\n ?)") == shape(
+        "SELECT a FROM t WHERE id IN (?)"
+    )
+    assert shape("WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == "WHERE id IN (?)"
+
+
+def test_raise_mode_fails_the_query_over_budget(db_session):
+    with profiling.profile_queries(budget=2, action="raise"):
+        db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 2"))
+        with pytest.raises(profiling.QueryBudgetExceeded, match="budget 2"):
+            db_session.execute(text("SELECT 3"))
+
+
+def test_slow_queries_are_reported(db_session):
+    with profiling.profile_queries(slow_ms=0) as profile:
+        db_session.execute(text("SELECT 1"))
+    assert profile.problems() == [f"slow query {profile.slow[0][0]:.1f}ms: SELECT 1"]
+
+
+def test_failed_statements_do_not_skew_later_timings(db_session):
+    with profiling.profile_queries(slow_ms=1000) as profile:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                db_session.execute(text("SELECT * FROM no_such_table"))
+            db_session.rollback()
+        time.sleep(0.01)
+        db_session.execute(text("SELECT 1"))
+    assert profile.count == 1
+    assert profile.seconds < 0.01
+    assert "profile_start" not in db_session.connection().info
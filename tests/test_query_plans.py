@@ -0,0 +1,116 @@
+"""Query-plan checks for the indexes added in 0002_query_indexes.
+
+Needs a throwaway Postgres database: TEST_DATABASE_URL is wiped (public schema
+dropped), migrated to head and seeded before the plans are inspected.
+"""
+
+import json
+import os
+
+import pytest
+from sqlalchemy import text
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="TEST_DATABASE_URL must point at a disposable Postgres database",
+)
+
+SEED = """
+INSERT INTO users (id, username, email, password, role)
+SELECT gen_random_uuid(), 'user' || g, 'user' || g || '@example.com', 'x', 'developer'
+FROM generate_series(1, 5000) g;
+
+INSERT INTO projects (id, name, created_by)
+SELECT gen_random_uuid(), 'project-' || md5(g::text), (SELECT id FROM users LIMIT 1)
+FROM generate_series(1, 20000) g;
+
+INSERT INTO issues (id, title, status, priority, project_id, reporter_id, created_at)
+SELECT gen_random_uuid(), 'issue ' || g,
+       (ARRAY['open','in_progress','resolved','closed','reopened'])[1 + g % 5],
+       'medium', p.id, p.created_by, now() - (g || ' seconds')::interval
+FROM generate_series(1, 100000) g
+JOIN LATERAL (
+    SELECT id, created_by FROM projects OFFSET (g % 200) LIMIT 1
+) p ON true;
+
+INSERT INTO comments (id, content, issue_id, project_id, author_id)
+SELECT gen_random_uuid(), 'comment ' || g, i.id, i.project_id, i.reporter_id
+FROM generate_series(1, 3) g CROSS JOIN issues i;
+
+ANALYZE;
+"""
+
+
+@pytest.fixture(scope="module")
+def conn(pg_engine):
+    with pg_engine.begin() as c:
+        c.execute(text(SEED))
+    with pg_engine.connect() as c:
+        yield c
+
+
+def _index_names(conn, sql, **params):
+    plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    names, stack = set(), [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    return names
+
+
+def _one(conn, sql):
+    return conn.execute(text(sql)).scalar()
+
+
+def test_issue_listing_by_status_uses_composite_index(conn):
+    project_id = _one(conn, "SELECT project_id FROM issues LIMIT 1")
+    names = _index_names(
+        conn,
+        "SELECT * FROM issues WHERE project_id = :p AND status = 'open' "
+        "ORDER BY created_at, id LIMIT 51",
+        p=project_id,
+    )
+    assert "ix_issues_project_status_created" in names
+
+
+def test_issue_listing_without_status_uses_index(conn):
+    project_id = _one(conn, "SELECT project_id FROM issues LIMIT 1")
+    names = _index_names(
+        conn,
+        "SELECT * FROM issues WHERE project_id = :p ORDER BY created_at, id LIMIT 51",
+        p=project_id,
+    )
+    assert "ix_issues_project_created" in names
+
+
+def test_comment_listing_uses_issue_index(conn):
+    issue_id = _one(conn, "SELECT issue_id FROM comments LIMIT 1")
+    names = _index_names(
+        conn,
+        "SELECT * FROM comments WHERE issue_id = :i ORDER BY created_at, id LIMIT 51",
+        i=issue_id,
+    )
+    assert "ix_comments_issue_created" in names
+
+
+def test_login_lookup_uses_email_index(conn):
+    names = _index_names(
+        conn, "SELECT * FROM users WHERE email = :e", e="user42@example.com"
+    )
+    assert "ux_users_email" in names
+
+
+def test_project_search_uses_trigram_index(conn):
+    name = _one(conn, "SELECT name FROM projects LIMIT 1")
+    names = _index_names(
+        conn,
+        "SELECT * FROM projects WHERE NOT is_archived AND name ILIKE :q",
+        q=f"%{name[-12:]}%",
+    )
+    assert "ix_projects_name_trgm" in names
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import Limit, RateLimiter, load_rules
+from app.dependencies import permissions
+
+LISTING = "GET /api/projects/{project_id}/issues"
+
+
+def test_limit_specs_and_overrides():
+    assert vars(Limit.parse("30/minute")) == {"requests": 30, "period": 60}
+    assert vars(Limit.parse("5/seconds")) == {"requests": 5, "period": 1}
+    assert Limit.parse(None) is None
+    with pytest.raises(ValueError):
+        Limit.parse("fast")
+
+    rules = load_rules('{"*": {"manager": "10/second"}, "/api/x": {"*": null}}')
+    assert rules["*"]["manager"].requests == 10
+    assert rules["*"]["*"].requests == 600
+    assert rules["/api/x"] == {"*": None}
+
+
+def test_rule_matching_and_role_fallback():
+    limiter = RateLimiter(load_rules())
+    assert limiter.match("GET", "/api/projects/{project_id}/issues") == LISTING
+    assert limiter.match("POST", "/api/projects/{project_id}/issues") == "*"
+    assert limiter.match("POST", "/api/auth/login") == "/api/auth/*"
+    assert limiter.match("GET", "/health") == "/health"
+
+    assert limiter.limit_for(LISTING, "admin") is None
+    assert limiter.limit_for(LISTING, "developer").requests == 120
+    assert limiter.limit_for("*", "admin").requests == 3000
+    assert limiter.limit_for("/api/auth/*", "admin").requests == 30
+
+
+def test_bucket_refills_over_time(fake_redis):
+    limiter = RateLimiter(load_rules())
+    limit = Limit(2, 1)
+    fake_redis.clock_ms = 0
+
+    def hit():
+        return asyncio.run(limiter.hit("r", "user:a", limit))
+
+    assert hit() == (True, 0, 1)
+    assert hit() == (True, 0, 0)
+    assert hit() == (False, 1, 0)
+    fake_redis.clock_ms = 500
+    limiter.clear()
+    assert hit()[0] is True
+    assert asyncio.run(limiter.hit("r", "user:b", limit))[0] is True
+
+
+def test_redis_outage_fails_open(fake_redis):
+    fake_redis.down = True
+    limiter = RateLimiter(load_rules())
+    assert asyncio.run(limiter.hit("r", "user:a", Limit(1, 60)))[0] is True
+
+
+@pytest.fixture
+def tight(monkeypatch, fake_redis):
+    calls = []
+    script = fake_redis.scripts[rate_limit.TOKEN_BUCKET_SCRIPT]
+
+    def counted(fake, keys, args):
+        calls.append(keys[0])
+        return script(fake, keys, args)
+
+    fake_redis.scripts[rate_limit.TOKEN_BUCKET_SCRIPT] = counted
+
+    async def fake_decode(token):
+        return {"sub": token, "role": "developer"}
+
+    rules = load_rules('{"%s": {"*": "2/minute"}}' % LISTING)
+    monkeypatch.setitem(rate_limit.limiter.rules, LISTING, rules[LISTING])
+    monkeypatch.setattr(permissions, "decode_token_cached_async", fake_decode)
+    return calls
+
+
+def test_throttled_requests_get_retry_after(client, tight):
+    project_id = client.post("/api/projects", json={"name": "rl"}).json()["id"]
+    url = f"/api/projects/{project_id}/issues"
+    alice = {"Authorization": "Bearer alice"}
+
+    assert [client.get(url, headers=alice).status_code for _ in range(2)] == [
+        200,
+        200,
+    ]
+    r = client.get(url, headers=alice)
+    assert r.status_code == 429
+    assert 1 <= int(r.headers["Retry-After"]) <= 30
+    # Denied again from the local pre-check, without another script call.
+    calls = len(tight)
+    assert client.get(url, headers=alice).status_code == 429
+    assert len(tight) == calls
+
+    assert client.get(url, headers={"Authorization": "Bearer bob"}).status_code == 200
+    # Other routes have their own buckets.
+    assert client.get(f"/api/projects/{project_id}", headers=alice).status_code == 200
+    assert "rl:*:user:alice" in tight
+
+
+def test_auth_routes_are_keyed_by_ip(client, tight):
+    client.post("/api/auth/login", json={}, headers={"Authorization": "Bearer x"})
+    assert tight == ["rl:/api/auth/*:ip:testclient"]
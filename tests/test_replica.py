@@ -0,0 +1,115 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db import database, replica
+from app.db.database import Base
+from app.models.project import Project
+
+
+@pytest.fixture
+def replica_db(client, tmp_path, fake_redis, monkeypatch):
+    """An empty SQLite "replica": rows only show up if a read hit the primary."""
+    path = tmp_path / "replica.db"
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(database, "replica_engine", engine)
+    monkeypatch.setattr(
+        database,
+        "ReplicaSessionLocal",
+        sessionmaker(autocommit=False, autoflush=False, bind=engine),
+    )
+    if database.AsyncSessionLocal is not None:
+        async_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{path}", poolclass=NullPool
+        )
+        monkeypatch.setattr(
+            database,
+            "AsyncReplicaSessionLocal",
+            async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False),
+        )
+    monitor = replica.ReplicaMonitor(max_lag=1, interval=60)
+    monkeypatch.setattr(replica, "monitor", monitor)
+    monkeypatch.setattr(replica, "stickiness", replica.WriteStickiness(5, 100))
+    assert monitor.check()
+    yield monitor
+    engine.dispose()
+
+
+def _names(client):
+    return [p["name"] for p in client.get("/api/projects").json()["items"]]
+
+
+def _forget_writes(fake_redis):
+    replica.stickiness.clear()
+    fake_redis.delete(*fake_redis.scan_iter("sticky:*"))
+
+
+def test_reads_stick_to_primary_after_a_write(client, replica_db, fake_redis):
+    client.post("/api/projects", json={"name": "fresh"})
+    assert _names(client) == ["fresh"]
+
+    # Another process only sees the Redis mark.
+    replica.stickiness.clear()
+    assert _names(client) == ["fresh"]
+
+    _forget_writes(fake_redis)
+    assert _names(client) == []
+
+
+def test_unhealthy_or_stale_replica_falls_back(client, replica_db, fake_redis):
+    client.post("/api/projects", json={"name": "p"})
+    _forget_writes(fake_redis)
+    assert _names(client) == []
+
+    replica_db.mark_down()
+    assert _names(client) == ["p"]
+
+    assert replica_db.check()
+    replica_db.checked_at = time.monotonic() - 3 * replica_db.interval
+    assert _names(client) == ["p"]
+
+    replica_db.max_lag = -1
+    assert not replica_db.check()
+    assert _names(client) == ["p"]
+
+
+def test_redis_outage_keeps_reads_on_primary(client, replica_db, fake_redis):
+    client.post("/api/projects", json={"name": "p"})
+    _forget_writes(fake_redis)
+    fake_redis.down = True
+    assert _names(client) == ["p"]
+
+
+def test_cache_filling_details_read_the_primary(client, replica_db, fake_redis):
+    project_id = client.post("/api/projects", json={"name": "p"}).json()["id"]
+    _forget_writes(fake_redis)
+    assert client.get(f"/api/projects/{project_id}").status_code == 200
+    assert client.get(f"/api/projects/{project_id}/stats").status_code == 404
+
+
+def test_export_streams_from_the_replica(client, replica_db, fake_redis, current_user):
+    project_id = client.post("/api/projects", json={"name": "p"}).json()["id"]
+    client.post(f"/api/projects/{project_id}/issues", json={"title": "t"})
+    # Only the project has replicated so far.
+    with Session(database.replica_engine) as db:
+        db.add(
+            Project(
+                id=uuid.UUID(project_id),
+                name="p",
+                created_by=uuid.UUID(current_user["sub"]),
+            )
+        )
+        db.commit()
+    url = f"/api/projects/{project_id}/export"
+    assert client.get(url).text.count("\n") == 1
+
+    _forget_writes(fake_redis)
+    assert client.get(url).text == ""
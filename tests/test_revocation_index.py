@@ -0,0 +1,73 @@
+import time
+import uuid
+
+import pytest
+
+from app.core import redis_client
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def fake(fake_redis, monkeypatch):
+    index = redis_client.RevocationIndex(
+        fake_redis, 1000, 0.001, resync=300, poll_interval=0.05
+    )
+    monkeypatch.setattr(redis_client, "revocations", index)
+    yield fake_redis
+    index.stop()
+
+
+def test_unstarted_index_always_asks_redis(fake):
+    assert redis_client.is_blacklisted("never-revoked") is False
+    assert fake.exists_calls == 1
+
+
+def test_existing_revocations_are_loaded_on_start(fake):
+    fake.setex("bl:old", 60, "1")
+    redis_client.revocations.start()
+    assert _wait_for(lambda: redis_client.revocations.ready)
+    assert redis_client.is_blacklisted("old") is True
+
+
+def test_unrevoked_tokens_skip_redis(fake):
+    redis_client.revocations.start()
+    assert _wait_for(lambda: redis_client.revocations.ready)
+    for _ in range(100):
+        assert redis_client.is_blacklisted(str(uuid.uuid4())) is False
+    assert fake.exists_calls < 5
+
+
+def test_revocation_from_another_process_is_seen(fake):
+    redis_client.revocations.start()
+    assert _wait_for(lambda: redis_client.revocations.ready)
+    fake.setex("bl:elsewhere", 60, "1")
+    fake.publish(redis_client.REVOCATION_CHANNEL, "elsewhere")
+    assert _wait_for(lambda: redis_client.is_blacklisted("elsewhere"))
+
+
+def test_local_revocation_is_seen_immediately(fake):
+    redis_client.revocations.start()
+    assert _wait_for(lambda: redis_client.revocations.ready)
+    redis_client.blacklist_jti("mine", 60)
+    assert redis_client.is_blacklisted("mine") is True
+
+
+def test_lost_subscription_falls_back_to_redis(fake):
+    redis_client.revocations.start()
+    assert _wait_for(lambda: redis_client.revocations.ready)
+    fake.pubsub_down = True
+    assert _wait_for(lambda: not redis_client.revocations.ready)
+    # Published while the index was blind; only Redis knows about it.
+    fake.keys["bl:missed"] = "1"
+    assert redis_client.is_blacklisted("missed") is True
+    fake.pubsub_down = False
+    assert _wait_for(lambda: redis_client.revocations.ready)
+    assert "missed" in redis_client.revocations._filter
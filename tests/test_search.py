@@ -0,0 +1,138 @@
+"""Full-text issue search (0003_issue_search) against a throwaway Postgres."""
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.search import search_issues
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="TEST_DATABASE_URL must point at a disposable Postgres database",
+)
+
+
+@pytest.fixture(scope="module")
+def seeded(pg_engine):
+    user, project = uuid.uuid4(), uuid.uuid4()
+    issues = {
+        "title": uuid.uuid4(),
+        "description": uuid.uuid4(),
+        "comment": uuid.uuid4(),
+        "other": uuid.uuid4(),
+    }
+    with pg_engine.begin() as c:
+        c.execute(
+            text(
+                "INSERT INTO users (id, username, email, password, role) "
+                "VALUES (:u, 'searcher', 'searcher@example.com', 'x', 'admin')"
+            ),
+            {"u": user},
+        )
+        c.execute(
+            text("INSERT INTO projects (id, name, created_by) VALUES (:p, 'p', :u)"),
+            {"p": project, "u": user},
+        )
+        for title, description, key in [
+            ("Deadlock in scheduler", "workers hang", "title"),
+            ("Workers hang", "a deadlock under load", "description"),
+            ("Slow startup", "cold cache", "comment"),
+            ("Typo on login page", None, "other"),
+        ]:
+            c.execute(
+                text(
+                    "INSERT INTO issues (id, title, description, status, priority, "
+                    "project_id, reporter_id) VALUES "
+                    "(:i, :t, :d, 'open', 'medium', :p, :u)"
+                ),
+                {
+                    "i": issues[key],
+                    "t": title,
+                    "d": description,
+                    "p": project,
+                    "u": user,
+                },
+            )
+        c.execute(
+            text(
+                "INSERT INTO comments (id, content, issue_id, project_id, author_id) "
+                "VALUES (:c, 'saw a deadlock here too', :i, :p, :u)"
+            ),
+            {"c": uuid.uuid4(), "i": issues["comment"], "p": project, "u": user},
+        )
+    return project, issues
+
+
+def test_search_ranks_title_over_description_over_comment(pg_engine, seeded):
+    project, issues = seeded
+    with Session(pg_engine) as db:
+        page = search_issues(db, "deadlock", project_id=project)
+    ids = [hit["id"] for hit in page["items"]]
+    assert ids == [issues["title"], issues["description"], issues["comment"]]
+    assert page["items"][0]["rank"] > page["items"][-1]["rank"]
+
+
+def test_search_cursor_walks_all_hits(pg_engine, seeded):
+    project, issues = seeded
+    seen, cursor = [], None
+    with Session(pg_engine) as db:
+        while True:
+            page = search_issues(
+                db, "deadlock", project_id=project, cursor=cursor, limit=1
+            )
+            seen += [hit["id"] for hit in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+    assert seen == [issues["title"], issues["description"], issues["comment"]]
+
+
+def test_search_uses_gin_index(pg_engine, seeded):
+    with pg_engine.connect() as c:
+        c.execute(text("SET enable_seqscan = off"))
+        plan = c.execute(
+            text(
+                "EXPLAIN SELECT id FROM issues WHERE search_vector @@ "
+                "websearch_to_tsquery('english', 'deadlock')"
+            )
+        ).scalars()
+        assert "ix_issues_search_vector" in "\n".join(plan)
+
+
+def test_search_filters_apply_to_comment_hits(pg_engine, seeded):
+    project, issues = seeded
+    other, other_issue = uuid.uuid4(), uuid.uuid4()
+    with pg_engine.begin() as c:
+        user = c.execute(text("SELECT reporter_id FROM issues LIMIT 1")).scalar()
+        c.execute(
+            text("INSERT INTO projects (id, name, created_by) VALUES (:p, 'o', :u)"),
+            {"p": other, "u": user},
+        )
+        c.execute(
+            text(
+                "INSERT INTO issues (id, title, status, priority, project_id, "
+                "reporter_id) VALUES (:i, 'Flaky test', 'closed', 'low', :p, :u)"
+            ),
+            {"i": other_issue, "p": other, "u": user},
+        )
+        c.execute(
+            text(
+                "INSERT INTO comments (id, content, issue_id, project_id, author_id) "
+                "VALUES (:c, 'another deadlock', :i, :p, :u)"
+            ),
+            {"c": uuid.uuid4(), "i": other_issue, "p": other, "u": user},
+        )
+    with Session(pg_engine) as db:
+        scoped = search_issues(db, "deadlock", project_id=project)
+        closed = search_issues(db, "deadlock", status="closed")
+    assert [hit["id"] for hit in scoped["items"]] == [
+        issues["title"],
+        issues["description"],
+        issues["comment"],
+    ]
+    assert [hit["id"] for hit in closed["items"]] == [other_issue]
@@ -0,0 +1,56 @@
+import csv
+import io
+
+from scripts import seed_bulk
+
+SIZES = {"users": 3, "projects": 2, "issues": 10, "comments": 7}
+
+
+class _Cursor:
+    def __init__(self):
+        self.chunks = []
+
+    def copy_expert(self, sql, buf):
+        self.chunks.append((sql, list(csv.reader(io.StringIO(buf.getvalue())))))
+
+
+def test_copy_rows_chunks_and_keeps_references(monkeypatch):
+    monkeypatch.setattr(seed_bulk, "COPY_CHUNK_ROWS", 4)
+    cur = _Cursor()
+    rows = seed_bulk.issue_rows(SIZES, seed=1)
+    assert seed_bulk.copy_rows(cur, "issues", rows) == 10
+    assert [len(chunk) for _, chunk in cur.chunks] == [4, 4, 2]
+    assert cur.chunks[0][0].startswith("COPY issues (id, title")
+    rows = [row for _, chunk in cur.chunks for row in chunk]
+    assert rows[3][5] == str(seed_bulk.row_id("project", 1))
+    users = {str(seed_bulk.row_id("user", n)) for n in range(3)}
+    assert {r[6] for r in rows} <= users
+
+
+def test_ranges_are_independent_of_worker_count():
+    ranges = seed_bulk.plan_ranges(SIZES["comments"], 3)
+    assert ranges == [(0, 3), (3, 6), (6, 7)]
+    first = [
+        row
+        for start, stop in ranges
+        for row in seed_bulk.comment_rows(SIZES, 1, start, stop)
+    ]
+    again = [
+        row
+        for start, stop in reversed(ranges)
+        for row in seed_bulk.comment_rows(SIZES, 1, start, stop)
+    ]
+    assert sorted(first) == sorted(again)
+    assert len({row[0] for row in first}) == SIZES["comments"]
+
+
+def test_comments_carry_their_issues_project():
+    projects = {row[0]: row[5] for row in seed_bulk.issue_rows(SIZES, seed=1)}
+    for row in seed_bulk.comment_rows(SIZES, 1):
+        assert row[3] == projects[row[2]]
+
+
+def test_users_share_a_small_password_pool():
+    rows = list(seed_bulk.user_rows({"users": 5}, ["h0", "h1"]))
+    assert [r[3] for r in rows] == ["h0", "h1", "h0", "h1", "h0"]
+    assert rows[0][4] == "admin"
@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+from app.core.serialization import dumps
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.models.project import Project
+from app.schemas.comment import CommentResponse
+from app.schemas.issue import IssueResponse
+from app.schemas.pagination import Page
+from app.schemas.project import ProjectResponse
+
+
+def _expected(db_session, model, schema, page, limit=None, **filters):
+    db_session.expire_all()
+    rows = (
+        db_session.query(model)
+        .filter_by(**filters)
+        .order_by(model.created_at, model.id)
+        .limit(limit)
+        .all()
+    )
+    return (
+        Page[schema]
+        .model_validate({"items": rows, "next_cursor": page["next_cursor"]})
+        .model_dump_json()
+        .encode()
+    )
+
+
+def test_column_listings_match_pydantic_bytes(client, db_session):
+    project_id = client.post(
+        "/api/projects", json={"name": "bytes", "description": 'ünïcode   "q"'}
+    ).json()["id"]
+    for body in (
+        {"title": "plain"},
+        {"title": "dated", "due_date": "2026-02-03", "description": "a\nb\x01"},
+        {"title": "日本語", "priority": "critical"},
+    ):
+        issue = client.post(f"/api/projects/{project_id}/issues", json=body).json()
+    client.post(f"/api/issues/{issue['id']}/comments", json={"content": "</script>"})
+
+    r = client.get(f"/api/projects/{project_id}/issues?limit=2")
+    assert r.json()["next_cursor"]
+    assert r.headers["content-type"] == "application/json"
+    assert r.content == _expected(
+        db_session, Issue, IssueResponse, r.json(), 2, project_id=UUID(project_id)
+    )
+
+    r = client.get(f"/api/issues/{issue['id']}/comments")
+    assert r.content == _expected(
+        db_session, Comment, CommentResponse, r.json(), issue_id=UUID(issue["id"])
+    )
+    assert (
+        client.get(
+            f"/api/issues/{issue['id']}/comments",
+            headers={"If-None-Match": r.headers["ETag"]},
+        ).status_code
+        == 304
+    )
+
+    r = client.get("/api/projects")
+    assert r.content == _expected(db_session, Project, ProjectResponse, r.json())
+
+
+def test_aware_datetimes_match_pydantic():
+    values = [
+        datetime(2026, 1, 2, 3, 4, 5, 120000, tzinfo=timezone.utc),
+        datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=-5))),
+    ]
+    for value in values:
+        data = IssueResponse.model_construct(
+            created_at=value, due_date=date(2026, 1, 2)
+        )
+        expected = data.model_dump_json(include={"created_at", "due_date"})
+        assert (
+            dumps({"due_date": date(2026, 1, 2), "created_at": value})
+            == expected.encode()
+        )
@@ -0,0 +1,181 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import msgpack
+import pytest
+from sqlalchemy import text
+
+from app.db import sync
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.models.tombstone import Tombstone
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+
+def _utc(minutes_ago):
+    # SQLite keeps naive UTC timestamps.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now - timedelta(minutes=minutes_ago)
+
+
+def _stamp(db_session, model, id, minutes_ago):
+    db_session.execute(
+        model.__table__.update()
+        .where(model.id == uuid.UUID(id))
+        .values(updated_at=_utc(minutes_ago))
+    )
+    db_session.commit()
+
+
+def _changes(client, project_id, since=None, limit=50):
+    r = client.get(
+        f"/api/projects/{project_id}/changes",
+        params={k: v for k, v in {"since": since, "limit": limit}.items() if v},
+    )
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+@pytest.fixture
+def project(client, db_session):
+    project_id = client.post("/api/projects", json={"name": "sync"}).json()["id"]
+    issues = [
+        client.post(f"/api/projects/{project_id}/issues", json={"title": t}).json()
+        for t in ("a", "b", "c")
+    ]
+    comment = client.post(
+        f"/api/issues/{issues[0]['id']}/comments", json={"content": "hi"}
+    ).json()
+    for age, issue in zip((60, 50, 40), issues):
+        _stamp(db_session, Issue, issue["id"], age)
+    _stamp(db_session, Comment, comment["id"], 30)
+    return project_id, issues, comment
+
+
+def test_initial_sync_pages_then_returns_only_changes(client, db_session, project):
+    project_id, issues, comment = project
+    first = _changes(client, project_id, limit=2)
+    assert [i["title"] for i in first["issues"]] == ["a", "b"]
+    assert first["has_more"]
+    rest = _changes(client, project_id, first["next_cursor"], limit=2)
+    assert [i["title"] for i in rest["issues"]] == ["c"]
+    assert rest["comments"] == [] and not rest["has_more"]
+    assert [c["id"] for c in first["comments"]] == [comment["id"]]
+
+    idle = _changes(client, project_id, rest["next_cursor"])
+    assert (idle["issues"], idle["comments"], idle["deleted"]) == ([], [], [])
+
+    client.patch(f"/api/issues/{issues[1]['id']}", json={"status": "closed"})
+    _stamp(db_session, Issue, issues[1]["id"], 5)
+    changed = _changes(client, project_id, idle["next_cursor"])
+    assert [(i["id"], i["status"]) for i in changed["issues"]] == [
+        (issues[1]["id"], "closed")
+    ]
+
+
+def test_comments_are_scoped_by_their_own_project(client, db_session, project):
+    project_id, issues, comment = project
+    stored = db_session.get(Comment, uuid.UUID(comment["id"]))
+    assert str(stored.project_id) == project_id
+
+    other = client.post("/api/projects", json={"name": "other"}).json()["id"]
+    issue = client.post(f"/api/projects/{other}/issues", json={"title": "x"}).json()
+    client.post(f"/api/issues/{issue['id']}/comments", json={"content": "elsewhere"})
+    assert [c["id"] for c in _changes(client, project_id)["comments"]] == [
+        comment["id"]
+    ]
+
+
+def test_deletes_come_back_as_tombstones(client, db_session, project):
+    project_id, issues, comment = project
+    cursor = _changes(client, project_id)["next_cursor"]
+    db_session.execute(
+        Comment.__table__.delete().where(Comment.id == uuid.UUID(comment["id"]))
+    )
+    db_session.execute(
+        Issue.__table__.delete().where(Issue.id == uuid.UUID(issues[2]["id"]))
+    )
+    db_session.commit()
+
+    deleted = _changes(client, project_id, cursor)["deleted"]
+    assert [(d["entity"], d["id"]) for d in deleted] == [
+        ("comment", comment["id"]),
+        ("issue", issues[2]["id"]),
+    ]
+
+
+def test_cursor_errors(client, project):
+    project_id, _, _ = project
+    url = f"/api/projects/{project_id}/changes"
+    assert client.get(url, params={"since": "junk"}).status_code == 400
+    expired = sync._encode([(None, None), (None, None), (_utc(60 * 24 * 60), 1)])
+    assert client.get(url, params={"since": expired}).status_code == 410
+    assert client.get(f"/api/projects/{uuid.uuid4()}/changes").status_code == 404
+
+
+def test_changes_in_msgpack(client, project):
+    project_id, _, _ = project
+    r = client.get(
+        f"/api/projects/{project_id}/changes",
+        headers={"Accept": "application/msgpack"},
+    )
+    assert msgpack.unpackb(r.content) == _changes(client, project_id)
+
+
+def test_prune_drops_only_old_tombstones(db_session):
+    project_id = uuid.uuid4()
+    for days in (40, 1):
+        db_session.add(
+            Tombstone(
+                entity="issue",
+                entity_id=uuid.uuid4(),
+                project_id=project_id,
+                deleted_at=datetime.now(timezone.utc) - timedelta(days=days),
+            )
+        )
+    db_session.commit()
+    assert sync.prune_tombstones(db_session, days=30) == 1
+    assert db_session.query(Tombstone).count() == 1
+
+
+@pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="TEST_DATABASE_URL must point at a disposable Postgres database",
+)
+def test_postgres_delete_trigger_writes_tombstones(pg_engine):
+    user, project, issue = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    with pg_engine.begin() as c:
+        c.execute(
+            text(
+                "INSERT INTO users (id, username, email, password, role) "
+                "VALUES (:u, 'syncer', 'syncer@example.com', 'x', 'admin')"
+            ),
+            {"u": user},
+        )
+        c.execute(
+            text("INSERT INTO projects (id, name, created_by) VALUES (:p, 's', :u)"),
+            {"p": project, "u": user},
+        )
+        c.execute(
+            text(
+                "INSERT INTO issues (id, title, status, priority, project_id, "
+                "reporter_id) VALUES (:i, 't', 'open', 'medium', :p, :u)"
+            ),
+            {"i": issue, "p": project, "u": user},
+        )
+        c.execute(
+            text(
+                "INSERT INTO comments (id, content, issue_id, project_id, author_id) "
+                "VALUES (:c, 'x', :i, :p, :u)"
+            ),
+            {"c": uuid.uuid4(), "i": issue, "p": project, "u": user},
+        )
+        c.execute(text("DELETE FROM issues WHERE id = :i"), {"i": issue})
+        rows = c.execute(
+            text("SELECT entity, entity_id FROM tombstones WHERE project_id = :p"),
+            {"p": project},
+        ).all()
+    # The cascaded comment is covered by its issue's tombstone.
+    assert rows == [("issue", issue)]